@@ -0,0 +1,444 @@
+"""
+Drive read- and write-heavy request mixes against the product API in-process
+and compare throughput and latency percentiles with a saved baseline.
+
+Usage:
+    PYTHONPATH=src python benchmarks/load_test.py [--mix read|write|all]
+        [--requests N] [--concurrency N] [--database-url URL]
+        [--save-baseline] [--threshold 0.2]
+
+The app runs with its lifespan against a throwaway SQLite file, a fake auth
+client that accepts any bearer token and an in-memory stand-in for RabbitMQ.
+Pass the URL of an empty scratch PostgreSQL database, migrated with
+`alembic upgrade head`, to measure against Postgres instead.
+
+Baselines are stored as JSON in benchmarks/baselines/. The script exits with
+status 1 when more than --max-error-rate of the requests fail, or when
+throughput drops or p95/p99 latency grows by more than the threshold compared
+to the baseline of the same mix. SQLite serializes writers and occasionally
+reports "database is locked" under the write mix, hence the error budget.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Awaitable, Callable
+
+parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+parser.add_argument("--mix", choices=["read", "write", "all"], default="all")
+parser.add_argument("--requests", type=int, default=2000)
+parser.add_argument("--warmup", type=int, default=200)
+parser.add_argument("--concurrency", type=int, default=16)
+parser.add_argument("--rows", type=int, default=5000)
+parser.add_argument("--database-url", default=None)
+parser.add_argument(
+    "--baseline-dir",
+    type=Path,
+    default=Path(__file__).parent / "baselines",
+)
+parser.add_argument("--save-baseline", action="store_true")
+parser.add_argument("--threshold", type=float, default=0.2)
+parser.add_argument("--max-error-rate", type=float, default=0.01)
+args = parser.parse_args()
+
+if args.database_url is None:
+    args.database_url = "sqlite+aiosqlite:///" + os.path.join(
+        tempfile.mkdtemp(), "load.db"
+    )
+os.environ["DATABASE_URL"] = args.database_url
+os.environ.setdefault("DATABASE_ECHO", "false")
+
+import httpx  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+
+from db import db_session_manager  # noqa: E402
+from db.models import Base, Product  # noqa: E402
+from interfaces.grpc.auth_client import auth_client_instance  # noqa: E402
+from main import app  # noqa: E402
+from services.rabbitmq_client import rabbit_client  # noqa: E402
+
+USER = {"id": 1, "email": "bench@example.com", "is_active": True}
+NOW = datetime(2026, 1, 1)
+SEARCH_TERMS = ["product", "prod", "widget", "gadget", "blue", "42"]
+ADJECTIVES = ["blue", "red", "large", "small", "steel", "wooden"]
+NOUNS = ["widget", "gadget", "lamp", "chair", "mug", "cable"]
+
+
+class InMemoryBroker:
+    """Stand-in for the product_events exchange that delivers in-process."""
+
+    def __init__(self):
+        self.published = 0
+        self._handlers = []
+
+    async def publish(self, message, routing_key: str) -> None:
+        self.published += 1
+        payload = json.loads(message.body)
+        for routing_keys, handler in self._handlers:
+            if routing_key in routing_keys:
+                await handler(routing_key, payload)
+
+    async def consume_events(self, routing_keys, handler, on_state=None) -> None:
+        self._handlers.append((set(routing_keys), handler))
+        if on_state is not None:
+            await on_state(True)
+
+
+def install_fakes() -> InMemoryBroker:
+    broker = InMemoryBroker()
+
+    async def noop(*args, **kwargs):
+        return None
+
+    async def validate_token(token: str) -> dict:
+        return USER
+
+    async def connect():
+        rabbit_client.exchange = broker
+        rabbit_client.exchanges = [broker]
+
+    auth_client_instance.connect = noop
+    auth_client_instance.close = noop
+    auth_client_instance.validate_token = validate_token
+    rabbit_client.connect = connect
+    rabbit_client.close = noop
+    rabbit_client.consume_events = broker.consume_events
+    return broker
+
+
+@dataclass
+class Catalog:
+    """Product IDs the scenarios pick from, shared by all workers."""
+
+    ids: list[int]
+    owned: list[int]
+    created: list[int] = field(default_factory=list)
+    reservations: int = 0
+
+    def any_id(self, rng: random.Random) -> int:
+        return rng.choice(self.ids)
+
+    def owned_id(self, rng: random.Random) -> int:
+        return rng.choice(self.owned)
+
+
+async def seed(count: int) -> Catalog:
+    engine = db_session_manager.engine
+    rng = random.Random(42)
+    async with engine.begin() as conn:
+        if engine.dialect.name == "sqlite":
+            await conn.run_sync(Base.metadata.create_all)
+        result = await conn.execute(
+            insert(Product).returning(Product.id, Product.user_id),
+            [
+                {
+                    "name": f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} {i}",
+                    "description": f"Description of product {i}",
+                    "price": Decimal(rng.randint(100, 100000)) / 100,
+                    # Only foreign products run out, so stock writes succeed
+                    "quantity": 0 if i % 2 == 0 and rng.random() < 0.4 else 1_000_000,
+                    "user_id": USER["id"] if i % 2 else rng.randint(2, 500),
+                    "created_at": NOW - timedelta(minutes=rng.randint(0, 525600)),
+                    "updated_at": NOW,
+                }
+                for i in range(count)
+            ],
+        )
+        rows = result.all()
+    return Catalog(
+        ids=[row.id for row in rows],
+        owned=[row.id for row in rows if row.user_id == USER["id"]],
+    )
+
+
+def new_product(rng: random.Random) -> dict:
+    return {
+        "name": f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)}",
+        "description": "Created by the load test",
+        "price": round(rng.uniform(1, 1000), 2),
+        "quantity": 1_000_000,
+    }
+
+
+Scenario = Callable[[httpx.AsyncClient, Catalog, random.Random], Awaitable]
+
+
+async def list_products(client, catalog, rng):
+    params = {"sort": rng.choice(["id", "created_at", "-created_at", "price"])}
+    response = await client.get("/", params=params)
+    if response.status_code != 200 or rng.random() >= 0.3:
+        return response
+    cursor = response.json()["next_cursor"]
+    if cursor:
+        params["cursor"] = cursor
+        response = await client.get("/", params=params)
+    return response
+
+
+async def list_filtered_products(client, catalog, rng):
+    low = rng.randint(1, 900)
+    params = {
+        "min_price": low,
+        "max_price": low + 100,
+        "in_stock": rng.random() < 0.5,
+        "sort": rng.choice(["price", "-price"]),
+    }
+    if rng.random() < 0.3:
+        params["user_id"] = USER["id"]
+    return await client.get("/", params=params)
+
+
+async def get_product(client, catalog, rng):
+    return await client.get(f"/{catalog.any_id(rng)}")
+
+
+async def get_products_batch(client, catalog, rng):
+    ids = [catalog.any_id(rng) for _ in range(rng.randint(5, 50))]
+    return await client.get("/batch", params={"ids": ids})
+
+
+async def search_products(client, catalog, rng):
+    return await client.get("/search", params={"q": rng.choice(SEARCH_TERMS)})
+
+
+async def export_products(client, catalog, rng):
+    return await client.get("/export")
+
+
+async def create_product(client, catalog, rng):
+    response = await client.post("/", json=new_product(rng))
+    if response.status_code == 201:
+        catalog.created.append(response.json()["id"])
+    return response
+
+
+async def bulk_create_products(client, catalog, rng):
+    items = [new_product(rng) for _ in range(rng.randint(10, 100))]
+    response = await client.post("/bulk", json={"items": items})
+    if response.status_code == 201:
+        catalog.created.extend(product["id"] for product in response.json())
+    return response
+
+
+async def update_product(client, catalog, rng):
+    update = rng.choice(
+        [
+            {"price": round(rng.uniform(1, 1000), 2)},
+            {"description": f"Updated {rng.random()}"},
+            {"name": f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)}"},
+        ]
+    )
+    return await client.put(f"/{catalog.owned_id(rng)}", json=update)
+
+
+async def bulk_update_products(client, catalog, rng):
+    items = [
+        {"id": catalog.owned_id(rng), "price": round(rng.uniform(1, 1000), 2)}
+        for _ in range(rng.randint(10, 50))
+    ]
+    return await client.put("/bulk", json={"items": items})
+
+
+async def adjust_stock(client, catalog, rng):
+    delta = rng.choice([-2, -1, 1, 2])
+    product_id = catalog.owned_id(rng)
+    return await client.post(f"/{product_id}/stock", json={"delta": delta})
+
+
+async def reserve_and_release_stock(client, catalog, rng):
+    catalog.reservations += 1
+    key = f"load-{os.getpid()}-{catalog.reservations}"
+    items = [
+        {"product_id": product_id, "quantity": rng.randint(1, 3)}
+        for product_id in {catalog.owned_id(rng) for _ in range(rng.randint(1, 5))}
+    ]
+    response = await client.post(
+        "/reservations",
+        json={"reservation_key": key, "items": items},
+    )
+    if response.status_code != 201:
+        return response
+    return await client.post(f"/reservations/{key}/release")
+
+
+async def delete_product(client, catalog, rng):
+    if not catalog.created:
+        return await create_product(client, catalog, rng)
+    product_id = catalog.created.pop(rng.randrange(len(catalog.created)))
+    return await client.delete(f"/{product_id}")
+
+
+MIXES: dict[str, dict[Scenario, int]] = {
+    "read": {
+        list_products: 25,
+        list_filtered_products: 15,
+        get_product: 30,
+        get_products_batch: 10,
+        search_products: 10,
+        export_products: 1,
+        create_product: 3,
+        update_product: 4,
+        adjust_stock: 2,
+    },
+    "write": {
+        create_product: 20,
+        bulk_create_products: 3,
+        update_product: 20,
+        bulk_update_products: 3,
+        adjust_stock: 15,
+        reserve_and_release_stock: 15,
+        delete_product: 10,
+        get_product: 10,
+        list_products: 4,
+    },
+}
+
+
+def percentiles(latencies: list[float]) -> dict[str, float]:
+    if len(latencies) < 2:
+        value = latencies[0] * 1000 if latencies else 0.0
+        return {"p50": value, "p95": value, "p99": value}
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "p50": cuts[49] * 1000,
+        "p95": cuts[94] * 1000,
+        "p99": cuts[98] * 1000,
+    }
+
+
+async def run_mix(
+    client: httpx.AsyncClient,
+    catalog: Catalog,
+    mix: dict[Scenario, int],
+    requests: int,
+    concurrency: int,
+) -> dict:
+    scenarios = list(mix)
+    weights = list(mix.values())
+    latencies: dict[str, list[float]] = defaultdict(list)
+    errors: dict[str, int] = defaultdict(int)
+    remaining = requests
+
+    async def worker(seed: int) -> None:
+        nonlocal remaining
+        rng = random.Random(seed)
+        while remaining > 0:
+            remaining -= 1
+            scenario = rng.choices(scenarios, weights)[0]
+            started = time.perf_counter()
+            response = await scenario(client, catalog, rng)
+            latencies[scenario.__name__].append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors[scenario.__name__] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(seed) for seed in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    everything = [latency for values in latencies.values() for latency in values]
+    return {
+        "requests": len(everything),
+        "concurrency": concurrency,
+        "database": db_session_manager.engine.dialect.name,
+        "throughput": len(everything) / elapsed,
+        "errors": sum(errors.values()),
+        "latency_ms": percentiles(everything),
+        "scenarios": {
+            name: {
+                "count": len(values),
+                "errors": errors[name],
+                "latency_ms": percentiles(values),
+            }
+            for name, values in sorted(latencies.items())
+        },
+    }
+
+
+def report(mix: str, result: dict) -> None:
+    latency = result["latency_ms"]
+    print(
+        f"\n{mix} mix: {result['requests']} requests, "
+        f"{result['throughput']:,.0f} req/s, {result['errors']} errors, "
+        f"p50 {latency['p50']:.1f} ms, p95 {latency['p95']:.1f} ms, "
+        f"p99 {latency['p99']:.1f} ms"
+    )
+    for name, scenario in result["scenarios"].items():
+        latency = scenario["latency_ms"]
+        print(
+            f"  {name:28} {scenario['count']:6} "
+            f"p50 {latency['p50']:8.1f}  p95 {latency['p95']:8.1f}  "
+            f"p99 {latency['p99']:8.1f} ms  errors {scenario['errors']}"
+        )
+
+
+def regressions(result: dict, baseline: dict, threshold: float) -> list[str]:
+    found = []
+    if result["throughput"] < baseline["throughput"] * (1 - threshold):
+        found.append(
+            f"throughput {result['throughput']:,.0f} req/s "
+            f"< baseline {baseline['throughput']:,.0f} req/s"
+        )
+    for key in ("p95", "p99"):
+        current = result["latency_ms"][key]
+        previous = baseline["latency_ms"][key]
+        if current > previous * (1 + threshold):
+            found.append(f"{key} {current:.1f} ms > baseline {previous:.1f} ms")
+    return found
+
+
+async def main() -> int:
+    broker = install_fakes()
+    catalog = await seed(args.rows)
+    mixes = ["read", "write"] if args.mix == "all" else [args.mix]
+
+    failed = False
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(
+            transport=transport,
+            base_url=f"http://bench{app.root_path}",
+            headers={"Authorization": "Bearer load-test"},
+        ) as client:
+            for mix in mixes:
+                await run_mix(
+                    client, catalog, MIXES[mix], args.warmup, args.concurrency
+                )
+                result = await run_mix(
+                    client, catalog, MIXES[mix], args.requests, args.concurrency
+                )
+                report(mix, result)
+
+                if result["errors"] > result["requests"] * args.max_error_rate:
+                    print(f"  FAIL: {result['errors']} requests failed")
+                    failed = True
+
+                path = args.baseline_dir / f"load_{mix}.json"
+                if args.save_baseline:
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    path.write_text(json.dumps(result, indent=2) + "\n")
+                    print(f"  baseline saved to {path}")
+                elif path.exists():
+                    baseline = json.loads(path.read_text())
+                    for regression in regressions(result, baseline, args.threshold):
+                        print(f"  REGRESSION: {regression}")
+                        failed = True
+                else:
+                    print(f"  no baseline at {path}; run with --save-baseline")
+
+    print(f"\n{broker.published} events published")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,153 @@
+"""
+Measure event publish throughput of the RabbitMQ client against an
+in-process AMQP stand-in.
+
+Usage:
+    PYTHONPATH=src python benchmarks/rabbitmq_publish.py [--events N]
+        [--publishers N] [--rtt-ms 1.0] [--frame-us 20]
+
+The stand-in models a broker reached over one connection: each channel
+writes its frames one after another, taking --frame-us per message, and a
+message is confirmed one round trip (--rtt-ms) after it was written. The
+scenarios compare awaiting each confirm before sending the next event, which
+is how events used to go out, with publishers pipelining over one channel,
+over a channel pool, and with micro-batching enabled.
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+import aio_pika  # noqa: E402
+
+from services.rabbitmq_client import RabbitClient  # noqa: E402
+
+parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+parser.add_argument("--events", type=int, default=20000)
+parser.add_argument("--publishers", type=int, default=256)
+parser.add_argument("--rtt-ms", type=float, default=1.0)
+parser.add_argument("--frame-us", type=float, default=20.0)
+args = parser.parse_args()
+
+
+class FakeExchange:
+    def __init__(self, channel: "FakeChannel"):
+        self.channel = channel
+
+    async def publish(self, message, routing_key: str) -> None:
+        await self.channel.write(len(message.body))
+
+
+class FakeChannel:
+    def __init__(self, rtt: float, frame_time: float):
+        self.rtt = rtt
+        self.frame_time = frame_time
+        self.published = 0
+        self._busy_until = 0.0
+
+    async def write(self, size: int) -> None:
+        # Frames on a channel are written in order; the confirm comes back
+        # one round trip after the broker has received the message.
+        now = time.perf_counter()
+        self._busy_until = max(now, self._busy_until) + self.frame_time
+        self.published += 1
+        await asyncio.sleep(self._busy_until + self.rtt - now)
+
+    async def declare_exchange(self, *args, **kwargs) -> FakeExchange:
+        return FakeExchange(self)
+
+
+class FakeConnection:
+    def __init__(self, rtt: float, frame_time: float):
+        self.rtt = rtt
+        self.frame_time = frame_time
+        self.channels: list[FakeChannel] = []
+
+    async def channel(self, publisher_confirms: bool = True) -> FakeChannel:
+        channel = FakeChannel(self.rtt, self.frame_time)
+        self.channels.append(channel)
+        return channel
+
+    async def close(self) -> None:
+        pass
+
+
+async def fake_connect(url: str) -> FakeConnection:
+    return FakeConnection(args.rtt_ms / 1000, args.frame_us / 1_000_000)
+
+
+aio_pika.connect_robust = fake_connect
+
+EVENT = {
+    "product_id": 1,
+    "name": "Widget",
+    "price": "19.99",
+    "quantity": 5,
+    "user_id": 1,
+}
+
+
+async def sequential(client: RabbitClient) -> None:
+    for i in range(args.events):
+        await client.publish_event("product.updated", EVENT, message_id=str(i))
+
+
+async def concurrent(client: RabbitClient) -> None:
+    remaining = iter(range(args.events))
+
+    async def publisher():
+        for i in remaining:
+            await client.publish_event("product.updated", EVENT, message_id=str(i))
+
+    await asyncio.gather(*(publisher() for _ in range(args.publishers)))
+
+
+SCENARIOS = [
+    ("sequential, 1 channel", sequential, {"publish_channels": 1}),
+    ("pipelined, 1 channel", concurrent, {"publish_channels": 1}),
+    ("pipelined, 4 channels", concurrent, {"publish_channels": 4}),
+    (
+        "batched 2ms, 4 channels",
+        concurrent,
+        {"publish_channels": 4, "batch_window": 0.002, "batch_max_size": 100},
+    ),
+    (
+        "pipelined, 4 channels, 32 unconfirmed",
+        concurrent,
+        {"publish_channels": 4, "max_unconfirmed": 32},
+    ),
+]
+
+
+async def main() -> None:
+    print(f"{'scenario':<40}{'events/s':>12}{'confirm p50 ms':>16}{'p99 ms':>10}")
+    for name, scenario, options in SCENARIOS:
+        client = RabbitClient("amqp://bench", **options)
+        await client.connect()
+        latencies = []
+        send = client._send
+
+        async def timed_send(*send_args):
+            start = time.perf_counter()
+            await send(*send_args)
+            latencies.append(time.perf_counter() - start)
+
+        client._send = timed_send
+        start = time.perf_counter()
+        await scenario(client)
+        elapsed = time.perf_counter() - start
+        await client.close()
+
+        published = sum(channel.published for channel in client.connection.channels)
+        assert published == args.events, f"{name}: published {published}"
+        latencies.sort()
+        p50 = latencies[len(latencies) // 2] * 1000
+        p99 = latencies[int(len(latencies) * 0.99)] * 1000
+        print(f"{name:<40}{args.events / elapsed:>12.0f}{p50:>16.2f}{p99:>10.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
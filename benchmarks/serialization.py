@@ -0,0 +1,99 @@
+"""
+Compare the default response-model serialization of a product page with the
+row-based fast path used when `products_fast_serialization` is enabled.
+
+Usage:
+    PYTHONPATH=src python benchmarks/serialization.py [--rows N] [--rounds N]
+
+Both paths must produce byte-identical bodies; the script exits with status 1
+otherwise.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+
+from interfaces.api.schemas import ProductPage, ProductRead  # noqa: E402
+from interfaces.api.serializers import encode_product_page  # noqa: E402
+
+ProductRowTuple = namedtuple(
+    "ProductRowTuple",
+    "name description price quantity id user_id created_at updated_at",
+)
+
+
+def make_rows(count: int) -> list[ProductRowTuple]:
+    rng = random.Random(42)
+    start = datetime(2026, 1, 1)
+    return [
+        ProductRowTuple(
+            name=f"Product {i} éè",
+            description=f'Description "{i}" with\ttabs and unicode ☃',
+            price=Decimal(rng.randint(1, 9999999)) / 100,
+            quantity=rng.randint(0, 1000),
+            id=i,
+            user_id=rng.randint(1, 100),
+            created_at=start + timedelta(microseconds=rng.randint(0, 10**12)),
+            updated_at=start + timedelta(seconds=rng.randint(0, 10**6)),
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+_response_adapter = TypeAdapter(ProductPage)
+
+
+def default_path(rows, next_cursor) -> bytes:
+    # What the route did before: ORM entities -> ProductRead -> ProductPage,
+    # then FastAPI validates against response_model and renders a JSONResponse.
+    entities = [SimpleNamespace(**row._asdict()) for row in rows]
+    page = ProductPage(
+        items=[ProductRead.model_validate(entity) for entity in entities],
+        next_cursor=next_cursor,
+    )
+    validated = _response_adapter.validate_python(page)
+    return JSONResponse(_response_adapter.dump_python(validated, mode="json")).body
+
+
+def fast_path(rows, next_cursor) -> bytes:
+    return encode_product_page(rows, next_cursor)
+
+
+def measure(fn, rows, rounds: int) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        fn(rows, "cursor")
+    return len(rows) * rounds / (time.perf_counter() - started)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    if default_path(rows, "cursor") != fast_path(rows, "cursor"):
+        print("fast path output differs from the default path")
+        return 1
+
+    default_rate = measure(default_path, rows, args.rounds)
+    fast_rate = measure(fast_path, rows, args.rounds)
+    print(f"default path: {default_rate:12,.0f} rows/s")
+    print(f"fast path:    {fast_rate:12,.0f} rows/s ({fast_rate / default_rate:.1f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
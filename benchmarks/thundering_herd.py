@@ -0,0 +1,167 @@
+"""
+Fire bursts of concurrent requests for a few hot products at the product API
+in-process and report how the database pool copes with one query per
+request, with lookups batched per event loop iteration, and with concurrent
+lookups of the same product coalesced on top.
+
+Usage:
+    PYTHONPATH=src python benchmarks/thundering_herd.py [--requests N]
+        [--hot-products N] [--rounds N] [--pool-size N]
+
+The product cache is disabled so every request misses it, as in the burst
+that follows an update of promoted products. Pass --hot-products equal to
+--requests to measure batching alone. Pool figures are read from the
+/metrics endpoint the way Prometheus would see them.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+parser.add_argument("--requests", type=int, default=2000)
+parser.add_argument("--hot-products", type=int, default=5)
+parser.add_argument("--rounds", type=int, default=3)
+parser.add_argument("--pool-size", type=int, default=5)
+args = parser.parse_args()
+
+os.environ["DATABASE_URL"] = "sqlite+aiosqlite:///" + os.path.join(
+    tempfile.mkdtemp(), "herd.db"
+)
+os.environ["DATABASE_POOL_SIZE"] = str(args.pool_size)
+os.environ["DATABASE_MAX_OVERFLOW"] = "0"
+os.environ["PRODUCT_CACHE_BACKEND"] = "none"
+os.environ["CATALOG_SNAPSHOT_ENABLED"] = "false"
+os.environ["GRPC_SERVER_ENABLED"] = "false"
+
+import httpx  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+
+from core.batch_loader import BatchLoader  # noqa: E402
+from db import db_session_manager  # noqa: E402
+from db.models import Base, Product  # noqa: E402
+from interfaces.grpc.auth_client import auth_client_instance  # noqa: E402
+from main import app  # noqa: E402
+from services.product_service import product_service  # noqa: E402
+from services.rabbitmq_client import rabbit_client  # noqa: E402
+
+REPORTED = {
+    "checkouts": 'db_pool_checkout_wait_seconds_count{pool="primary"}',
+    "checkout wait s": 'db_pool_checkout_wait_seconds_sum{pool="primary"}',
+    "queries": "product_lookup_batch_size_count",
+    "lookups from db": 'product_lookups_total{source="database"}',
+    "coalesced": 'product_lookups_total{source="coalesced"}',
+}
+
+
+class NoCoalescing:
+    """Stand-in for the lookup SingleFlight that lets every call through."""
+
+    def __contains__(self, key) -> bool:
+        return False
+
+    async def do(self, key, fn):
+        return await fn()
+
+
+async def noop(*args, **kwargs):
+    return None
+
+
+async def scrape(client: httpx.AsyncClient) -> dict[str, float]:
+    response = await client.get("/metrics")
+    samples = {}
+    for line in response.text.splitlines():
+        if line and not line.startswith("#") and "_bucket{" not in line:
+            name, value = line.rsplit(" ", 1)
+            samples[name] = float(value)
+    return samples
+
+
+async def burst(client: httpx.AsyncClient) -> tuple[float, list[float], int]:
+    latencies = []
+    errors = 0
+
+    async def fetch(product_id: int) -> None:
+        nonlocal errors
+        start = time.perf_counter()
+        response = await client.get(f"/{product_id}")
+        latencies.append(time.perf_counter() - start)
+        if response.status_code != 200:
+            errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(fetch(i % args.hot_products + 1) for i in range(args.requests))
+    )
+    return time.perf_counter() - start, latencies, errors
+
+
+async def main() -> None:
+    auth_client_instance.connect = noop
+    auth_client_instance.close = noop
+    rabbit_client.connect = noop
+    rabbit_client.consume_events = noop
+
+    async with db_session_manager.engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+        await connection.execute(
+            insert(Product),
+            [
+                {
+                    "name": f"Promoted product {i}",
+                    "description": "On sale",
+                    "price": 9.99,
+                    "quantity": 100,
+                    "user_id": 1,
+                }
+                for i in range(args.hot_products)
+            ],
+        )
+
+    engine = db_session_manager.engine
+    modes = {
+        "per request": (
+            NoCoalescing(),
+            BatchLoader(
+                lambda ids: product_service._load_products(engine, ids),
+                max_batch_size=1,
+            ),
+        ),
+        "batched": (NoCoalescing(), None),
+        "coalesced": (product_service._lookups, None),
+    }
+    transport = httpx.ASGITransport(app, raise_app_exceptions=False)
+    async with (
+        app.router.lifespan_context(app),
+        httpx.AsyncClient(transport=transport, base_url="http://bench") as client,
+    ):
+        header = f"{'mode':<13}{'req/s':>8}{'p50 ms':>9}{'p99 ms':>9}{'errors':>8}"
+        print(header + "".join(f"{name:>16}" for name in REPORTED))
+        for mode, (flights, loader) in modes.items():
+            product_service._lookups = flights
+            product_service._loaders = {engine: loader} if loader else {}
+            for _ in range(args.rounds):
+                before = await scrape(client)
+                elapsed, latencies, errors = await burst(client)
+                after = await scrape(client)
+
+                latencies.sort()
+                p50 = statistics.median(latencies) * 1000
+                p99 = latencies[int(len(latencies) * 0.99)] * 1000
+                deltas = [
+                    after.get(sample, 0.0) - before.get(sample, 0.0)
+                    for sample in REPORTED.values()
+                ]
+                print(
+                    f"{mode:<13}{args.requests / elapsed:>8.0f}{p50:>9.1f}"
+                    f"{p99:>9.1f}{errors:>8}"
+                    + "".join(f"{delta:>16.2f}" for delta in deltas)
+                )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
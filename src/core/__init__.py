@@ -5,6 +5,9 @@ from .exceptions import (
     ProductNotFoundError,
     ProductAlreadyExistsError,
     InvalidProductDataError,
+    InsufficientStockError,
+    ReservationNotFoundError,
+    ReservationConflictError,
     AuthenticationError,
     UnauthorizedError,
     InactiveUserError,
@@ -20,6 +23,9 @@ __all__ = [
     "ProductNotFoundError",
     "ProductAlreadyExistsError",
     "InvalidProductDataError",
+    "InsufficientStockError",
+    "ReservationNotFoundError",
+    "ReservationConflictError",
     "AuthenticationError",
     "UnauthorizedError",
     "InactiveUserError",
@@ -0,0 +1,81 @@
+import asyncio
+from typing import Awaitable, Callable, Hashable, Mapping
+
+
+class BatchLoader[K: Hashable, V]:
+    """
+    Collect keys requested close together and resolve them with one call.
+
+    Keys requested during the same event loop iteration, or within `window`
+    seconds of the first one, are passed together to `load_many`; a batch is
+    sent early once it holds `max_batch_size` keys. Keys missing from the
+    mapping it returns resolve to `None`, and if it raises, every caller of
+    the batch receives the exception. A caller being cancelled does not
+    affect the others; the batch being cancelled, as at shutdown, cancels
+    all of its callers.
+    """
+
+    def __init__(
+        self,
+        load_many: Callable[[list[K]], Awaitable[Mapping[K, V]]],
+        window: float = 0.0,
+        max_batch_size: int = 1000,
+    ):
+        self.load_many = load_many
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self.batches = 0
+        self.keys = 0
+        self._pending: dict[K, asyncio.Future[V | None]] = {}
+        self._dispatch_handle: asyncio.Handle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def load(self, key: K) -> V | None:
+        future = self._pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._pending[key] = loop.create_future()
+            if len(self._pending) >= self.max_batch_size:
+                self._dispatch()
+            elif self._dispatch_handle is None:
+                self._dispatch_handle = (
+                    loop.call_later(self.window, self._dispatch)
+                    if self.window > 0
+                    else loop.call_soon(self._dispatch)
+                )
+
+        return await asyncio.shield(future)
+
+    def _dispatch(self) -> None:
+        if self._dispatch_handle is not None:
+            self._dispatch_handle.cancel()
+            self._dispatch_handle = None
+        batch, self._pending = self._pending, {}
+        if batch:
+            task = asyncio.create_task(self._resolve(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            # Also covers a task cancelled before it started running.
+            task.add_done_callback(lambda _: self._cancel_unresolved(batch))
+
+    async def _resolve(self, batch: dict[K, asyncio.Future[V | None]]) -> None:
+        self.batches += 1
+        self.keys += len(batch)
+        try:
+            values = await self.load_many(list(batch))
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+                    # Mark the exception as retrieved when every waiter went away.
+                    future.exception()
+            return
+
+        for key, future in batch.items():
+            if not future.done():
+                future.set_result(values.get(key))
+
+    @staticmethod
+    def _cancel_unresolved(batch: dict[K, asyncio.Future[V | None]]) -> None:
+        for future in batch.values():
+            future.cancel()
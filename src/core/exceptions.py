@@ -1,6 +1,11 @@
 from fastapi import status
 
-from shared.exceptions import ApplicationException, AuthenticationError, UnauthorizedError, InactiveUserError  # noqa: F401
+from shared.exceptions import (  # noqa: F401
+    ApplicationException,
+    AuthenticationError,
+    UnauthorizedError,
+    InactiveUserError,
+)
 
 
 class ProductServiceException(ApplicationException):
@@ -19,10 +24,25 @@ class InvalidProductDataError(ProductServiceException):
     pass
 
 
+class InsufficientStockError(ProductServiceException):
+    pass
+
+
+class ReservationNotFoundError(ProductServiceException):
+    pass
+
+
+class ReservationConflictError(ProductServiceException):
+    pass
+
+
 EXCEPTION_MAPPING = {
     ProductNotFoundError: status.HTTP_404_NOT_FOUND,
     ProductAlreadyExistsError: status.HTTP_409_CONFLICT,
     InvalidProductDataError: status.HTTP_400_BAD_REQUEST,
+    InsufficientStockError: status.HTTP_409_CONFLICT,
+    ReservationNotFoundError: status.HTTP_404_NOT_FOUND,
+    ReservationConflictError: status.HTTP_409_CONFLICT,
     UnauthorizedError: status.HTTP_401_UNAUTHORIZED,
     InactiveUserError: status.HTTP_403_FORBIDDEN,
 }
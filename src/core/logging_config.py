@@ -1,9 +1,113 @@
+import atexit
+import copy
+import logging
+import queue
+import random
+from logging.handlers import QueueHandler, QueueListener
+
 from shared.logging import setup_logging as _setup_logging
 
 from core.config import settings
+from core.metrics import metrics
+
+SQL_LOGGER = "sqlalchemy.engine"
+
+DROPPED_RECORDS = metrics.counter(
+    "log_records_dropped_total",
+    "Log records dropped because the log queue was full",
+)
+SAMPLED_OUT_RECORDS = metrics.counter(
+    "log_records_sampled_out_total",
+    "Debug and SQL log records skipped by sampling",
+    ("kind",),
+)
+
+
+class LogSampler(logging.Filter):
+    """Let through only a fraction of debug records and SQL statement logs."""
+
+    def __init__(self, debug_rate: float, sql_rate: float):
+        super().__init__()
+        self.debug_rate = debug_rate
+        self.sql_rate = sql_rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.name.startswith(SQL_LOGGER):
+            rate, kind = self.sql_rate, "sql"
+        elif record.levelno <= logging.DEBUG:
+            rate, kind = self.debug_rate, "debug"
+        else:
+            return True
+
+        if rate >= 1 or random.random() < rate:
+            return True
+        SAMPLED_OUT_RECORDS.inc(kind)
+        return False
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    Queue handler that never blocks the logging thread.
+
+    Records arriving while the queue is full are dropped and counted. Only
+    the message arguments are resolved here; formatting and all I/O happen
+    in the listener thread.
+    """
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            DROPPED_RECORDS.inc()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Arguments may change, or not be safe to read from another thread,
+        # once the caller moves on.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
 
 
 def setup_logging(log_level: str | None = None) -> None:
+    """
+    Configure logging for the process.
+
+    With a non-zero `log_queue_size`, the handlers installed on the root
+    logger are moved behind a bounded queue served by a background thread,
+    so logging calls never wait for disk or console I/O.
+    """
     if log_level is None:
         log_level = settings.log_level
     _setup_logging(log_level=log_level, log_file="product-service.log")
+
+    # SQL echo goes through the root handlers instead of the stdout handler
+    # SQLAlchemy would add to its engine logger.
+    if settings.database_echo:
+        logging.getLogger(SQL_LOGGER).setLevel(logging.INFO)
+
+    root = logging.getLogger()
+    sampler = LogSampler(
+        debug_rate=settings.log_debug_sample_rate,
+        sql_rate=settings.log_sql_sample_rate,
+    )
+    if settings.log_queue_size == 0:
+        for handler in root.handlers:
+            handler.addFilter(sampler)
+        return
+    if any(isinstance(handler, DroppingQueueHandler) for handler in root.handlers):
+        return
+
+    log_queue: queue.Queue = queue.Queue(maxsize=settings.log_queue_size)
+    queue_handler = DroppingQueueHandler(log_queue)
+    queue_handler.addFilter(sampler)
+    listener = QueueListener(log_queue, *root.handlers, respect_handler_level=True)
+
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    listener.start()
+    atexit.register(listener.stop)
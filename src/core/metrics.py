@@ -0,0 +1,358 @@
+import asyncio
+import bisect
+import json
+import logging
+import math
+import os
+from contextlib import suppress
+from pathlib import Path
+from typing import Any, Callable, Sequence
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = (f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class Metric:
+    """Base class of a metric family with a fixed set of label names."""
+
+    type: str = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _check_labels(self, labels: tuple[str, ...]) -> None:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(
+                f"{self.name} expects labels {self.labelnames}, got {labels}"
+            )
+
+    def samples(self) -> list[str]:
+        return self._samples(self.labelnames, self._values)
+
+    def _samples(
+        self,
+        labelnames: tuple[str, ...],
+        values: dict[tuple[str, ...], Any],
+    ) -> list[str]:
+        raise NotImplementedError
+
+    def export(self) -> list[list]:
+        """Current values as JSON-serializable `[labels, value]` pairs."""
+        return [[list(labels), value] for labels, value in self._values.items()]
+
+    def combine(self, exports: dict[int, list[list]]) -> list[str]:
+        """
+        Samples of the values exported by several worker processes.
+
+        Args:
+            exports: Result of `export` by worker pid
+
+        Returns:
+            Sample lines with the values of every label set summed up
+        """
+        values: dict[tuple[str, ...], Any] = {}
+        for exported in exports.values():
+            for labels, value in exported:
+                labels = tuple(labels)
+                values[labels] = (
+                    self._add(values[labels], value) if labels in values else value
+                )
+        return self._samples(self.labelnames, values)
+
+    @staticmethod
+    def _add(total: Any, value: Any) -> Any:
+        return total + value
+
+    def render(self, samples: list[str] | None = None) -> str:
+        header = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type}",
+        ]
+        return "\n".join(header + (self.samples() if samples is None else samples))
+
+
+class _ScalarMetric(Metric):
+    """Metric holding a single number per label set."""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def _samples(
+        self,
+        labelnames: tuple[str, ...],
+        values: dict[tuple[str, ...], float],
+    ) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(labelnames, labels)} {_format_value(value)}"
+            for labels, value in values.items()
+        ]
+
+
+class Counter(_ScalarMetric):
+    """Monotonically increasing value per label set."""
+
+    type = "counter"
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        if labels not in self._values:
+            self._check_labels(labels)
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+
+class Gauge(_ScalarMetric):
+    """Value per label set that can go up and down."""
+
+    type = "gauge"
+
+    def set(self, value: float, *labels: str) -> None:
+        if labels not in self._values:
+            self._check_labels(labels)
+        self._values[labels] = value
+
+    def combine(self, exports: dict[int, list[list]]) -> list[str]:
+        """
+        Samples of the values exported by several worker processes.
+
+        Gauges describe the state of one process, such as its pool usage,
+        and are not summed; every sample is labelled with its worker's pid.
+        """
+        values = {
+            (*labels, str(pid)): value
+            for pid, exported in exports.items()
+            for labels, value in exported
+        }
+        return self._samples((*self.labelnames, "pid"), values)
+
+
+class Histogram(Metric):
+    """Distribution of observed values in fixed cumulative buckets."""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [per-bucket counts (+Inf last), sum, count]
+        self._values: dict[tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        state = self._values.get(labels)
+        if state is None:
+            self._check_labels(labels)
+            state = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        state[0][bisect.bisect_left(self.buckets, value)] += 1
+        state[1] += value
+        state[2] += 1
+
+    @staticmethod
+    def _add(total: list, value: list) -> list:
+        counts = [a + b for a, b in zip(total[0], value[0])]
+        return [counts, total[1] + value[1], total[2] + value[2]]
+
+    def _samples(
+        self,
+        labelnames: tuple[str, ...],
+        values: dict[tuple[str, ...], list],
+    ) -> list[str]:
+        lines = []
+        bucket_labels = (*labelnames, "le")
+        for labels, (counts, total, count) in values.items():
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, math.inf), counts):
+                cumulative += bucket_count
+                label_text = _format_labels(
+                    bucket_labels,
+                    (*labels, _format_value(bound)),
+                )
+                lines.append(f"{self.name}_bucket{label_text} {cumulative}")
+            label_text = _format_labels(labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(total)}")
+            lines.append(f"{self.name}_count{label_text} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Collection of metrics rendered in the Prometheus text exposition format.
+
+    Collectors registered with `add_collector` run before every render and
+    can refresh gauges that are cheaper to read on scrape than to track.
+
+    Each worker process has its own registry. With a `directory` shared by
+    the workers of an instance, every worker writes its values there every
+    `write_interval` seconds and on scrape, and `render` combines the files
+    of all workers, so any worker answers a scrape for the whole instance.
+    Counters and histograms of workers that exited keep counting, gauges
+    are only reported for live workers.
+    """
+
+    content_type = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self, directory: str | None = None, write_interval: float = 5.0):
+        self.directory = Path(directory) if directory else None
+        self.write_interval = write_interval
+        self._metrics: dict[str, Metric] = {}
+        self._collectors: list[Callable[[], None]] = []
+        self._task: asyncio.Task | None = None
+
+    def _register[M: Metric](self, metric: M) -> M:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+    ) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+    ) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        self._collectors.append(collector)
+
+    def start(self) -> None:
+        """Write this worker's values to the shared directory periodically."""
+        if self.directory is not None and self._task is None:
+            self._task = asyncio.create_task(self._run(), name="metrics-writer")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+        self.write()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                self.write()
+            except OSError as e:
+                logger.warning("Failed to write metrics to %s: %s", self.directory, e)
+            await asyncio.sleep(self.write_interval)
+
+    def _collect(self) -> None:
+        for collector in self._collectors:
+            collector()
+
+    def write(self) -> None:
+        """Store this worker's current values in the shared directory."""
+        self._collect()
+        path = self.directory / f"{os.getpid()}.json"
+        temporary = path.with_suffix(".tmp")
+        temporary.write_text(
+            json.dumps(
+                {name: metric.export() for name, metric in self._metrics.items()}
+            )
+        )
+        # Readers see either the previous or the new file, never a partial one
+        temporary.replace(path)
+
+    def _read_workers(self) -> dict[int, dict[str, list[list]]]:
+        workers = {}
+        for path in self.directory.glob("*.json"):
+            with suppress(OSError, ValueError):
+                workers[int(path.stem)] = json.loads(path.read_text())
+        return workers
+
+    def render(self) -> str:
+        if self.directory is None:
+            self._collect()
+            samples = {name: None for name in self._metrics}
+        else:
+            self.write()
+            workers = self._read_workers()
+            live = {pid for pid in workers if _is_running(pid)}
+            samples = {}
+            for name, metric in self._metrics.items():
+                exports = {
+                    pid: values[name]
+                    for pid, values in workers.items()
+                    if name in values and (pid in live or not isinstance(metric, Gauge))
+                }
+                samples[name] = metric.combine(exports)
+        return (
+            "\n".join(
+                metric.render(samples[name]) for name, metric in self._metrics.items()
+            )
+            + "\n"
+        )
+
+
+def _is_running(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+metrics = MetricsRegistry(
+    settings.metrics_dir,
+    write_interval=settings.metrics_write_interval_seconds,
+)
@@ -0,0 +1,169 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import Awaitable, Callable
+
+from core.config import settings
+from core.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+Check = Callable[[], Awaitable[None]]
+
+
+class DependencyState(StrEnum):
+    STARTING = "starting"
+    READY = "ready"
+    FAILED = "failed"
+
+
+@dataclass(slots=True)
+class Dependency:
+    name: str
+    critical: bool
+    check: Check | None
+    state: DependencyState = DependencyState.STARTING
+    error: str | None = None
+    checked_at: float | None = None
+
+    def as_dict(self) -> dict:
+        return {
+            "status": self.state,
+            "critical": self.critical,
+            "error": self.error,
+            "checked_seconds_ago": (
+                round(time.monotonic() - self.checked_at, 3)
+                if self.checked_at is not None
+                else None
+            ),
+        }
+
+
+class Readiness:
+    """
+    Startup state and deep health checks of the service's dependencies.
+
+    Dependencies are registered as starting and marked ready or failed by
+    the code that connects them. Once a dependency has started, its optional
+    deep check is re-run by `report()` when the last result is older than
+    `cache_ttl` seconds; concurrent probes share one check and each check
+    is bounded by `check_timeout`. The service is ready when every critical
+    dependency is.
+    """
+
+    def __init__(self, cache_ttl: float, check_timeout: float):
+        self.cache_ttl = cache_ttl
+        self.check_timeout = check_timeout
+        self._dependencies: dict[str, Dependency] = {}
+        self._flights: SingleFlight[str, None] = SingleFlight()
+
+    def register(
+        self,
+        name: str,
+        check: Check | None = None,
+        critical: bool = True,
+    ) -> None:
+        self._dependencies[name] = Dependency(name, critical, check)
+
+    def mark_ready(self, name: str) -> None:
+        dependency = self._dependencies[name]
+        dependency.state = DependencyState.READY
+        dependency.error = None
+        dependency.checked_at = time.monotonic()
+
+    def mark_failed(self, name: str, error: BaseException | str) -> None:
+        dependency = self._dependencies[name]
+        dependency.state = DependencyState.FAILED
+        dependency.error = str(error) or type(error).__name__
+        dependency.checked_at = time.monotonic()
+
+    async def start(self, name: str, connect: Check) -> None:
+        """
+        Run a dependency's startup step and record its outcome.
+
+        Raises:
+            Exception: Whatever `connect` raised, after marking it failed
+        """
+        started = time.monotonic()
+        try:
+            await connect()
+        except Exception as e:
+            self.mark_failed(name, e)
+            raise
+        self.mark_ready(name)
+        logger.info("Dependency %s ready in %.2fs", name, time.monotonic() - started)
+
+    def start_in_background(
+        self,
+        name: str,
+        connect: Check,
+        retry_interval: float,
+    ) -> asyncio.Task:
+        """Run a dependency's startup step in a task, retrying until it succeeds."""
+
+        async def run() -> None:
+            while True:
+                try:
+                    await self.start(name, connect)
+                    return
+                except Exception as e:
+                    logger.warning(
+                        "Starting %s failed, retrying in %ss: %s",
+                        name,
+                        retry_interval,
+                        e,
+                    )
+                await asyncio.sleep(retry_interval)
+
+        return asyncio.create_task(run(), name=f"start-{name}")
+
+    async def report(self) -> tuple[bool, dict]:
+        """
+        Refresh stale deep checks and summarize the dependency states.
+
+        Returns:
+            Whether all critical dependencies are ready, and the state of
+            each dependency by name
+        """
+        stale = [
+            dependency
+            for dependency in self._dependencies.values()
+            if dependency.check is not None
+            and dependency.state != DependencyState.STARTING
+            and time.monotonic() - dependency.checked_at >= self.cache_ttl
+        ]
+        await asyncio.gather(
+            *(
+                self._flights.do(dependency.name, lambda d=dependency: self._run(d))
+                for dependency in stale
+            )
+        )
+
+        ready = all(
+            dependency.state == DependencyState.READY
+            for dependency in self._dependencies.values()
+            if dependency.critical
+        )
+        return ready, {
+            name: dependency.as_dict()
+            for name, dependency in self._dependencies.items()
+        }
+
+    async def _run(self, dependency: Dependency) -> None:
+        try:
+            async with asyncio.timeout(self.check_timeout):
+                await dependency.check()
+        except Exception as e:
+            if dependency.state == DependencyState.READY:
+                logger.warning("Readiness check of %s failed: %s", dependency.name, e)
+            self.mark_failed(dependency.name, e)
+        else:
+            self.mark_ready(dependency.name)
+
+
+readiness = Readiness(
+    cache_ttl=settings.ready_check_cache_seconds,
+    check_timeout=settings.ready_check_timeout_seconds,
+)
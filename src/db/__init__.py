@@ -1 +1,9 @@
-from .db_helper import db_session_manager
+from .db_helper import (
+    db_session_manager,
+    db_router,
+    get_read_session,
+    get_write_session,
+    read_session_scope,
+    session_scope,
+)
+from .routing import reads_own_writes, reads_replica
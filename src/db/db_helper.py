@@ -1,5 +1,47 @@
-from shared.db.session import AsyncSessionManager
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.config import settings
 
-db_session_manager = AsyncSessionManager(database_url=settings.database_url, echo=True)
+from .routing import ReadWriteRouter
+from .session import AsyncSessionManager
+
+db_session_manager = AsyncSessionManager(
+    database_url=settings.database_url,
+    pool_size=settings.database_pool_size,
+    max_overflow=settings.database_max_overflow,
+    pool_timeout=settings.database_pool_timeout_seconds,
+)
+
+db_router = ReadWriteRouter(
+    primary=db_session_manager,
+    replicas=[
+        AsyncSessionManager(
+            database_url=url,
+            pool_size=settings.database_replica_pool_size,
+            max_overflow=settings.database_replica_max_overflow,
+            pool_timeout=settings.database_pool_timeout_seconds,
+            name=f"replica-{i}",
+        )
+        for i, url in enumerate(settings.database_replica_urls)
+    ],
+    read_your_writes_seconds=settings.read_your_writes_seconds,
+    health_check_interval=settings.replica_health_check_interval_seconds,
+    health_check_timeout=settings.replica_health_check_timeout_seconds,
+)
+
+# Request dependencies: reads may be served by a replica, writes never are.
+get_read_session = db_router.get_read_session
+get_write_session = db_router.get_write_session
+
+# Session context manager for work running outside of a request (background tasks).
+session_scope = asynccontextmanager(db_session_manager.get_async_session)
+
+
+@asynccontextmanager
+async def read_session_scope() -> AsyncIterator[AsyncSession]:
+    """Like `session_scope`, but on a healthy replica when one is configured."""
+    async for session in db_router.read_session():
+        yield session
@@ -0,0 +1,141 @@
+import re
+import time
+from functools import lru_cache
+
+from sqlalchemy import event, exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+
+from core.metrics import metrics
+
+# Distinct statement shapes kept as label values; the rest share "other"
+MAX_STATEMENT_SHAPES = 200
+MAX_SHAPE_LENGTH = 160
+
+_QUERY_START_KEY = "metrics_query_start"
+
+SQL_SECONDS = metrics.histogram(
+    "db_statement_duration_seconds",
+    "SQL statement execution time by statement shape",
+    ("pool", "statement"),
+)
+POOL_CHECKOUT_SECONDS = metrics.histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled database connection",
+    ("pool",),
+)
+POOL_IN_USE = metrics.gauge(
+    "db_pool_connections_in_use",
+    "Database connections currently checked out of the pool",
+    ("pool",),
+)
+POOL_SIZE = metrics.gauge(
+    "db_pool_connections_open",
+    "Database connections currently held by the pool",
+    ("pool",),
+)
+POOL_OVERFLOW = metrics.gauge(
+    "db_pool_overflow_connections",
+    "Connections opened beyond the pool size",
+    ("pool",),
+)
+POOL_WAITING = metrics.gauge(
+    "db_pool_checkouts_waiting",
+    "Callers currently waiting to check out a pooled connection",
+    ("pool",),
+)
+POOL_TIMEOUTS = metrics.counter(
+    "db_pool_checkout_timeouts_total",
+    "Connection checkouts that gave up after the pool timeout",
+    ("pool",),
+)
+
+_PARAMETER = re.compile(r"(?:\$\d+|%\(\w+\)s|%s|(?<![:\w]):\w+|\?)(?:::\w+)?")
+_PARAMETER_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+_ROW_LIST = re.compile(r"(\([^()]*\))(?:\s*,\s*\([^()]*\))+")
+_SELECT_LIST = re.compile(r"\bSELECT (?:(?!\bSELECT\b).)+? FROM\b")
+_WHITESPACE = re.compile(r"\s+")
+_shapes: set[str] = set()
+
+
+@lru_cache(maxsize=1024)
+def statement_shape(statement: str) -> str:
+    """
+    Reduce a SQL statement to a low-cardinality label value.
+
+    Select lists are elided, placeholders of every paramstyle become `?`,
+    expanded `IN` lists and multi-row `VALUES` collapse to a single element,
+    and the result is truncated. Once `MAX_STATEMENT_SHAPES` distinct shapes
+    have been seen, new ones are reported as "other".
+    """
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    shape = _SELECT_LIST.sub("SELECT ... FROM", shape)
+    shape = _PARAMETER.sub("?", shape)
+    shape = _PARAMETER_LIST.sub("?, ...", shape)
+    shape = _ROW_LIST.sub(r"\1, ...", shape)
+    shape = shape[:MAX_SHAPE_LENGTH]
+
+    if shape not in _shapes:
+        if len(_shapes) >= MAX_STATEMENT_SHAPES:
+            return "other"
+        _shapes.add(shape)
+    return shape
+
+
+def instrumented_pool_class(name: str) -> type[Pool]:
+    """
+    Return an async queue pool class that times connection checkouts and
+    counts the callers waiting for one.
+    """
+
+    class InstrumentedPool(AsyncAdaptedQueuePool):
+        waiting = 0
+
+        def connect(self):
+            start = time.perf_counter()
+            self.waiting += 1
+            try:
+                return super().connect()
+            except exc.TimeoutError:
+                POOL_TIMEOUTS.inc(name)
+                raise
+            finally:
+                self.waiting -= 1
+                POOL_CHECKOUT_SECONDS.observe(time.perf_counter() - start, name)
+
+    InstrumentedPool.__name__ = f"InstrumentedPool[{name}]"
+    return InstrumentedPool
+
+
+def instrument_engine(engine: AsyncEngine, name: str) -> None:
+    """Record statement timings and pool usage of `engine` under `name`."""
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        conn.info.setdefault(_QUERY_START_KEY, []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, many):
+        start = conn.info[_QUERY_START_KEY].pop()
+        SQL_SECONDS.observe(
+            time.perf_counter() - start,
+            name,
+            statement_shape(statement),
+        )
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _handle_error(context):
+        conn = context.connection
+        if conn is not None and conn.info.get(_QUERY_START_KEY):
+            conn.info[_QUERY_START_KEY].pop()
+
+    def collect_pool_usage() -> None:
+        pool = sync_engine.pool
+        if isinstance(pool, AsyncAdaptedQueuePool):
+            POOL_IN_USE.set(pool.checkedout(), name)
+            POOL_SIZE.set(pool.checkedin() + pool.checkedout(), name)
+            POOL_OVERFLOW.set(max(pool.overflow(), 0), name)
+            POOL_WAITING.set(getattr(pool, "waiting", 0), name)
+
+    metrics.add_collector(collect_pool_usage)
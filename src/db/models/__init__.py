@@ -1,8 +1,13 @@
 from .base import Base
 from .product import Product
-
+from .outbox import OutboxEvent
+from .reservation import StockReservation
+from .processed_message import ProcessedMessage
 
 __all__ = [
     "Base",
     "Product",
+    "OutboxEvent",
+    "StockReservation",
+    "ProcessedMessage",
 ]
@@ -0,0 +1,17 @@
+from datetime import datetime
+from sqlalchemy import func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class ProcessedMessage(Base):
+    __tablename__ = "processed_messages"
+
+    message_id: Mapped[str] = mapped_column(primary_key=True)
+
+    processed_at: Mapped[datetime] = mapped_column(
+        server_default=func.now(),
+        nullable=False,
+        index=True,
+    )
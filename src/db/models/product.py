@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import DECIMAL, func
+from sqlalchemy import DECIMAL, Index, func, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .base import Base
@@ -7,6 +7,33 @@ from .base import Base
 
 class Product(Base):
     __tablename__ = "products"
+    __table_args__ = (
+        Index("ix_products_created_at_id", "created_at", "id"),
+        Index("ix_products_price_id", "price", "id"),
+        Index("ix_products_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_products_user_id_price_id", "user_id", "price", "id"),
+        # Partial indexes serving the in-stock filter for every ordering.
+        Index(
+            "ix_products_in_stock_id",
+            "id",
+            postgresql_where=text("quantity > 0"),
+            sqlite_where=text("quantity > 0"),
+        ),
+        Index(
+            "ix_products_in_stock_created_at_id",
+            "created_at",
+            "id",
+            postgresql_where=text("quantity > 0"),
+            sqlite_where=text("quantity > 0"),
+        ),
+        Index(
+            "ix_products_in_stock_price_id",
+            "price",
+            "id",
+            postgresql_where=text("quantity > 0"),
+            sqlite_where=text("quantity > 0"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(nullable=False, index=True)
@@ -0,0 +1,25 @@
+from datetime import datetime
+from sqlalchemy import JSON, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class StockReservation(Base):
+    __tablename__ = "stock_reservations"
+
+    # Keys are chosen by clients, so each user has a key space of their own.
+    key: Mapped[str] = mapped_column(primary_key=True)
+    user_id: Mapped[int] = mapped_column(primary_key=True)
+    items: Mapped[list] = mapped_column(JSON, nullable=False)
+    status: Mapped[str] = mapped_column(nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(
+        server_default=func.now(),
+        nullable=False,
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
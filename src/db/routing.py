@@ -0,0 +1,145 @@
+import asyncio
+import itertools
+import logging
+import time
+from contextlib import suppress
+from typing import AsyncIterator
+
+from fastapi import Request, Response
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .session import AsyncSessionManager
+
+logger = logging.getLogger(__name__)
+
+READ_PRIMARY_COOKIE = "read_primary"
+
+# Session.info keys recording how a read session was routed.
+READ_PRIMARY_INFO = "read_primary"
+REPLICA_INFO = "replica"
+
+
+def reads_own_writes(session: AsyncSession) -> bool:
+    """Whether the session serves a client that must see its own recent writes."""
+    return session.info.get(READ_PRIMARY_INFO, False)
+
+
+def reads_replica(session: AsyncSession) -> bool:
+    """Whether the session reads from a replica, which may lag the primary."""
+    return session.info.get(REPLICA_INFO, False)
+
+
+class ReadWriteRouter:
+    """
+    Route read-only requests to replica pools and writes to the primary.
+
+    A client that has just written gets a short-lived cookie and reads from
+    the primary until it expires, so it always sees its own writes; its read
+    sessions are flagged so shared in-process copies are bypassed as well.
+    Replicas are health-checked in the background; unhealthy ones are
+    skipped, and reads fall back to the primary when none is healthy.
+    """
+
+    def __init__(
+        self,
+        primary: AsyncSessionManager,
+        replicas: list[AsyncSessionManager],
+        read_your_writes_seconds: float,
+        health_check_interval: float,
+        health_check_timeout: float,
+    ):
+        self.primary = primary
+        self.replicas = replicas
+        self.read_your_writes_seconds = read_your_writes_seconds
+        self.health_check_interval = health_check_interval
+        self.health_check_timeout = health_check_timeout
+        self.healthy: dict[str, bool] = {replica.name: True for replica in replicas}
+        self._round_robin = itertools.cycle(replicas)
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self.replicas and self._task is None:
+            self._task = asyncio.create_task(
+                self._monitor_replicas(),
+                name="replica-health-check",
+            )
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        for replica in self.replicas:
+            await replica.close()
+
+    def pick_read_manager(self, request: Request | None = None) -> AsyncSessionManager:
+        if request is not None and self._recently_wrote(request):
+            return self.primary
+
+        for _ in range(len(self.replicas)):
+            replica = next(self._round_robin)
+            if self.healthy[replica.name]:
+                return replica
+        return self.primary
+
+    async def get_read_session(self, request: Request) -> AsyncIterator[AsyncSession]:
+        async for session in self.read_session(self._recently_wrote(request)):
+            yield session
+
+    async def read_session(
+        self,
+        read_primary: bool = False,
+    ) -> AsyncIterator[AsyncSession]:
+        """Yield a read session, flagged with how it was routed."""
+        manager = self.primary if read_primary else self.pick_read_manager()
+        async for session in manager.get_async_session():
+            session.info[READ_PRIMARY_INFO] = read_primary
+            session.info[REPLICA_INFO] = manager is not self.primary
+            yield session
+
+    async def get_write_session(
+        self,
+        response: Response,
+    ) -> AsyncIterator[AsyncSession]:
+        if self.replicas:
+            response.set_cookie(
+                READ_PRIMARY_COOKIE,
+                str(time.time() + self.read_your_writes_seconds),
+                max_age=max(1, int(self.read_your_writes_seconds)),
+                httponly=True,
+                samesite="lax",
+            )
+        async for session in self.primary.get_async_session():
+            yield session
+
+    def _recently_wrote(self, request: Request) -> bool:
+        value = request.cookies.get(READ_PRIMARY_COOKIE)
+        if value is None:
+            return False
+        try:
+            return float(value) > time.time()
+        except ValueError:
+            return False
+
+    async def check_replicas(self) -> None:
+        for replica in self.replicas:
+            try:
+                async with asyncio.timeout(self.health_check_timeout):
+                    async with replica.engine.connect() as connection:
+                        await connection.execute(text("SELECT 1"))
+                healthy = True
+            except Exception as e:
+                healthy = False
+                if self.healthy[replica.name]:
+                    logger.warning("Replica %s is unhealthy: %s", replica.name, e)
+
+            if healthy and not self.healthy[replica.name]:
+                logger.info("Replica %s is healthy again", replica.name)
+            self.healthy[replica.name] = healthy
+
+    async def _monitor_replicas(self) -> None:
+        while True:
+            await self.check_replicas()
+            await asyncio.sleep(self.health_check_interval)
@@ -0,0 +1,59 @@
+from typing import AsyncIterator
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from .instrumentation import instrument_engine, instrumented_pool_class
+
+
+def _is_memory_sqlite(database_url: str) -> bool:
+    url = make_url(database_url)
+    if url.get_backend_name() != "sqlite":
+        return False
+    return url.database in (None, "", ":memory:")
+
+
+class AsyncSessionManager:
+    """Owns one engine (and connection pool) and hands out sessions on it."""
+
+    def __init__(
+        self,
+        database_url: str,
+        echo: bool = False,
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        pool_timeout: float = 30.0,
+        name: str = "primary",
+    ):
+        self.name = name
+        pool_kwargs = {}
+        if not _is_memory_sqlite(database_url):
+            pool_kwargs = {
+                "poolclass": instrumented_pool_class(name),
+                "pool_size": pool_size,
+                "max_overflow": max_overflow,
+                "pool_timeout": pool_timeout,
+                "pool_pre_ping": True,
+            }
+        self.engine: AsyncEngine = create_async_engine(
+            database_url,
+            echo=echo,
+            **pool_kwargs,
+        )
+        instrument_engine(self.engine, name)
+        self.session_factory = async_sessionmaker(
+            self.engine,
+            expire_on_commit=False,
+        )
+
+    async def get_async_session(self) -> AsyncIterator[AsyncSession]:
+        async with self.session_factory() as session:
+            yield session
+
+    async def close(self) -> None:
+        await self.engine.dispose()
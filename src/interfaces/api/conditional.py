@@ -0,0 +1,48 @@
+import hashlib
+from datetime import datetime
+from typing import Protocol, Sequence
+
+from fastapi import Request, Response, status
+
+from core.config import settings
+
+
+class Versioned(Protocol):
+    id: int
+    updated_at: datetime
+
+
+def product_etag(product: Versioned) -> str:
+    """Strong ETag of a single product, derived from its id and updated_at."""
+    return f'"{product.id}-{product.updated_at.isoformat()}"'
+
+
+def page_etag(products: Sequence[Versioned], next_cursor: str | None) -> str:
+    """Strong ETag of a listing page, derived from the ids and versions on it."""
+    digest = hashlib.sha256()
+    for product in products:
+        digest.update(f"{product.id}:{product.updated_at.isoformat()};".encode())
+    digest.update((next_cursor or "").encode())
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """Evaluate If-None-Match against the current ETag (weak comparison)."""
+    header = request.headers.get("if-none-match")
+    if header is None:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = (tag.strip().removeprefix("W/") for tag in header.split(","))
+    return etag in candidates
+
+
+def set_cache_headers(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = settings.products_cache_control
+
+
+def not_modified(etag: str) -> Response:
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_cache_headers(response, etag)
+    return response
@@ -1,10 +1,34 @@
 import logging
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from .schemas import ProductRead, ProductCreate, ProductUpdate
-from db import db_session_manager
+from .conditional import (
+    is_not_modified,
+    not_modified,
+    page_etag,
+    product_etag,
+    set_cache_headers,
+)
+from .serializers import JSONBytesResponse, encode_product, encode_product_page
+from .schemas import (
+    ProductRead,
+    ProductCreate,
+    ProductUpdate,
+    ProductBulkCreate,
+    ProductBulkUpdate,
+    ProductBatch,
+    ProductFilter,
+    ProductPage,
+    ProductSort,
+    StockAdjustment,
+    StockLevel,
+    StockReservationCreate,
+    StockReservationRead,
+)
+from db import get_read_session, get_write_session
+from core.config import settings
 from core.dependencies import (
     get_current_active_user,
     get_product_service,
@@ -18,19 +42,124 @@ router = APIRouter(
 )
 
 
-@router.get("/", response_model=list[ProductRead])
+@router.get("/", response_model=ProductPage)
 async def get_products(
-    session: AsyncSession = Depends(db_session_manager.get_async_session),
+    request: Request,
+    response: Response,
+    limit: int = Query(
+        settings.products_page_size_default,
+        ge=1,
+        le=settings.products_page_size_max,
+    ),
+    cursor: str | None = Query(None),
+    sort: ProductSort = Query(ProductSort.ID),
+    filters: ProductFilter = Depends(),
+    session: AsyncSession = Depends(get_read_session),
+    product_service: ProductService = Depends(get_product_service),
+):
+    if settings.products_fast_serialization:
+        rows, next_cursor = await product_service.get_product_rows_page(
+            session,
+            limit=limit,
+            cursor=cursor,
+            sort=sort,
+            filters=filters,
+        )
+
+        etag = page_etag(rows, next_cursor)
+        if is_not_modified(request, etag):
+            return not_modified(etag)
+
+        fast_response = JSONBytesResponse(encode_product_page(rows, next_cursor))
+        set_cache_headers(fast_response, etag)
+        return fast_response
+
+    products, next_cursor = await product_service.get_products_page(
+        session,
+        limit=limit,
+        cursor=cursor,
+        sort=sort,
+        filters=filters,
+    )
+
+    etag = page_etag(products, next_cursor)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    set_cache_headers(response, etag)
+
+    return ProductPage(
+        items=[ProductRead.model_validate(product) for product in products],
+        next_cursor=next_cursor,
+    )
+
+
+@router.get("/search", response_model=ProductPage)
+async def search_products(
+    q: str = Query(
+        ...,
+        min_length=1,
+        max_length=settings.products_search_max_query_length,
+    ),
+    limit: int = Query(
+        settings.products_page_size_default,
+        ge=1,
+        le=settings.products_page_size_max,
+    ),
+    cursor: str | None = Query(None),
+    session: AsyncSession = Depends(get_read_session),
+    product_service: ProductService = Depends(get_product_service),
+):
+    products, next_cursor = await product_service.search_products(
+        session,
+        q,
+        limit=limit,
+        cursor=cursor,
+    )
+    return ProductPage(
+        items=[ProductRead.model_validate(product) for product in products],
+        next_cursor=next_cursor,
+    )
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_products(
+    session: AsyncSession = Depends(get_read_session),
+    product_service: ProductService = Depends(get_product_service),
+):
+    """Stream the whole catalog as newline-delimited JSON."""
+
+    async def ndjson_chunks():
+        batches = product_service.stream_products(
+            session,
+            batch_size=settings.products_export_batch_size,
+        )
+        async for products in batches:
+            yield "".join(
+                ProductRead.model_validate(product).model_dump_json() + "\n"
+                for product in products
+            )
+
+    return StreamingResponse(ndjson_chunks(), media_type="application/x-ndjson")
+
+
+@router.get("/batch", response_model=ProductBatch)
+async def get_products_batch(
+    ids: list[int] = Query(
+        ...,
+        min_length=1,
+        max_length=settings.products_batch_max_ids,
+    ),
+    session: AsyncSession = Depends(get_read_session),
     product_service: ProductService = Depends(get_product_service),
 ):
-    products = await product_service.get_all_products(session)
-    return products
+    products, missing_ids = await product_service.get_products_by_ids(session, ids)
+    return ProductBatch(items=products, missing_ids=missing_ids)
 
 
 @router.post("/", response_model=ProductRead, status_code=status.HTTP_201_CREATED)
 async def create_product(
     product: ProductCreate,
-    session: AsyncSession = Depends(db_session_manager.get_async_session),
+    session: AsyncSession = Depends(get_write_session),
     product_service: ProductService = Depends(get_product_service),
     current_user: dict = Depends(get_current_active_user),
 ):
@@ -42,13 +171,110 @@ async def create_product(
     return new_product
 
 
+@router.post(
+    "/bulk",
+    response_model=list[ProductRead],
+    status_code=status.HTTP_201_CREATED,
+)
+async def bulk_create_products(
+    products: ProductBulkCreate,
+    session: AsyncSession = Depends(get_write_session),
+    product_service: ProductService = Depends(get_product_service),
+    current_user: dict = Depends(get_current_active_user),
+):
+    return await product_service.bulk_create_products(
+        session,
+        products.items,
+        current_user.get("id"),
+    )
+
+
+@router.put("/bulk", response_model=list[ProductRead])
+async def bulk_update_products(
+    products: ProductBulkUpdate,
+    session: AsyncSession = Depends(get_write_session),
+    product_service: ProductService = Depends(get_product_service),
+    current_user: dict = Depends(get_current_active_user),
+):
+    return await product_service.bulk_update_products(
+        session,
+        products.items,
+        current_user.get("id"),
+    )
+
+
+@router.post(
+    "/reservations",
+    response_model=StockReservationRead,
+    status_code=status.HTTP_201_CREATED,
+)
+async def reserve_stock(
+    reservation: StockReservationCreate,
+    session: AsyncSession = Depends(get_write_session),
+    product_service: ProductService = Depends(get_product_service),
+    current_user: dict = Depends(get_current_active_user),
+):
+    return await product_service.reserve_stock(
+        session,
+        reservation.reservation_key,
+        reservation.items,
+        current_user.get("id"),
+    )
+
+
+@router.post(
+    "/reservations/{reservation_key}/release",
+    response_model=StockReservationRead,
+)
+async def release_stock(
+    reservation_key: str,
+    session: AsyncSession = Depends(get_write_session),
+    product_service: ProductService = Depends(get_product_service),
+    current_user: dict = Depends(get_current_active_user),
+):
+    return await product_service.release_stock(
+        session,
+        reservation_key,
+        current_user.get("id"),
+    )
+
+
+@router.post("/{product_id}/stock", response_model=StockLevel)
+async def adjust_stock(
+    product_id: int,
+    adjustment: StockAdjustment,
+    session: AsyncSession = Depends(get_write_session),
+    product_service: ProductService = Depends(get_product_service),
+    current_user: dict = Depends(get_current_active_user),
+):
+    return await product_service.adjust_stock(
+        session,
+        product_id,
+        adjustment.delta,
+        current_user.get("id"),
+    )
+
+
 @router.get("/{product_id}", response_model=ProductRead)
 async def get_product(
     product_id: int,
-    session: AsyncSession = Depends(db_session_manager.get_async_session),
+    request: Request,
+    response: Response,
+    session: AsyncSession = Depends(get_read_session),
     product_service: ProductService = Depends(get_product_service),
 ):
     product = await product_service.get_product_by_id(session, product_id)
+
+    etag = product_etag(product)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+
+    if settings.products_fast_serialization:
+        fast_response = JSONBytesResponse(encode_product(product))
+        set_cache_headers(fast_response, etag)
+        return fast_response
+
+    set_cache_headers(response, etag)
     return product
 
 
@@ -56,7 +282,7 @@ async def get_product(
 async def update_product(
     product_id: int,
     product_update: ProductUpdate,
-    session: AsyncSession = Depends(db_session_manager.get_async_session),
+    session: AsyncSession = Depends(get_write_session),
     product_service: ProductService = Depends(get_product_service),
     current_user: dict = Depends(get_current_active_user),
 ):
@@ -72,7 +298,7 @@ async def update_product(
 @router.delete("/{product_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_product(
     product_id: int,
-    session: AsyncSession = Depends(db_session_manager.get_async_session),
+    session: AsyncSession = Depends(get_write_session),
     product_service: ProductService = Depends(get_product_service),
     current_user: dict = Depends(get_current_active_user),
 ):
@@ -1,5 +1,9 @@
-from datetime import datetime
-from pydantic import BaseModel, Field, ConfigDict
+from collections import Counter
+from datetime import datetime, timezone
+from enum import StrEnum
+from pydantic import BaseModel, Field, ConfigDict, field_validator
+
+from core.config import settings
 
 
 class ProductBase(BaseModel):
@@ -60,6 +64,44 @@ class ProductUpdate(BaseModel):
     )
 
 
+class ProductBulkCreate(BaseModel):
+    """Schema for creating many products at once."""
+
+    items: list[ProductCreate] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.products_bulk_max_items,
+    )
+
+
+class ProductBulkUpdateItem(ProductUpdate):
+    """Schema for a single entry of a bulk update."""
+
+    id: int = Field(..., example=1)
+
+
+class ProductBulkUpdate(BaseModel):
+    """Schema for updating many products at once."""
+
+    items: list[ProductBulkUpdateItem] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.products_bulk_max_items,
+    )
+
+    @field_validator("items")
+    @classmethod
+    def unique_ids(
+        cls,
+        items: list[ProductBulkUpdateItem],
+    ) -> list[ProductBulkUpdateItem]:
+        counts = Counter(item.id for item in items)
+        duplicates = sorted(pid for pid, count in counts.items() if count > 1)
+        if duplicates:
+            raise ValueError(f"duplicate product ids {duplicates}")
+        return items
+
+
 class ProductRead(ProductBase):
     """Schema for reading product data."""
 
@@ -69,3 +111,98 @@ class ProductRead(ProductBase):
     user_id: int = Field(..., example=1)
     created_at: datetime
     updated_at: datetime
+
+
+class ProductBatch(BaseModel):
+    """Schema for the result of a batch product lookup."""
+
+    items: list[ProductRead]
+    missing_ids: list[int] = Field(default_factory=list, example=[42])
+
+
+class StockItem(BaseModel):
+    """Schema for a quantity of a single product."""
+
+    product_id: int = Field(..., example=1)
+    quantity: int = Field(..., example=2, gt=0)
+
+
+class StockReservationCreate(BaseModel):
+    """Schema for reserving stock of one or more products."""
+
+    reservation_key: str = Field(
+        ...,
+        example="order-1234",
+        min_length=1,
+        max_length=128,
+    )
+    items: list[StockItem] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.stock_reservation_max_items,
+    )
+
+
+class StockReservationRead(BaseModel):
+    """Schema for reading a stock reservation."""
+
+    reservation_key: str = Field(..., example="order-1234")
+    status: str = Field(..., example="reserved")
+    items: list[StockItem]
+
+
+class StockAdjustment(BaseModel):
+    """Schema for changing the stock of a product by a relative amount."""
+
+    delta: int = Field(..., example=-3)
+
+
+class StockLevel(BaseModel):
+    """Schema for the current stock of a product."""
+
+    id: int = Field(..., example=1)
+    quantity: int = Field(..., example=97)
+
+
+class ProductSort(StrEnum):
+    """Supported orderings for product listings; a leading '-' is descending."""
+
+    ID = "id"
+    CREATED_AT = "created_at"
+    CREATED_AT_DESC = "-created_at"
+    PRICE = "price"
+    PRICE_DESC = "-price"
+
+
+class ProductFilter(BaseModel):
+    """Query parameters for filtering product listings."""
+
+    min_price: float | None = Field(None, example=10.0, ge=0)
+    max_price: float | None = Field(None, example=50.0, ge=0)
+    in_stock: bool = Field(
+        False,
+        description="Only return products with a quantity above zero",
+    )
+    user_id: int | None = Field(None, example=1)
+    created_after: datetime | None = None
+    created_before: datetime | None = None
+
+    @field_validator("created_after", "created_before")
+    @classmethod
+    def to_naive_utc(cls, value: datetime | None) -> datetime | None:
+        # created_at is a UTC timestamp without time zone, and asyncpg
+        # refuses to bind aware datetimes to such columns.
+        if value is not None and value.tzinfo is not None:
+            return value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+
+class ProductPage(BaseModel):
+    """Schema for a single page of products."""
+
+    items: list[ProductRead]
+    next_cursor: str | None = Field(
+        None,
+        example="eyJzIjoiaWQiLCJrIjpbNTBdfQ",
+        description="Opaque cursor for the next page, null on the last page",
+    )
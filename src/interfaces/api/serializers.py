@@ -0,0 +1,67 @@
+from datetime import datetime
+from typing import Sequence, TypedDict
+
+from fastapi import Response
+from pydantic import TypeAdapter
+from sqlalchemy import Row
+
+from .schemas import ProductRead
+
+
+class ProductRow(TypedDict):
+    """Serialized product; field order matches `ProductRead`."""
+
+    name: str
+    description: str
+    price: float
+    quantity: int
+    id: int
+    user_id: int
+    created_at: datetime
+    updated_at: datetime
+
+
+class ProductRowsPage(TypedDict):
+    """Serialized product page; field order matches `ProductPage`."""
+
+    items: list[ProductRow]
+    next_cursor: str | None
+
+
+_page_adapter = TypeAdapter(ProductRowsPage)
+
+
+def _row_to_dict(row: Row) -> ProductRow:
+    return {
+        "name": row.name,
+        "description": row.description,
+        "price": float(row.price),
+        "quantity": row.quantity,
+        "id": row.id,
+        "user_id": row.user_id,
+        "created_at": row.created_at,
+        "updated_at": row.updated_at,
+    }
+
+
+def encode_product_page(rows: Sequence[Row], next_cursor: str | None) -> bytes:
+    """
+    Encode product column rows as a `ProductPage` JSON document.
+
+    The rows come straight from the database, so they are only serialized,
+    not validated. The output is byte-identical to FastAPI's encoding of the
+    equivalent `ProductPage`.
+    """
+    return _page_adapter.dump_json(
+        {"items": [_row_to_dict(row) for row in rows], "next_cursor": next_cursor}
+    )
+
+
+def encode_product(product: ProductRead) -> bytes:
+    return product.__pydantic_serializer__.to_json(product)
+
+
+class JSONBytesResponse(Response):
+    """Response for bodies that are already encoded JSON."""
+
+    media_type = "application/json"
@@ -1 +1 @@
-from .auth_client import AuthClient
+from .auth_client import AuthClient, CachingAuthClient
@@ -1,10 +1,133 @@
+import base64
+import binascii
+import hashlib
+import json
+import logging
+import time
+from typing import NamedTuple
+
 from shared.grpc.auth_client import AuthClient
 
 from core.config import settings
+from core.exceptions import ApplicationException
+from core.metrics import metrics
+from core.singleflight import SingleFlight
+from core.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+AUTH_REQUEST_SECONDS = metrics.histogram(
+    "auth_grpc_request_duration_seconds",
+    "Latency of token validation calls to the auth service",
+    ("outcome",),
+)
+
+
+class _Rejection(NamedTuple):
+    """Cached authentication failure, re-raised as a new exception per request."""
+
+    error_type: type[ApplicationException]
+    args: tuple
+
+    def error(self) -> ApplicationException:
+        return self.error_type(*self.args)
+
+
+def _token_expiry(token: str) -> float | None:
+    """Return the `exp` claim of a JWT without verifying it, if present."""
+    try:
+        segment = token.split(".")[1]
+        padded = segment + "=" * (-len(segment) % 4)
+        claims = json.loads(base64.urlsafe_b64decode(padded))
+        return float(claims["exp"])
+    except IndexError, KeyError, TypeError, ValueError, binascii.Error:
+        return None
+
+
+class CachingAuthClient(AuthClient):
+    """
+    AuthClient that caches token validation results by token hash.
+
+    Successful validations are cached for at most `ttl_seconds` and never
+    past the token's own expiry. Authentication failures are cached for
+    `negative_ttl_seconds` so repeated bad tokens do not reach the auth
+    service. Concurrent validations of the same token share one gRPC call.
+    """
+
+    def __init__(
+        self,
+        *,
+        host: str,
+        port: int,
+        ttl_seconds: float,
+        negative_ttl_seconds: float,
+        max_size: int,
+    ):
+        super().__init__(host=host, port=port)
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._cache: TTLCache[str, dict | _Rejection] = TTLCache(max_size)
+        self._flights: SingleFlight[str, dict] = SingleFlight()
+
+    async def validate_token(self, token: str) -> dict:
+        key = hashlib.sha256(token.encode()).hexdigest()
+
+        cached = self._cache.get(key)
+        if cached is not None:
+            self.hits += 1
+            if isinstance(cached, _Rejection):
+                raise cached.error()
+            return cached
+
+        self.misses += 1
+        return await self._flights.do(key, lambda: self._validate(key, token))
+
+    async def _validate(self, key: str, token: str) -> dict:
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            user = await super().validate_token(token)
+            outcome = "ok"
+        except ApplicationException as e:
+            outcome = "rejected"
+            self._cache.set(
+                key,
+                _Rejection(type(e), e.args),
+                self.negative_ttl_seconds,
+            )
+            raise
+        finally:
+            AUTH_REQUEST_SECONDS.observe(time.perf_counter() - start, outcome)
+
+        ttl = self.ttl_seconds
+        expiry = _token_expiry(token)
+        if expiry is not None:
+            ttl = min(ttl, expiry - time.time())
+        if ttl > 0:
+            self._cache.set(key, user, ttl)
+
+        return user
+
+    def cache_stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "size": len(self._cache),
+            "in_flight": self._flights.in_flight,
+            "coalesced": self._flights.shared,
+        }
+
 
-auth_client_instance = AuthClient(
+auth_client_instance = CachingAuthClient(
     host=settings.auth_grpc_client_host,
     port=settings.auth_grpc_client_port,
+    ttl_seconds=settings.auth_cache_ttl_seconds,
+    negative_ttl_seconds=settings.auth_cache_negative_ttl_seconds,
+    max_size=settings.auth_cache_max_size,
 )
 
-__all__ = ["AuthClient", "auth_client_instance"]
+__all__ = ["AuthClient", "CachingAuthClient", "auth_client_instance"]
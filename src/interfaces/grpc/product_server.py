@@ -0,0 +1,160 @@
+import logging
+
+import grpc
+
+from core.config import settings
+from core.exceptions import (
+    ApplicationException,
+    InvalidProductDataError,
+    ProductNotFoundError,
+)
+from db import read_session_scope
+from interfaces.api.schemas import ProductFilter, ProductSort
+from services.product_service import ProductService, product_service
+
+from .protos import products_pb2, products_pb2_grpc
+
+logger = logging.getLogger(__name__)
+
+GRPC_STATUS_MAPPING = {
+    ProductNotFoundError: grpc.StatusCode.NOT_FOUND,
+    InvalidProductDataError: grpc.StatusCode.INVALID_ARGUMENT,
+}
+
+
+def _to_message(product) -> products_pb2.Product:
+    """Build a Product message from a `ProductRead` or a product row."""
+    message = products_pb2.Product(
+        id=product.id,
+        name=product.name,
+        description=product.description,
+        price=f"{product.price:.2f}",
+        quantity=product.quantity,
+        user_id=product.user_id,
+    )
+    message.created_at.FromDatetime(product.created_at)
+    message.updated_at.FromDatetime(product.updated_at)
+    return message
+
+
+def _listing_params(
+    request: products_pb2.ListProductsRequest,
+) -> tuple[ProductSort, ProductFilter]:
+    try:
+        sort = ProductSort(request.sort or ProductSort.ID)
+        filters = ProductFilter(
+            min_price=request.min_price if request.HasField("min_price") else None,
+            max_price=request.max_price if request.HasField("max_price") else None,
+            in_stock=request.in_stock,
+            user_id=request.user_id if request.HasField("user_id") else None,
+            created_after=(
+                request.created_after.ToDatetime()
+                if request.HasField("created_after")
+                else None
+            ),
+            created_before=(
+                request.created_before.ToDatetime()
+                if request.HasField("created_before")
+                else None
+            ),
+        )
+    except ValueError as e:
+        raise InvalidProductDataError(f"Invalid listing request: {e}") from e
+    return sort, filters
+
+
+async def _abort(context: grpc.aio.ServicerContext, exc: ApplicationException):
+    status_code = GRPC_STATUS_MAPPING.get(type(exc), grpc.StatusCode.INTERNAL)
+    await context.abort(status_code, exc.message)
+
+
+class ProductServicer(products_pb2_grpc.ProductServiceServicer):
+    """gRPC read API backed by the same `ProductService` as the HTTP routes."""
+
+    def __init__(self, service: ProductService):
+        self.service = service
+
+    async def GetProduct(self, request, context):
+        try:
+            async with read_session_scope() as session:
+                product = await self.service.get_product_by_id(session, request.id)
+        except ApplicationException as e:
+            await _abort(context, e)
+        return _to_message(product)
+
+    async def GetProducts(self, request, context):
+        try:
+            if len(request.ids) > settings.products_batch_max_ids:
+                raise InvalidProductDataError(
+                    f"At most {settings.products_batch_max_ids} IDs per request"
+                )
+            async with read_session_scope() as session:
+                products, missing_ids = await self.service.get_products_by_ids(
+                    session,
+                    request.ids,
+                )
+        except ApplicationException as e:
+            await _abort(context, e)
+        return products_pb2.GetProductsResponse(
+            products=[_to_message(product) for product in products],
+            missing_ids=missing_ids,
+        )
+
+    async def ListProducts(self, request, context):
+        # Each page uses its own short-lived session, so a slow consumer
+        # never holds a pooled connection while the stream is paused.
+        batch_size = min(
+            request.batch_size or settings.products_export_batch_size,
+            settings.products_export_batch_size,
+        )
+        cursor = None
+        try:
+            sort, filters = _listing_params(request)
+            while True:
+                async with read_session_scope() as session:
+                    rows, cursor = await self.service.get_product_rows_page(
+                        session,
+                        batch_size,
+                        cursor,
+                        sort,
+                        filters,
+                    )
+                for row in rows:
+                    yield _to_message(row)
+                if cursor is None:
+                    break
+        except ApplicationException as e:
+            await _abort(context, e)
+
+
+class ProductGrpcServer:
+    """Runs the product gRPC API on the application's event loop."""
+
+    def __init__(self, host: str, port: int, grace_seconds: float):
+        self.host = host
+        self.port = port
+        self.grace_seconds = grace_seconds
+        self.server: grpc.aio.Server | None = None
+
+    async def start(self) -> None:
+        # With several workers, every process binds the same port and the
+        # kernel spreads incoming connections between them.
+        self.server = grpc.aio.server(options=[("grpc.so_reuseport", 1)])
+        products_pb2_grpc.add_ProductServiceServicer_to_server(
+            ProductServicer(product_service),
+            self.server,
+        )
+        self.server.add_insecure_port(f"{self.host}:{self.port}")
+        await self.server.start()
+
+    async def stop(self) -> None:
+        if self.server is not None:
+            await self.server.stop(self.grace_seconds)
+            self.server = None
+
+
+product_grpc_server = ProductGrpcServer(
+    host=settings.grpc_server_host,
+    port=settings.grpc_server_port,
+    grace_seconds=settings.grpc_server_grace_seconds,
+)
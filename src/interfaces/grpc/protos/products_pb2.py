@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# NO CHECKED-IN PROTOBUF GENCODE
+# source: interfaces/grpc/protos/products.proto
+# Protobuf Python Version: 6.31.1
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import runtime_version as _runtime_version
+from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+_runtime_version.ValidateProtobufRuntimeVersion(
+    _runtime_version.Domain.PUBLIC,
+    6,
+    31,
+    1,
+    '',
+    'interfaces/grpc/protos/products.proto'
+)
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+from google.protobuf import timestamp_pb2 as google_dot_protobuf_dot_timestamp__pb2
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n%interfaces/grpc/protos/products.proto\x12\x0bproducts.v1\x1a\x1fgoogle/protobuf/timestamp.proto\"\xca\x01\n\x07Product\x12\n\n\x02id\x18\x01 \x01(\x03\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x03 \x01(\t\x12\r\n\x05price\x18\x04 \x01(\t\x12\x10\n\x08quantity\x18\x05 \x01(\x03\x12\x0f\n\x07user_id\x18\x06 \x01(\x03\x12.\n\ncreated_at\x18\x07 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12.\n\nupdated_at\x18\x08 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\"\x1f\n\x11GetProductRequest\x12\n\n\x02id\x18\x01 \x01(\x03\"!\n\x12GetProductsRequest\x12\x0b\n\x03ids\x18\x01 \x03(\x03\"R\n\x13GetProductsResponse\x12&\n\x08products\x18\x01 \x03(\x0b\x32\x14.products.v1.Product\x12\x13\n\x0bmissing_ids\x18\x02 \x03(\x03\"\x9e\x02\n\x13ListProductsRequest\x12\x0c\n\x04sort\x18\x01 \x01(\t\x12\x16\n\tmin_price\x18\x02 \x01(\x01H\x00\x88\x01\x01\x12\x16\n\tmax_price\x18\x03 \x01(\x01H\x01\x88\x01\x01\x12\x10\n\x08in_stock\x18\x04 \x01(\x08\x12\x14\n\x07user_id\x18\x05 \x01(\x03H\x02\x88\x01\x01\x12\x31\n\rcreated_after\x18\x06 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x32\n\x0e\x63reated_before\x18\x07 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x12\n\nbatch_size\x18\x08 \x01(\rB\x0c\n\n_min_priceB\x0c\n\n_max_priceB\n\n\x08_user_id2\xf0\x01\n\x0eProductService\x12\x42\n\nGetProduct\x12\x1e.products.v1.GetProductRequest\x1a\x14.products.v1.Product\x12P\n\x0bGetProducts\x12\x1f.products.v1.GetProductsRequest\x1a .products.v1.GetProductsResponse\x12H\n\x0cListProducts\x12 .products.v1.ListProductsRequest\x1a\x14.products.v1.Product0\x01\x62\x06proto3')
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'interfaces.grpc.protos.products_pb2', _globals)
+if not _descriptor._USE_C_DESCRIPTORS:
+  DESCRIPTOR._loaded_options = None
+  _globals['_PRODUCT']._serialized_start=88
+  _globals['_PRODUCT']._serialized_end=290
+  _globals['_GETPRODUCTREQUEST']._serialized_start=292
+  _globals['_GETPRODUCTREQUEST']._serialized_end=323
+  _globals['_GETPRODUCTSREQUEST']._serialized_start=325
+  _globals['_GETPRODUCTSREQUEST']._serialized_end=358
+  _globals['_GETPRODUCTSRESPONSE']._serialized_start=360
+  _globals['_GETPRODUCTSRESPONSE']._serialized_end=442
+  _globals['_LISTPRODUCTSREQUEST']._serialized_start=445
+  _globals['_LISTPRODUCTSREQUEST']._serialized_end=731
+  _globals['_PRODUCTSERVICE']._serialized_start=734
+  _globals['_PRODUCTSERVICE']._serialized_end=974
+# @@protoc_insertion_point(module_scope)
@@ -0,0 +1,189 @@
+# Generated by the gRPC Python protocol compiler plugin. DO NOT EDIT!
+"""Client and server classes corresponding to protobuf-defined services."""
+import grpc
+import warnings
+
+from interfaces.grpc.protos import products_pb2 as interfaces_dot_grpc_dot_protos_dot_products__pb2
+
+GRPC_GENERATED_VERSION = '1.76.0'
+GRPC_VERSION = grpc.__version__
+_version_not_supported = False
+
+try:
+    from grpc._utilities import first_version_is_lower
+    _version_not_supported = first_version_is_lower(GRPC_VERSION, GRPC_GENERATED_VERSION)
+except ImportError:
+    _version_not_supported = True
+
+if _version_not_supported:
+    raise RuntimeError(
+        f'The grpc package installed is at version {GRPC_VERSION},'
+        + ' but the generated code in interfaces/grpc/protos/products_pb2_grpc.py depends on'
+        + f' grpcio>={GRPC_GENERATED_VERSION}.'
+        + f' Please upgrade your grpc module to grpcio>={GRPC_GENERATED_VERSION}'
+        + f' or downgrade your generated code using grpcio-tools<={GRPC_VERSION}.'
+    )
+
+
+class ProductServiceStub(object):
+    """Read access to the product catalog for internal services.
+    """
+
+    def __init__(self, channel):
+        """Constructor.
+
+        Args:
+            channel: A grpc.Channel.
+        """
+        self.GetProduct = channel.unary_unary(
+                '/products.v1.ProductService/GetProduct',
+                request_serializer=interfaces_dot_grpc_dot_protos_dot_products__pb2.GetProductRequest.SerializeToString,
+                response_deserializer=interfaces_dot_grpc_dot_protos_dot_products__pb2.Product.FromString,
+                _registered_method=True)
+        self.GetProducts = channel.unary_unary(
+                '/products.v1.ProductService/GetProducts',
+                request_serializer=interfaces_dot_grpc_dot_protos_dot_products__pb2.GetProductsRequest.SerializeToString,
+                response_deserializer=interfaces_dot_grpc_dot_protos_dot_products__pb2.GetProductsResponse.FromString,
+                _registered_method=True)
+        self.ListProducts = channel.unary_stream(
+                '/products.v1.ProductService/ListProducts',
+                request_serializer=interfaces_dot_grpc_dot_protos_dot_products__pb2.ListProductsRequest.SerializeToString,
+                response_deserializer=interfaces_dot_grpc_dot_protos_dot_products__pb2.Product.FromString,
+                _registered_method=True)
+
+
+class ProductServiceServicer(object):
+    """Read access to the product catalog for internal services.
+    """
+
+    def GetProduct(self, request, context):
+        """Get a single product; fails with NOT_FOUND if it does not exist.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetProducts(self, request, context):
+        """Get many products in request order; unknown IDs are listed separately.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ListProducts(self, request, context):
+        """Stream every product matching the filters in the requested order.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+
+def add_ProductServiceServicer_to_server(servicer, server):
+    rpc_method_handlers = {
+            'GetProduct': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetProduct,
+                    request_deserializer=interfaces_dot_grpc_dot_protos_dot_products__pb2.GetProductRequest.FromString,
+                    response_serializer=interfaces_dot_grpc_dot_protos_dot_products__pb2.Product.SerializeToString,
+            ),
+            'GetProducts': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetProducts,
+                    request_deserializer=interfaces_dot_grpc_dot_protos_dot_products__pb2.GetProductsRequest.FromString,
+                    response_serializer=interfaces_dot_grpc_dot_protos_dot_products__pb2.GetProductsResponse.SerializeToString,
+            ),
+            'ListProducts': grpc.unary_stream_rpc_method_handler(
+                    servicer.ListProducts,
+                    request_deserializer=interfaces_dot_grpc_dot_protos_dot_products__pb2.ListProductsRequest.FromString,
+                    response_serializer=interfaces_dot_grpc_dot_protos_dot_products__pb2.Product.SerializeToString,
+            ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+            'products.v1.ProductService', rpc_method_handlers)
+    server.add_generic_rpc_handlers((generic_handler,))
+    server.add_registered_method_handlers('products.v1.ProductService', rpc_method_handlers)
+
+
+ # This class is part of an EXPERIMENTAL API.
+class ProductService(object):
+    """Read access to the product catalog for internal services.
+    """
+
+    @staticmethod
+    def GetProduct(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/products.v1.ProductService/GetProduct',
+            interfaces_dot_grpc_dot_protos_dot_products__pb2.GetProductRequest.SerializeToString,
+            interfaces_dot_grpc_dot_protos_dot_products__pb2.Product.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetProducts(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/products.v1.ProductService/GetProducts',
+            interfaces_dot_grpc_dot_protos_dot_products__pb2.GetProductsRequest.SerializeToString,
+            interfaces_dot_grpc_dot_protos_dot_products__pb2.GetProductsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ListProducts(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/products.v1.ProductService/ListProducts',
+            interfaces_dot_grpc_dot_protos_dot_products__pb2.ListProductsRequest.SerializeToString,
+            interfaces_dot_grpc_dot_protos_dot_products__pb2.Product.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
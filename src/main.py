@@ -1,15 +1,29 @@
+import asyncio
 import logging
+from contextlib import suppress
 
 import uvicorn
 from fastapi import FastAPI, status
 from fastapi.concurrency import asynccontextmanager
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
+from sqlalchemy import text
 
+from core.config import settings
 from core.logging_config import setup_logging
 from core.exceptions import EXCEPTION_MAPPING, ApplicationException
+from core.metrics import metrics
+from core.readiness import readiness
 from core.utils import connect_to_rabbitmq
+from db import db_router, db_session_manager, session_scope
+from interfaces.api.middleware import MetricsMiddleware
 from interfaces.api.routes import router as products_router
 from interfaces.grpc.auth_client import auth_client_instance
+from interfaces.grpc.product_server import product_grpc_server
+from services.cache import product_cache
+from services.inventory_consumer import inventory_consumer
+from services.catalog import catalog_snapshot
+from services.outbox import outbox_relay
+from services.product_service import CACHE_EVICTION_ROUTING_KEYS, product_service
 from services.rabbitmq_client import rabbit_client
 
 # Setup logging
@@ -17,33 +31,119 @@ setup_logging()
 logger = logging.getLogger(__name__)
 
 
+async def check_database() -> None:
+    async with session_scope() as session:
+        await session.execute(text("SELECT 1"))
+
+
+async def check_rabbitmq() -> None:
+    if rabbit_client.connection is None or rabbit_client.connection.is_closed:
+        raise ConnectionError("RabbitMQ connection is closed")
+
+
+async def check_catalog() -> None:
+    if not catalog_snapshot.is_fresh():
+        raise RuntimeError("Catalog snapshot is stale")
+
+
+async def start_messaging() -> None:
+    """Connect to RabbitMQ and start everything that publishes or consumes."""
+    await connect_to_rabbitmq()
+    try:
+        await rabbit_client.consume_events(
+            CACHE_EVICTION_ROUTING_KEYS,
+            product_service.handle_product_event,
+            on_state=product_service.set_events_active,
+        )
+        logger.info("Subscribed to product events for cache eviction")
+
+        if settings.inventory_consumer_enabled:
+            await readiness.start("inventory", inventory_consumer.start)
+            logger.info("Consuming inventory events from %s", settings.inventory_queue)
+    except Exception:
+        await rabbit_client.close()
+        raise
+
+    outbox_relay.start()
+    logger.info("Outbox relay started")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan event handler for the FastAPI application."""
     # Startup
     logger.info("Starting product service...")
-    await auth_client_instance.connect()
     app.state.auth_client = auth_client_instance
-    logger.info("Auth client connected")
-
-    # Connect to RabbitMQ
-    logger.info("Connecting to RabbitMQ...")
-    try:
-        await connect_to_rabbitmq()
-    except Exception as e:
-        logger.error(f"Failed to connect to RabbitMQ: {e}")
-        raise
     app.state.rabbit_client = rabbit_client
-    logger.info("RabbitMQ client connected")
+
+    readiness.register("database", check_database)
+    readiness.register("auth")
+    readiness.register(
+        "rabbitmq",
+        check_rabbitmq,
+        critical=settings.rabbitmq_required,
+    )
+    if settings.catalog_snapshot_enabled:
+        readiness.register("catalog", check_catalog, critical=False)
+    if settings.inventory_consumer_enabled:
+        readiness.register("inventory", inventory_consumer.check, critical=False)
+
+    # Independent dependencies start concurrently. Events are staged in the
+    # outbox, so unless RabbitMQ is required the service serves requests
+    # while it connects in the background.
+    async with asyncio.TaskGroup() as startup:
+        startup.create_task(readiness.start("auth", auth_client_instance.connect))
+        startup.create_task(readiness.start("database", check_database))
+        if settings.rabbitmq_required:
+            startup.create_task(readiness.start("rabbitmq", start_messaging))
+        if settings.catalog_snapshot_enabled:
+            startup.create_task(readiness.start("catalog", catalog_snapshot.start))
+        if settings.grpc_server_enabled:
+            startup.create_task(product_grpc_server.start())
+
+    messaging_task = None
+    if not settings.rabbitmq_required:
+        messaging_task = readiness.start_in_background(
+            "rabbitmq",
+            start_messaging,
+            retry_interval=settings.rabbitmq_reconnect_interval_seconds,
+        )
+
+    if settings.catalog_snapshot_enabled:
+        logger.info("Catalog snapshot loaded with %d products", len(catalog_snapshot))
+    if settings.grpc_server_enabled:
+        logger.info(
+            "Product gRPC server listening on port %d", settings.grpc_server_port
+        )
+
+    db_router.start()
+    logger.info("Routing reads across %d replica(s)", len(db_router.replicas))
+    metrics.start()
 
     yield
 
     # Shutdown
     logger.info("Shutting down product service...")
+    if messaging_task is not None:
+        messaging_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await messaging_task
+    await inventory_consumer.stop()
+    await product_grpc_server.stop()
+    logger.info("Product gRPC server stopped")
+    await outbox_relay.stop()
+    logger.info("Outbox relay stopped")
+    await catalog_snapshot.stop()
     await auth_client_instance.close()
     logger.info("Auth client closed")
     await rabbit_client.close()
     logger.info("RabbitMQ client closed")
+    await product_cache.close()
+    logger.info("Product cache closed")
+    await db_router.stop()
+    await db_session_manager.close()
+    logger.info("Database pools closed")
+    await metrics.stop()
 
 
 app = FastAPI(
@@ -54,6 +154,8 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+app.add_middleware(MetricsMiddleware)
+
 
 # Global exception handler for application exceptions
 @app.exception_handler(ApplicationException)
@@ -69,10 +171,6 @@ async def application_exception_handler(request, exc: ApplicationException):
     )
 
 
-# Include routers with tags
-app.include_router(products_router)
-
-
 @app.get("/health", tags=["Health"])
 async def health_check():
     """Health check endpoint."""
@@ -82,5 +180,42 @@ async def health_check():
     }
 
 
+@app.get("/ready", tags=["Health"])
+async def readiness_check():
+    """Readiness probe reporting the state of each dependency."""
+    ready, dependencies = await readiness.report()
+    return JSONResponse(
+        status_code=(
+            status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE
+        ),
+        content={
+            "status": "ready" if ready else "not_ready",
+            "service": "product-service",
+            "dependencies": dependencies,
+        },
+    )
+
+
+@app.get("/health/cache", tags=["Health"])
+async def cache_stats():
+    """Product and auth token cache hit/miss counters."""
+    return {
+        "products": product_cache.stats(),
+        "auth_tokens": auth_client_instance.cache_stats(),
+        "catalog": catalog_snapshot.stats(),
+    }
+
+
+@app.get("/metrics", tags=["Health"], include_in_schema=False)
+async def prometheus_metrics():
+    """Prometheus metrics in the text exposition format."""
+    return Response(content=metrics.render(), media_type=metrics.content_type)
+
+
+# Include routers with tags. Registered after the health endpoints so that
+# `/{product_id}` does not shadow `/health`, `/ready` and `/metrics`.
+app.include_router(products_router)
+
+
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8001)
+    uvicorn.run(app, host=settings.http_host, port=settings.http_port)
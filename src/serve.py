@@ -0,0 +1,162 @@
+import logging
+import os
+import tempfile
+from pathlib import Path
+
+import uvicorn
+
+from core.config import settings
+from core.logging_config import setup_logging
+
+logger = logging.getLogger(__name__)
+
+# Settings that describe a budget for the whole instance. Every worker gets
+# an equal share, so adding workers never adds database connections.
+WORKER_SHARED_SETTINGS = (
+    "database_pool_size",
+    "database_max_overflow",
+    "database_replica_pool_size",
+    "database_replica_max_overflow",
+    "rabbitmq_publish_channels",
+    "rabbitmq_max_unconfirmed",
+    "inventory_prefetch_count",
+)
+
+# Pool size and overflow settings of each database pool a worker opens;
+# there is one replica pool per replica URL.
+DATABASE_POOLS = {
+    "primary": ("database_pool_size", "database_max_overflow"),
+    "replica": ("database_replica_pool_size", "database_replica_max_overflow"),
+}
+
+
+def worker_count() -> int:
+    return settings.web_concurrency or os.cpu_count() or 1
+
+
+def worker_settings(workers: int) -> dict[str, int]:
+    """
+    Split the instance-wide budgets between worker processes.
+
+    Args:
+        workers: Number of worker processes
+
+    Returns:
+        Per-worker value of each setting in `WORKER_SHARED_SETTINGS`,
+        rounded down; overflow may drop to zero, the rest keep at least one
+    """
+    shares = {}
+    for name in WORKER_SHARED_SETTINGS:
+        minimum = 0 if name.endswith("max_overflow") else 1
+        shares[name] = max(getattr(settings, name) // workers, minimum)
+    return shares
+
+
+def overcommitted_pools(
+    shares: dict[str, int],
+    workers: int,
+) -> list[tuple[str, int, int]]:
+    """
+    Find the database pools whose per-worker shares exceed their budget.
+
+    Shares are rounded up to one connection, so with many workers the sum
+    of the shares can be larger than the instance-wide setting.
+
+    Args:
+        shares: Per-worker settings from `worker_settings`
+        workers: Number of worker processes
+
+    Returns:
+        Name, connections needed by all workers and budget of every pool
+        that is over budget
+    """
+    overcommitted = []
+    for pool, (size, overflow) in DATABASE_POOLS.items():
+        if pool == "replica" and not settings.database_replica_urls:
+            continue
+        needed = (shares[size] + shares[overflow]) * workers
+        budget = getattr(settings, size) + getattr(settings, overflow)
+        if needed > budget:
+            overcommitted.append((pool, needed, budget))
+    return overcommitted
+
+
+def shared_metrics_dir(workers: int) -> str | None:
+    """
+    Prepare the directory where workers share their metrics.
+
+    Values left by an earlier run are removed, so counters start from zero
+    like they do with a single process.
+
+    Args:
+        workers: Number of worker processes
+
+    Returns:
+        `metrics_dir`, or a new temporary directory when it is not set and
+        there are several workers; None for a single worker without one
+    """
+    if settings.metrics_dir is None:
+        if workers == 1:
+            return None
+        return tempfile.mkdtemp(prefix="product-service-metrics-")
+
+    directory = Path(settings.metrics_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    for path in directory.glob("*.json"):
+        path.unlink()
+    return str(directory)
+
+
+def main() -> None:
+    """
+    Serve the application from pre-forked worker processes.
+
+    Workers use uvloop and httptools. On SIGTERM uvicorn stops accepting
+    connections, gives in-flight requests `shutdown_grace_seconds` to finish
+    and runs each worker's lifespan shutdown.
+    """
+    setup_logging()
+    workers = worker_count()
+    shares = worker_settings(workers)
+
+    for pool, needed, budget in overcommitted_pools(shares, workers):
+        logger.warning(
+            "%d workers need up to %d connections per %s database, more than "
+            "the budget of %d",
+            workers,
+            needed,
+            pool,
+            budget,
+        )
+    logger.info(
+        "Starting %d workers with %d+%d primary and %d+%d per replica "
+        "database connections each",
+        workers,
+        shares["database_pool_size"],
+        shares["database_max_overflow"],
+        shares["database_replica_pool_size"],
+        shares["database_replica_max_overflow"],
+    )
+
+    # Workers are spawned as fresh interpreters and read their share from
+    # the environment when they load the settings.
+    os.environ.update({name.upper(): str(value) for name, value in shares.items()})
+    metrics_dir = shared_metrics_dir(workers)
+    if metrics_dir is not None:
+        os.environ["METRICS_DIR"] = metrics_dir
+    uvicorn.run(
+        "main:app",
+        host=settings.http_host,
+        port=settings.http_port,
+        workers=workers,
+        loop="uvloop",
+        http="httptools",
+        timeout_graceful_shutdown=settings.shutdown_grace_seconds,
+        # Leave uvicorn's loggers unconfigured so access logs propagate to
+        # the root logger and its background log queue.
+        log_config=None,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+import logging
+from abc import ABC, abstractmethod
+from typing import Sequence
+
+from core.config import Settings, settings
+from core.ttl_cache import TTLCache
+from interfaces.api.schemas import ProductRead
+
+logger = logging.getLogger(__name__)
+
+
+class ProductCache(ABC):
+    """Read-through cache of serialized products keyed by product ID."""
+
+    backend: str = "none"
+    # Whether entries live in this process, so that changes made by other
+    # replicas only reach them through eviction events.
+    process_local: bool = False
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, product_id: int) -> ProductRead | None:
+        product = await self._get(product_id)
+        if product is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return product
+
+    async def get_many(self, product_ids: Sequence[int]) -> dict[int, ProductRead]:
+        """Look up several products at once, returning the ones cached by ID."""
+        found = await self._get_many(product_ids)
+        self.hits += len(found)
+        self.misses += len(product_ids) - len(found)
+        return found
+
+    @abstractmethod
+    async def _get(self, product_id: int) -> ProductRead | None: ...
+
+    async def _get_many(self, product_ids: Sequence[int]) -> dict[int, ProductRead]:
+        found = {}
+        for product_id in product_ids:
+            product = await self._get(product_id)
+            if product is not None:
+                found[product_id] = product
+        return found
+
+    @abstractmethod
+    async def set(self, product: ProductRead) -> None: ...
+
+    async def set_many(self, products: Sequence[ProductRead]) -> None:
+        for product in products:
+            await self.set(product)
+
+    @abstractmethod
+    async def invalidate(self, product_id: int) -> None: ...
+
+    async def clear(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.backend,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class NullProductCache(ProductCache):
+    """Cache that never stores anything; every lookup is a miss."""
+
+    async def _get(self, product_id: int) -> ProductRead | None:
+        return None
+
+    async def set(self, product: ProductRead) -> None:
+        pass
+
+    async def invalidate(self, product_id: int) -> None:
+        pass
+
+
+class InMemoryProductCache(ProductCache):
+    """Process-local LRU cache with a per-entry TTL."""
+
+    backend = "memory"
+    process_local = True
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        super().__init__()
+        self.ttl_seconds = ttl_seconds
+        self._entries: TTLCache[int, ProductRead] = TTLCache(max_size)
+
+    async def _get(self, product_id: int) -> ProductRead | None:
+        return self._entries.get(product_id)
+
+    async def set(self, product: ProductRead) -> None:
+        self._entries.set(product.id, product, self.ttl_seconds)
+
+    async def invalidate(self, product_id: int) -> None:
+        self._entries.pop(product_id)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            **super().stats(),
+            "size": len(self._entries),
+            "max_size": self._entries.max_size,
+            "evictions": self._entries.evictions,
+        }
+
+
+class RedisProductCache(ProductCache):
+    """
+    Shared cache backed by any Redis-compatible async client.
+
+    Backend errors are logged and treated as misses so that an unavailable
+    cache degrades to reading from the database instead of failing requests.
+    """
+
+    backend = "redis"
+
+    def __init__(self, client, ttl_seconds: float, key_prefix: str = "product:"):
+        super().__init__()
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.key_prefix = key_prefix
+        self.errors = 0
+
+    def _key(self, product_id: int) -> str:
+        return f"{self.key_prefix}{product_id}"
+
+    async def _get(self, product_id: int) -> ProductRead | None:
+        try:
+            raw = await self.client.get(self._key(product_id))
+        except Exception as e:
+            self.errors += 1
+            logger.warning("Product cache read failed for id %s: %s", product_id, e)
+            return None
+
+        if raw is None:
+            return None
+        return ProductRead.model_validate_json(raw)
+
+    async def _get_many(self, product_ids: Sequence[int]) -> dict[int, ProductRead]:
+        if not product_ids:
+            return {}
+        try:
+            values = await self.client.mget([self._key(pid) for pid in product_ids])
+        except Exception as e:
+            self.errors += 1
+            logger.warning(
+                "Product cache read failed for %d ids: %s", len(product_ids), e
+            )
+            return {}
+
+        return {
+            product_id: ProductRead.model_validate_json(raw)
+            for product_id, raw in zip(product_ids, values)
+            if raw is not None
+        }
+
+    async def set(self, product: ProductRead) -> None:
+        try:
+            await self.client.set(
+                self._key(product.id),
+                product.model_dump_json(),
+                ex=max(1, int(self.ttl_seconds)),
+            )
+        except Exception as e:
+            self.errors += 1
+            logger.warning("Product cache write failed for id %s: %s", product.id, e)
+
+    async def set_many(self, products: Sequence[ProductRead]) -> None:
+        if not products:
+            return
+        try:
+            async with self.client.pipeline(transaction=False) as pipeline:
+                for product in products:
+                    pipeline.set(
+                        self._key(product.id),
+                        product.model_dump_json(),
+                        ex=max(1, int(self.ttl_seconds)),
+                    )
+                await pipeline.execute()
+        except Exception as e:
+            self.errors += 1
+            logger.warning(
+                "Product cache write failed for %d products: %s", len(products), e
+            )
+
+    async def invalidate(self, product_id: int) -> None:
+        try:
+            await self.client.delete(self._key(product_id))
+        except Exception as e:
+            self.errors += 1
+            logger.warning(
+                "Product cache invalidation failed for id %s: %s", product_id, e
+            )
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+    def stats(self) -> dict:
+        return {**super().stats(), "errors": self.errors}
+
+
+def build_product_cache(settings: Settings) -> ProductCache:
+    """Create the product cache backend selected in settings."""
+    if settings.product_cache_backend == "memory":
+        return InMemoryProductCache(
+            max_size=settings.product_cache_max_size,
+            ttl_seconds=settings.product_cache_ttl_seconds,
+        )
+
+    if settings.product_cache_backend == "redis":
+        try:
+            from redis.asyncio import Redis
+        except ImportError as e:
+            raise RuntimeError(
+                "The redis product cache backend requires the 'redis' package"
+            ) from e
+
+        return RedisProductCache(
+            Redis.from_url(settings.redis_url),
+            ttl_seconds=settings.product_cache_ttl_seconds,
+        )
+
+    return NullProductCache()
+
+
+product_cache = build_product_cache(settings)
@@ -0,0 +1,401 @@
+import asyncio
+import bisect
+import logging
+import math
+import time
+from contextlib import suppress
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from decimal import Decimal
+from itertools import batched
+from typing import Any, Callable, Iterable, Sequence
+
+from sqlalchemy import func, select
+
+from core.config import settings
+from db import session_scope
+from db.models import Product
+from interfaces.api.schemas import ProductFilter
+
+logger = logging.getLogger(__name__)
+
+# Sort keys the snapshot keeps a sorted index for; each ends with the id.
+INDEX_KEYS = (("id",), ("created_at", "id"), ("price", "id"))
+
+# Maximum number of IDs re-read per query when applying changes.
+REFRESH_CHUNK_SIZE = 1000
+
+
+@dataclass(frozen=True, slots=True)
+class CatalogRecord:
+    """Immutable in-memory copy of a product row."""
+
+    id: int
+    name: str
+    description: str
+    price: Decimal
+    quantity: int
+    user_id: int
+    created_at: datetime
+    updated_at: datetime
+
+
+_COLUMNS = (
+    Product.id,
+    Product.name,
+    Product.description,
+    Product.price,
+    Product.quantity,
+    Product.user_id,
+    Product.created_at,
+    Product.updated_at,
+)
+
+
+def _decimal(value: float) -> Decimal:
+    # Compare filter bounds as the decimal the client wrote, like the database
+    return Decimal(str(value))
+
+
+def _align(value: datetime, reference: datetime) -> datetime:
+    """Make `value` comparable with `reference`, treating naive times as UTC."""
+    if (value.tzinfo is None) == (reference.tzinfo is None):
+        return value
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+class CatalogSnapshot:
+    """
+    In-process copy of the whole product catalog for database-free reads.
+
+    Records are immutable; sorted key indexes back every listing order and a
+    per-user index backs owner filters. Changes announced by product events
+    or made by this process are re-read from the primary by ID shortly after
+    they happen.
+
+    Events can be missed, so the snapshot compares its row count and latest
+    `updated_at` with the database every `check_interval` seconds. Two
+    mismatches in a row, or `resync_interval` seconds since the last load,
+    trigger a full reload. Reads must check `is_fresh()`: it turns false
+    when the snapshot was last confirmed more than `max_staleness` seconds
+    ago, and callers then fall back to the database.
+    """
+
+    def __init__(
+        self,
+        check_interval: float,
+        max_staleness: float,
+        resync_interval: float,
+    ):
+        self.check_interval = check_interval
+        self.max_staleness = max_staleness
+        self.resync_interval = resync_interval
+        self.reloads = 0
+        self.refreshed = 0
+        self._records: dict[int, CatalogRecord] = {}
+        self._indexes: dict[tuple[str, ...], list[tuple]] = {}
+        self._by_user: dict[int, set[int]] = {}
+        self._dirty: set[int] = set()
+        # IDs marked dirty while a refresh is running; their re-read may
+        # predate the change, so the refresh leaves them dirty.
+        self._marked_during_refresh: set[int] | None = None
+        self._mismatches = 0
+        self._reload_requested = False
+        self._loaded_at: float | None = None
+        self._confirmed_at: float | None = None
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    async def start(self) -> None:
+        await self.reload()
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="catalog-snapshot")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    def is_fresh(self) -> bool:
+        return (
+            self._confirmed_at is not None
+            and time.monotonic() - self._confirmed_at <= self.max_staleness
+        )
+
+    def mark_dirty(self, product_ids: Iterable[int]) -> None:
+        """Schedule products that changed to be re-read from the database."""
+        if self._loaded_at is None:
+            return
+        product_ids = set(product_ids)
+        self._dirty.update(product_ids)
+        if self._marked_during_refresh is not None:
+            self._marked_during_refresh.update(product_ids)
+        self._wakeup.set()
+
+    def request_reload(self) -> None:
+        """Schedule a full reload, for when change events may have been missed."""
+        self._reload_requested = True
+        self._wakeup.set()
+
+    def has_pending_changes(self) -> bool:
+        """Whether changed products are still waiting to be re-read."""
+        return bool(self._dirty)
+
+    def get(self, product_id: int) -> CatalogRecord | None:
+        if product_id in self._dirty:
+            return None
+        return self._records.get(product_id)
+
+    def page(
+        self,
+        count: int,
+        keys: tuple[str, ...],
+        descending: bool,
+        filters: ProductFilter | None = None,
+        after: Sequence[Any] | None = None,
+    ) -> list[CatalogRecord]:
+        """
+        Return up to `count` records in the given order, mirroring the
+        database listing query. Products with pending changes are listed
+        as last loaded; check `has_pending_changes()` first.
+
+        Args:
+            count: Maximum number of records to return
+            keys: Sort key attribute names, one of `INDEX_KEYS`
+            descending: Whether the order is descending
+            filters: Optional listing filters
+            after: Sort key of the last record of the previous page, if any
+
+        Returns:
+            Matching records following `after`
+        """
+        filters = filters or ProductFilter()
+        if filters.user_id is not None:
+            entries = sorted(
+                self._key(self._records[product_id], keys)
+                for product_id in self._by_user.get(filters.user_id, ())
+            )
+        else:
+            entries = self._indexes.get(keys, [])
+
+        lo, hi = self._range(entries, keys[0], filters)
+        if after is not None:
+            if descending:
+                hi = min(hi, bisect.bisect_left(entries, tuple(after)))
+            else:
+                lo = max(lo, bisect.bisect_right(entries, tuple(after)))
+
+        matches = self._predicate(filters)
+        page = []
+        positions = range(hi - 1, lo - 1, -1) if descending else range(lo, hi)
+        for position in positions:
+            entry = entries[position]
+            record = self._records[entry[-1]]
+            if matches(record):
+                page.append(record)
+                if len(page) == count:
+                    break
+        return page
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._records),
+            "fresh": self.is_fresh(),
+            "age_seconds": (
+                time.monotonic() - self._confirmed_at
+                if self._confirmed_at is not None
+                else None
+            ),
+            "pending": len(self._dirty),
+            "reloads": self.reloads,
+            "refreshed": self.refreshed,
+        }
+
+    async def reload(self) -> None:
+        """Replace the snapshot with a full copy of the products table."""
+        started = time.monotonic()
+        self._reload_requested = False
+        async with session_scope() as session:
+            result = await session.execute(select(*_COLUMNS))
+            records = [CatalogRecord(*row) for row in result]
+
+        self._records = {}
+        self._indexes = {keys: [] for keys in INDEX_KEYS}
+        self._by_user = {}
+        for record in records:
+            self._records[record.id] = record
+            self._by_user.setdefault(record.user_id, set()).add(record.id)
+        for keys, entries in self._indexes.items():
+            entries.extend(self._key(record, keys) for record in records)
+            entries.sort()
+
+        self._loaded_at = self._confirmed_at = started
+        self._mismatches = 0
+        self.reloads += 1
+        logger.info(
+            "Loaded catalog snapshot of %d products in %.2fs",
+            len(records),
+            time.monotonic() - started,
+        )
+
+    async def refresh(self) -> None:
+        """
+        Re-read the products marked dirty and apply them to the snapshot.
+
+        Products stay dirty, and are served from the database, until their
+        new rows have been applied.
+        """
+        product_ids = list(self._dirty)
+        self._marked_during_refresh = set()
+        try:
+            async with session_scope() as session:
+                for chunk in batched(product_ids, REFRESH_CHUNK_SIZE):
+                    result = await session.execute(
+                        select(*_COLUMNS).where(Product.id.in_(chunk))
+                    )
+                    found = {row.id: CatalogRecord(*row) for row in result}
+                    for product_id in chunk:
+                        self._remove(product_id)
+                        if product_id in found:
+                            self._insert(found[product_id])
+                    self._dirty.difference_update(
+                        set(chunk) - self._marked_during_refresh
+                    )
+                    self.refreshed += len(chunk)
+        finally:
+            self._marked_during_refresh = None
+
+    async def check(self) -> None:
+        """Confirm the snapshot against the database, reloading on drift."""
+        async with session_scope() as session:
+            total, latest = (
+                await session.execute(
+                    select(func.count(), func.max(Product.updated_at))
+                )
+            ).one()
+
+        if self._dirty:
+            return
+        own_latest = max(
+            (record.updated_at for record in self._records.values()),
+            default=None,
+        )
+        if total == len(self._records) and latest == own_latest:
+            self._confirmed_at = time.monotonic()
+            self._mismatches = 0
+            return
+
+        self._mismatches += 1
+        if self._mismatches >= 2:
+            logger.warning("Catalog snapshot drifted from the database, reloading")
+            await self.reload()
+
+    async def _run(self) -> None:
+        while True:
+            with suppress(TimeoutError):
+                await asyncio.wait_for(
+                    self._wakeup.wait(),
+                    timeout=self.check_interval,
+                )
+            self._wakeup.clear()
+
+            try:
+                if self._dirty:
+                    await self.refresh()
+                if (
+                    self._reload_requested
+                    or time.monotonic() - self._loaded_at >= self.resync_interval
+                ):
+                    await self.reload()
+                elif time.monotonic() - self._confirmed_at >= self.check_interval:
+                    await self.check()
+            except Exception as e:
+                logger.error("Catalog snapshot sync failed: %s", e)
+
+    @staticmethod
+    def _key(record: CatalogRecord, keys: tuple[str, ...]) -> tuple:
+        return tuple(getattr(record, key) for key in keys)
+
+    def _insert(self, record: CatalogRecord) -> None:
+        self._records[record.id] = record
+        self._by_user.setdefault(record.user_id, set()).add(record.id)
+        for keys, entries in self._indexes.items():
+            bisect.insort(entries, self._key(record, keys))
+
+    def _remove(self, product_id: int) -> None:
+        record = self._records.pop(product_id, None)
+        if record is None:
+            return
+        owned = self._by_user.get(record.user_id)
+        if owned is not None:
+            owned.discard(product_id)
+            if not owned:
+                del self._by_user[record.user_id]
+        for keys, entries in self._indexes.items():
+            key = self._key(record, keys)
+            entries.pop(bisect.bisect_left(entries, key))
+
+    @staticmethod
+    def _range(
+        entries: list[tuple],
+        first_key: str,
+        filters: ProductFilter,
+    ) -> tuple[int, int]:
+        """Positions `[lo, hi)` of `entries` whose first key passes the filters."""
+        lo, hi = 0, len(entries)
+        if not entries:
+            return lo, hi
+
+        if first_key == "price":
+            if filters.min_price is not None:
+                lo = bisect.bisect_left(entries, (_decimal(filters.min_price),))
+            if filters.max_price is not None:
+                bound = (_decimal(filters.max_price), math.inf)
+                hi = bisect.bisect_right(entries, bound)
+        elif first_key == "created_at":
+            reference = entries[0][0]
+            if filters.created_after is not None:
+                bound = (_align(filters.created_after, reference),)
+                lo = bisect.bisect_left(entries, bound)
+            if filters.created_before is not None:
+                bound = (_align(filters.created_before, reference),)
+                hi = bisect.bisect_left(entries, bound)
+        return lo, hi
+
+    @staticmethod
+    def _predicate(filters: ProductFilter) -> Callable[[CatalogRecord], bool]:
+        checks = []
+        if filters.min_price is not None:
+            checks.append(lambda r, v=_decimal(filters.min_price): r.price >= v)
+        if filters.max_price is not None:
+            checks.append(lambda r, v=_decimal(filters.max_price): r.price <= v)
+        if filters.in_stock:
+            checks.append(lambda r: r.quantity > 0)
+        if filters.created_after is not None:
+            checks.append(
+                lambda r, v=filters.created_after: r.created_at
+                >= _align(v, r.created_at)
+            )
+        if filters.created_before is not None:
+            checks.append(
+                lambda r, v=filters.created_before: r.created_at
+                < _align(v, r.created_at)
+            )
+        if not checks:
+            return lambda record: True
+        return lambda record: all(check(record) for check in checks)
+
+
+catalog_snapshot = CatalogSnapshot(
+    check_interval=settings.catalog_check_interval_seconds,
+    max_staleness=settings.catalog_max_staleness_seconds,
+    resync_interval=settings.catalog_resync_interval_seconds,
+)
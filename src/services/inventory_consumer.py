@@ -0,0 +1,288 @@
+import asyncio
+import json
+import logging
+import time
+from contextlib import suppress
+from datetime import datetime, timedelta
+
+import aio_pika
+from aio_pika.abc import AbstractIncomingMessage
+from sqlalchemy import delete
+from sqlalchemy import exc as sa_exc
+
+from core.config import settings
+from db import session_scope
+from db.models import ProcessedMessage
+from services.product_service import ProductService, product_service
+from services.rabbitmq_client import RabbitClient, rabbit_client
+
+logger = logging.getLogger(__name__)
+
+# Routing keys consumed and the sign applied to the item quantities they carry.
+INVENTORY_ROUTING_KEYS = {
+    "order.placed": -1,
+    "order.cancelled": 1,
+    "inventory.adjusted": 1,
+}
+
+# How often processed message IDs older than the retention are deleted.
+PRUNE_INTERVAL_SECONDS = 3600
+
+# Failures caused by the database being unavailable rather than by a message.
+TRANSIENT_ERRORS = (
+    sa_exc.OperationalError,
+    sa_exc.InterfaceError,
+    sa_exc.TimeoutError,
+    ConnectionError,
+    TimeoutError,
+)
+
+
+def _is_transient(error: Exception) -> bool:
+    if isinstance(error, sa_exc.DBAPIError) and error.connection_invalidated:
+        return True
+    return isinstance(error, TRANSIENT_ERRORS)
+
+
+def parse_inventory_event(routing_key: str, body: bytes) -> dict[int, int]:
+    """
+    Read the stock deltas carried by an order or inventory event.
+
+    Events carry `{"items": [{"product_id": 1, "quantity": 2}, ...]}`. Orders
+    remove their quantities from stock and cancellations return them;
+    inventory adjustments carry signed quantities.
+
+    Args:
+        routing_key: Routing key the event was published with
+        body: Raw message body
+
+    Returns:
+        Quantity delta per product ID
+
+    Raises:
+        ValueError: If the routing key or body is not a valid inventory event
+    """
+    sign = INVENTORY_ROUTING_KEYS.get(routing_key)
+    if sign is None:
+        raise ValueError(f"unexpected routing key {routing_key}")
+
+    try:
+        items = json.loads(body)["items"]
+        deltas: dict[int, int] = {}
+        for item in items:
+            product_id = int(item["product_id"])
+            deltas[product_id] = deltas.get(product_id, 0) + sign * int(
+                item["quantity"]
+            )
+    except (TypeError, KeyError, ValueError) as e:
+        raise ValueError(f"malformed inventory event: {e}") from e
+    return deltas
+
+
+class InventoryConsumer:
+    """
+    Applies stock changes from order and inventory events in batches.
+
+    All replicas consume from one durable queue. The broker delivers up to
+    `prefetch_count` unacknowledged messages, which are buffered until
+    `batch_size` have arrived or the oldest has waited `batch_window`
+    seconds. Each batch is applied in a single transaction and acknowledged
+    only after it commits. Messages are deduplicated on their `message_id`,
+    so redeliveries after a crash between commit and ack change nothing.
+
+    When the database is unavailable, the batch is requeued after
+    `retry_delay` seconds. When a batch fails for any other reason, its
+    messages are applied one at a time and those that still fail are
+    rejected, so a single bad message cannot block the queue. Rejected
+    messages, including those without an ID or with an unreadable body, are
+    not requeued; a dead-letter policy on the queue keeps them.
+    """
+
+    def __init__(
+        self,
+        client: RabbitClient,
+        service: ProductService,
+        exchange_name: str,
+        queue_name: str,
+        prefetch_count: int,
+        batch_size: int,
+        batch_window: float,
+        dedupe_retention: timedelta,
+        retry_delay: float,
+    ):
+        self.client = client
+        self.service = service
+        self.exchange_name = exchange_name
+        self.queue_name = queue_name
+        self.prefetch_count = prefetch_count
+        # A batch larger than the prefetch window could never fill up
+        self.batch_size = min(batch_size, prefetch_count)
+        self.batch_window = batch_window
+        self.dedupe_retention = dedupe_retention
+        self.retry_delay = retry_delay
+        self.applied = 0
+        self.rejected = 0
+        self._channel = None
+        self._queue = None
+        self._consumer_tag: str | None = None
+        self._buffer: list[AbstractIncomingMessage] = []
+        self._arrived = asyncio.Event()
+        self._full = asyncio.Event()
+        self._pruned_at = 0.0
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        self._channel = await self.client.connection.channel()
+        await self._channel.set_qos(prefetch_count=self.prefetch_count)
+        exchange = await self._channel.declare_exchange(
+            self.exchange_name,
+            aio_pika.ExchangeType.TOPIC,
+            durable=True,
+        )
+        self._queue = await self._channel.declare_queue(self.queue_name, durable=True)
+        for routing_key in INVENTORY_ROUTING_KEYS:
+            await self._queue.bind(exchange, routing_key)
+
+        self._task = asyncio.create_task(self._run(), name="inventory-consumer")
+        self._consumer_tag = await self._queue.consume(self._on_message)
+
+    async def check(self) -> None:
+        """Readiness check: the batching task and its channel are alive."""
+        if self._task is None or self._task.done():
+            raise RuntimeError("Inventory consumer is not running")
+        if self._channel.is_closed:
+            raise ConnectionError("Inventory consumer channel is closed")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        if self._consumer_tag is not None:
+            await self._queue.cancel(self._consumer_tag)
+            self._consumer_tag = None
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+        # Messages still buffered are redelivered once the channel closes
+        await self._channel.close()
+
+    async def _on_message(self, message: AbstractIncomingMessage) -> None:
+        self._buffer.append(message)
+        self._arrived.set()
+        if len(self._buffer) >= self.batch_size:
+            self._full.set()
+
+    async def _run(self) -> None:
+        while True:
+            await self._arrived.wait()
+            with suppress(TimeoutError):
+                await asyncio.wait_for(self._full.wait(), timeout=self.batch_window)
+            self._arrived.clear()
+            self._full.clear()
+            batch, self._buffer = self._buffer, []
+            # Unacknowledged messages of a failed iteration are redelivered
+            # by the broker once their channel is reopened.
+            try:
+                if batch:
+                    await self._apply_batch(batch)
+                if time.monotonic() - self._pruned_at >= PRUNE_INTERVAL_SECONDS:
+                    await self._prune()
+            except Exception as e:
+                logger.error("Inventory consumer iteration failed: %s", e)
+
+    async def _apply_batch(self, batch: list[AbstractIncomingMessage]) -> None:
+        changes: dict[str, dict[int, int]] = {}
+        accepted: list[AbstractIncomingMessage] = []
+        for message in batch:
+            try:
+                if not message.message_id:
+                    raise ValueError("message has no message_id")
+                deltas = parse_inventory_event(message.routing_key, message.body)
+            except ValueError as e:
+                logger.warning("Rejecting inventory message: %s", e)
+                self.rejected += 1
+                await message.reject(requeue=False)
+                continue
+            changes.setdefault(message.message_id, deltas)
+            accepted.append(message)
+
+        if not accepted:
+            return
+
+        try:
+            await self._apply(changes)
+        except Exception as e:
+            logger.error("Failed to apply %d inventory messages: %s", len(accepted), e)
+            if _is_transient(e):
+                await self._requeue_later(accepted)
+            else:
+                await self._apply_one_by_one(accepted, changes)
+            return
+
+        # Deliveries are acked in order, so one multiple-ack of the last
+        # delivery tag covers the whole batch.
+        await accepted[-1].ack(multiple=True)
+        self.applied += len(accepted)
+
+    async def _apply_one_by_one(
+        self,
+        messages: list[AbstractIncomingMessage],
+        changes: dict[str, dict[int, int]],
+    ) -> None:
+        for position, message in enumerate(messages):
+            try:
+                await self._apply({message.message_id: changes[message.message_id]})
+            except Exception as e:
+                if _is_transient(e):
+                    await self._requeue_later(messages[position:])
+                    return
+                logger.error(
+                    "Rejecting inventory message %s that cannot be applied: %s",
+                    message.message_id,
+                    e,
+                )
+                self.rejected += 1
+                await message.reject(requeue=False)
+                continue
+            await message.ack()
+            self.applied += 1
+
+    async def _requeue_later(self, messages: list[AbstractIncomingMessage]) -> None:
+        # Waiting before the requeue keeps an unavailable database from
+        # turning into a redelivery loop; new deliveries stay buffered.
+        await asyncio.sleep(self.retry_delay)
+        for message in messages:
+            await message.nack(requeue=True)
+
+    async def _apply(self, changes: dict[str, dict[int, int]]) -> None:
+        async with session_scope() as session:
+            await self.service.apply_stock_deltas(session, changes)
+
+    async def _prune(self) -> None:
+        self._pruned_at = time.monotonic()
+        cutoff = datetime.now() - self.dedupe_retention
+        try:
+            async with session_scope() as session:
+                result = await session.execute(
+                    delete(ProcessedMessage).where(
+                        ProcessedMessage.processed_at < cutoff
+                    )
+                )
+                await session.commit()
+        except Exception as e:
+            logger.error("Failed to prune processed message IDs: %s", e)
+            return
+        logger.debug("Pruned %d processed message IDs", result.rowcount)
+
+
+inventory_consumer = InventoryConsumer(
+    rabbit_client,
+    product_service,
+    exchange_name=settings.inventory_exchange,
+    queue_name=settings.inventory_queue,
+    prefetch_count=settings.inventory_prefetch_count,
+    batch_size=settings.inventory_batch_size,
+    batch_window=settings.inventory_batch_window_seconds,
+    dedupe_retention=timedelta(hours=settings.inventory_dedupe_retention_hours),
+    retry_delay=settings.inventory_retry_delay_seconds,
+)
@@ -0,0 +1,191 @@
+import asyncio
+import logging
+from contextlib import suppress
+
+from sqlalchemy import case, delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from db import session_scope
+from db.models import OutboxEvent
+from services.rabbitmq_client import rabbit_client
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_event(session: AsyncSession, routing_key: str, payload: dict) -> None:
+    """Stage an event to be published once the session's transaction commits."""
+    session.add(OutboxEvent(routing_key=routing_key, payload=payload))
+
+
+def enqueue_events(
+    session: AsyncSession,
+    routing_key: str,
+    payloads: list[dict],
+) -> None:
+    """Stage several events with the same routing key."""
+    session.add_all(
+        OutboxEvent(routing_key=routing_key, payload=payload) for payload in payloads
+    )
+
+
+class OutboxRelay:
+    """
+    Background task that publishes staged outbox events to RabbitMQ.
+
+    Events are claimed in batches with `FOR UPDATE SKIP LOCKED`, so several
+    replicas can drain the same table, and are deleted only after the broker
+    confirms them. Delivery is therefore at-least-once; each message carries
+    its outbox ID as `message_id` so consumers can deduplicate.
+
+    An event that fails `max_attempts` publishes while the broker is
+    reachable is parked: it stays in the table with `parked_at` set and is
+    no longer selected, so it cannot hold back the events behind it.
+    Clearing `parked_at` and `attempts` queues it again.
+    """
+
+    def __init__(
+        self,
+        batch_size: int,
+        poll_interval: float,
+        max_backoff: float,
+        max_attempts: int,
+    ):
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_backoff = max_backoff
+        self.max_attempts = max_attempts
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="outbox-relay")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    def notify(self) -> None:
+        """Wake the relay after a transaction staged new events."""
+        self._wakeup.set()
+
+    async def _run(self) -> None:
+        delay = self.poll_interval
+        while True:
+            self._wakeup.clear()
+            try:
+                published = await self.relay_batch()
+                delay = self.poll_interval
+            except Exception as e:
+                logger.error("Outbox relay failed, retrying in %ss: %s", delay, e)
+                published = 0
+                delay = min(delay * 2, self.max_backoff)
+
+            if published >= self.batch_size:
+                continue
+
+            with suppress(TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+
+    async def relay_batch(self) -> int:
+        """
+        Publish one batch of pending events.
+
+        Returns:
+            Number of events confirmed by the broker
+
+        Raises:
+            RuntimeError: If some events of the batch could not be published
+        """
+        async with session_scope() as session:
+            events = (
+                await session.scalars(
+                    select(OutboxEvent)
+                    .where(OutboxEvent.parked_at.is_(None))
+                    .order_by(OutboxEvent.id)
+                    .limit(self.batch_size)
+                    .with_for_update(skip_locked=True)
+                )
+            ).all()
+            if not events:
+                return 0
+
+            results = await asyncio.gather(
+                *(
+                    rabbit_client.publish_event(
+                        event.routing_key,
+                        event.payload,
+                        message_id=str(event.id),
+                    )
+                    for event in events
+                ),
+                return_exceptions=True,
+            )
+            published_ids = [
+                event.id
+                for event, result in zip(events, results)
+                if not isinstance(result, BaseException)
+            ]
+            failed = [
+                event
+                for event, result in zip(events, results)
+                if isinstance(result, BaseException)
+            ]
+            failed_ids = [event.id for event in failed]
+
+            if published_ids:
+                await session.execute(
+                    delete(OutboxEvent).where(OutboxEvent.id.in_(published_ids))
+                )
+            # Failures while the broker is unreachable say nothing about the
+            # events themselves, so they do not count as attempts.
+            parked_ids = []
+            if failed_ids and rabbit_client.connected:
+                attempts = OutboxEvent.attempts + 1
+                await session.execute(
+                    update(OutboxEvent)
+                    .where(OutboxEvent.id.in_(failed_ids))
+                    .values(
+                        attempts=attempts,
+                        parked_at=case(
+                            (attempts >= self.max_attempts, func.now()),
+                            else_=None,
+                        ),
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                parked_ids = [
+                    event.id
+                    for event in failed
+                    if event.attempts + 1 >= self.max_attempts
+                ]
+            await session.commit()
+
+        if parked_ids:
+            logger.error(
+                "Parked outbox events %s after %d failed publishes",
+                parked_ids,
+                self.max_attempts,
+            )
+
+        if failed_ids:
+            first_error = next(r for r in results if isinstance(r, BaseException))
+            raise RuntimeError(
+                f"{len(failed_ids)} outbox events were not published: {first_error}"
+            )
+
+        logger.debug("Relayed %d outbox events", len(published_ids))
+        return len(published_ids)
+
+
+outbox_relay = OutboxRelay(
+    batch_size=settings.outbox_batch_size,
+    poll_interval=settings.outbox_poll_interval_seconds,
+    max_backoff=settings.outbox_max_backoff_seconds,
+    max_attempts=settings.outbox_max_attempts,
+)
@@ -0,0 +1,107 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Sequence
+
+from sqlalchemy import ColumnElement, and_, or_, tuple_
+
+from core.exceptions import InvalidProductDataError
+
+
+def _dump_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _load_value(column: ColumnElement, value: Any) -> Any:
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is Decimal:
+        return Decimal(value)
+    return python_type(value)
+
+
+def encode_cursor(sort: str, values: Sequence[Any]) -> str:
+    """
+    Encode the sort key of the last row of a page into an opaque cursor.
+
+    Args:
+        sort: Name of the ordering the cursor belongs to
+        values: Sort key values of the last row on the page
+
+    Returns:
+        URL-safe cursor string
+    """
+    payload = {"s": sort, "k": [_dump_value(value) for value in values]}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(
+    cursor: str,
+    sort: str,
+    columns: Sequence[ColumnElement],
+) -> list[Any]:
+    """
+    Decode a cursor produced by `encode_cursor`.
+
+    Args:
+        cursor: Cursor string received from the client
+        sort: Ordering requested together with the cursor
+        columns: Sort key columns, used to restore value types
+
+    Returns:
+        Sort key values of the last row of the previous page
+
+    Raises:
+        InvalidProductDataError: If the cursor is malformed or was issued
+            for a different ordering
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if payload["s"] != sort or len(payload["k"]) != len(columns):
+            raise ValueError("cursor does not match the requested ordering")
+        return [
+            _load_value(column, value) for column, value in zip(columns, payload["k"])
+        ]
+    except (binascii.Error, ValueError, TypeError, KeyError, ArithmeticError) as e:
+        raise InvalidProductDataError("Invalid pagination cursor") from e
+
+
+def keyset_predicate(
+    columns: Sequence[ColumnElement],
+    values: Sequence[Any],
+    descending: Sequence[bool] | None = None,
+) -> ColumnElement[bool]:
+    """
+    Build a `WHERE` clause selecting rows strictly after the given sort key.
+
+    When every column sorts the same way this is the row comparison
+    `(a, b) > (x, y)` (`<` when descending), which the planner turns into a
+    range scan of a composite index on the sort columns. Mixed directions,
+    as in the relevance ordering of search results, have no row comparison
+    equivalent and are expanded into `a < x OR (a = x AND b > y)`.
+    """
+    if descending is None:
+        descending = [False] * len(columns)
+
+    if len(set(descending)) == 1:
+        if len(columns) == 1:
+            column, value = columns[0], values[0]
+        else:
+            column, value = tuple_(*columns), tuple(values)
+        return column < value if descending[0] else column > value
+
+    clauses = []
+    for i, (column, value) in enumerate(zip(columns, values)):
+        equal_prefix = [c == v for c, v in zip(columns[:i], values[:i])]
+        after = column < value if descending[i] else column > value
+        clauses.append(and_(*equal_prefix, after))
+    return or_(*clauses)
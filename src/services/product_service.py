@@ -1,59 +1,543 @@
 import logging
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from collections import Counter
+from decimal import Decimal
+from itertools import batched
+from typing import AsyncIterator, Iterable, Mapping, Sequence
 
-from db.models import Product
-from interfaces.api.schemas import ProductCreate, ProductUpdate
-from core.exceptions import ProductNotFoundError
-from services.rabbitmq_client import rabbit_client
+from sqlalchemy import (
+    Insert,
+    Row,
+    Select,
+    case,
+    delete,
+    insert,
+    literal_column,
+    select,
+    update,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm.exc import StaleDataError
+
+from db import reads_own_writes, reads_replica
+from db.models import ProcessedMessage, Product, StockReservation
+from interfaces.api.schemas import (
+    ProductCreate,
+    ProductUpdate,
+    ProductBulkUpdateItem,
+    ProductFilter,
+    ProductRead,
+    ProductSort,
+    StockItem,
+    StockLevel,
+    StockReservationRead,
+)
+from core.config import settings
+from core.exceptions import (
+    InsufficientStockError,
+    ProductNotFoundError,
+    ReservationConflictError,
+    ReservationNotFoundError,
+)
+from core.batch_loader import BatchLoader
+from core.metrics import metrics
+from core.singleflight import SingleFlight
+from services.cache import ProductCache, product_cache
+from services.catalog import CatalogRecord, CatalogSnapshot, catalog_snapshot
+from services.pagination import decode_cursor, encode_cursor, keyset_predicate
+from services.search import fallback_search, postgres_search, search_terms
+from services.outbox import enqueue_event, enqueue_events, outbox_relay
 
 logger = logging.getLogger(__name__)
 
+PRODUCT_LOOKUPS = metrics.counter(
+    "product_lookups_total",
+    "Single product lookups by where they were answered from",
+    ("source",),
+)
+PRODUCT_LOOKUP_BATCH_SIZE = metrics.histogram(
+    "product_lookup_batch_size",
+    "Products resolved per batched lookup query",
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500),
+)
+
+# Sort key columns and direction per ordering; the trailing id makes every
+# key unique. Descending orderings reverse the id too, so each one is a plain
+# backward scan of the matching composite index.
+SORT_COLUMNS = {
+    ProductSort.ID: (Product.id,),
+    ProductSort.CREATED_AT: (Product.created_at, Product.id),
+    ProductSort.CREATED_AT_DESC: (Product.created_at, Product.id),
+    ProductSort.PRICE: (Product.price, Product.id),
+    ProductSort.PRICE_DESC: (Product.price, Product.id),
+}
+DESCENDING_SORTS = {ProductSort.CREATED_AT_DESC, ProductSort.PRICE_DESC}
+
+# Plain columns selected by the row-based read paths, in ProductRead order.
+PRODUCT_ROW_COLUMNS = (
+    Product.name,
+    Product.description,
+    Product.price,
+    Product.quantity,
+    Product.id,
+    Product.user_id,
+    Product.created_at,
+    Product.updated_at,
+)
+
+# Events after which other replicas must drop their cached copy of a product.
+CACHE_EVICTION_ROUTING_KEYS = (
+    "product.created",
+    "product.updated",
+    "product.price_changed",
+    "product.deleted",
+    "product.stock_changed",
+)
+
+RESERVATION_RESERVED = "reserved"
+RESERVATION_RELEASED = "released"
+
+
+def _insert_ignoring_conflicts(session: AsyncSession, model) -> Insert:
+    """`INSERT ... ON CONFLICT DO NOTHING` for the session's dialect."""
+    dialect = session.get_bind().dialect.name
+    dialect_insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+    return dialect_insert(model).on_conflict_do_nothing()
+
+
+def _page_with_cursor[T](
+    items: list[T],
+    limit: int,
+    sort: ProductSort,
+) -> tuple[list[T], str | None]:
+    """Trim a `limit + 1` listing result and encode the next page cursor."""
+    if len(items) <= limit:
+        return items, None
+    items = items[:limit]
+    last = items[-1]
+    return items, encode_cursor(
+        sort, [getattr(last, column.key) for column in SORT_COLUMNS[sort]]
+    )
+
+
+def _reservation_read(
+    key: str,
+    status: str,
+    items: list[dict],
+) -> StockReservationRead:
+    return StockReservationRead(
+        reservation_key=key,
+        status=status,
+        items=[StockItem.model_validate(item) for item in items],
+    )
+
+
+# The event builders accept ORM entities as well as rows returned by
+# `UPDATE ... RETURNING`; they only read attributes.
+def _created_event(product: Product) -> dict:
+    return {
+        "id": product.id,
+        "name": product.name,
+        "description": product.description,
+        "price": str(product.price),
+        "user_id": product.user_id,
+    }
+
+
+def _updated_event(product: Product | Row) -> dict:
+    return {
+        "id": product.id,
+        "name": product.name,
+        "description": product.description,
+        "price": str(product.price),
+        "quantity": product.quantity,
+        "user_id": product.user_id,
+    }
+
+
+def _price_changed_event(product: Product | Row, previous_price: Decimal) -> dict:
+    return {
+        "id": product.id,
+        "user_id": product.user_id,
+        "previous_price": str(previous_price),
+        "new_price": str(product.price),
+    }
+
 
 class ProductService:
     """Service for product management operations."""
 
+    def __init__(self, cache: ProductCache, catalog: CatalogSnapshot | None = None):
+        self.cache = cache
+        self.catalog = catalog
+        # Process-local copies only learn about changes made by other
+        # replicas from product events, so they are used only while those
+        # events are being received.
+        self._events_active = False
+        self._lookups: SingleFlight[tuple, ProductRead] = SingleFlight()
+        self._loaders: dict[AsyncEngine, BatchLoader[int, ProductRead]] = {}
+
     async def get_product_by_id(
         self,
         session: AsyncSession,
         product_id: int,
-    ) -> Product:
+    ) -> ProductRead:
         """
-        Get a product by its ID.
+        Get a product by its ID, serving it from the cache when possible.
+
+        Concurrent cache misses for the same product against the same
+        database share one lookup, and lookups of different products made
+        in the same event loop iteration share one `IN` query. The query
+        runs in a session of its own, so a cancelled caller cannot close it
+        under the others, and callers that only wait never check out a
+        connection.
+
+        Clients reading their own writes skip the catalog snapshot, the
+        cache and in-flight lookups. Process-local copies are skipped while
+        product events are not being received. Rows read from a replica are never
+        cached, since a lagging replica could put back a row the writer has
+        just invalidated.
 
         Args:
             session: Database session
             product_id: Product ID
 
         Returns:
-            Product object
+            Product data
 
         Raises:
             ProductNotFoundError: If product is not found
         """
-        product = await session.get(Product, product_id)
+        bind = session.bind
+        use_cache = self._cache_coherent()
+        store = use_cache and not reads_replica(session)
+        if reads_own_writes(session):
+            # A lookup already in flight may have started before the write.
+            PRODUCT_LOOKUPS.inc("database")
+            return await self._fetch_product(bind, product_id, store)
+
+        if self._catalog_usable():
+            record = self.catalog.get(product_id)
+            if record is not None:
+                PRODUCT_LOOKUPS.inc("catalog")
+                return ProductRead.model_validate(record)
+
+        if use_cache:
+            cached = await self.cache.get(product_id)
+            if cached is not None:
+                PRODUCT_LOOKUPS.inc("cache")
+                return cached
 
-        if not product:
-            logger.debug(f"Product not found with id: {product_id}")
+        # Keyed by engine too, so readers pinned to the primary never wait
+        # on a replica query.
+        key = (product_id, bind)
+        if key in self._lookups:
+            PRODUCT_LOOKUPS.inc("coalesced")
+        else:
+            PRODUCT_LOOKUPS.inc("database")
+        return await self._lookups.do(
+            key,
+            lambda: self._fetch_product(bind, product_id, store),
+        )
+
+    async def _fetch_product(
+        self,
+        bind: AsyncEngine,
+        product_id: int,
+        store: bool,
+    ) -> ProductRead:
+        loader = self._loaders.get(bind)
+        if loader is None:
+            loader = self._loaders[bind] = BatchLoader(
+                lambda product_ids: self._load_products(bind, product_ids),
+                window=settings.products_lookup_batch_window_seconds,
+                max_batch_size=settings.products_bulk_chunk_size,
+            )
+
+        product = await loader.load(product_id)
+        if product is None:
+            logger.debug("Product not found with id: %s", product_id)
             raise ProductNotFoundError(f"Product with id {product_id} not found")
 
+        if store:
+            await self.cache.set(product)
         return product
 
-    async def get_all_products(
+    async def _load_products(
+        self,
+        bind: AsyncEngine,
+        product_ids: list[int],
+    ) -> dict[int, ProductRead]:
+        PRODUCT_LOOKUP_BATCH_SIZE.observe(len(product_ids))
+        async with AsyncSession(bind, expire_on_commit=False) as session:
+            result = await session.execute(
+                select(*PRODUCT_ROW_COLUMNS).where(Product.id.in_(product_ids))
+            )
+            return {row.id: ProductRead.model_validate(row) for row in result.all()}
+
+    async def get_products_by_ids(
         self,
         session: AsyncSession,
-    ) -> list[Product]:
+        product_ids: Sequence[int],
+    ) -> tuple[list[ProductRead], list[int]]:
         """
-        Get all products.
+        Get many products by ID with at most one database query and one
+        cache lookup.
 
         Args:
             session: Database session
+            product_ids: Product IDs, duplicates are ignored
 
         Returns:
-            List of all products
+            Tuple of the found products in requested order and the IDs that
+            do not exist
+        """
+        product_ids = list(dict.fromkeys(product_ids))
+        found: dict[int, ProductRead] = {}
+        store = self._cache_coherent() and not reads_replica(session)
+
+        if self._cache_coherent() and not reads_own_writes(session):
+            found.update(await self.cache.get_many(product_ids))
+
+        to_load = [pid for pid in product_ids if pid not in found]
+        if to_load:
+            result = await session.scalars(
+                select(Product).where(Product.id.in_(to_load))
+            )
+            loaded = [ProductRead.model_validate(row) for row in result.all()]
+            found.update((product.id, product) for product in loaded)
+            if store:
+                await self.cache.set_many(loaded)
+
+        products = [found[pid] for pid in product_ids if pid in found]
+        missing_ids = [pid for pid in product_ids if pid not in found]
+        return products, missing_ids
+
+    def build_listing_query(
+        self,
+        limit: int,
+        cursor: str | None = None,
+        sort: ProductSort = ProductSort.ID,
+        filters: ProductFilter | None = None,
+    ) -> Select[tuple[Product]]:
+        """
+        Build the keyset-paginated listing query.
+
+        Args:
+            limit: Maximum number of products to return
+            cursor: Cursor returned with the previous page, if any
+            sort: Ordering of the listing
+            filters: Optional listing filters
+
+        Returns:
+            Select statement fetching up to `limit + 1` products
+
+        Raises:
+            InvalidProductDataError: If the cursor is invalid
+        """
+        columns = SORT_COLUMNS[sort]
+        descending = [sort in DESCENDING_SORTS] * len(columns)
+
+        stmt = (
+            select(Product)
+            .order_by(
+                *(
+                    column.desc() if desc else column
+                    for column, desc in zip(columns, descending)
+                )
+            )
+            .limit(limit + 1)
+        )
+
+        if filters is not None:
+            if filters.min_price is not None:
+                stmt = stmt.where(Product.price >= filters.min_price)
+            if filters.max_price is not None:
+                stmt = stmt.where(Product.price <= filters.max_price)
+            if filters.in_stock:
+                # Inlined rather than bound so the planner can match the
+                # partial in-stock indexes even with generic plans.
+                stmt = stmt.where(Product.quantity > literal_column("0"))
+            if filters.user_id is not None:
+                stmt = stmt.where(Product.user_id == filters.user_id)
+            if filters.created_after is not None:
+                stmt = stmt.where(Product.created_at >= filters.created_after)
+            if filters.created_before is not None:
+                stmt = stmt.where(Product.created_at < filters.created_before)
+
+        if cursor is not None:
+            values = decode_cursor(cursor, sort, columns)
+            stmt = stmt.where(keyset_predicate(columns, values, descending))
+
+        return stmt
+
+    async def get_products_page(
+        self,
+        session: AsyncSession,
+        limit: int,
+        cursor: str | None = None,
+        sort: ProductSort = ProductSort.ID,
+        filters: ProductFilter | None = None,
+    ) -> tuple[list[Product], str | None]:
+        """
+        Get a page of products using keyset pagination.
+
+        Args:
+            session: Database session
+            limit: Maximum number of products to return
+            cursor: Cursor returned with the previous page, if any
+            sort: Ordering of the listing
+            filters: Optional listing filters
+
+        Returns:
+            Tuple of the products on the page (catalog records when served
+            from the snapshot) and the cursor for the next page (None when
+            this is the last page)
+
+        Raises:
+            InvalidProductDataError: If the cursor is invalid
+        """
+        if not reads_own_writes(session):
+            snapshot_page = self._snapshot_page(limit, cursor, sort, filters)
+            if snapshot_page is not None:
+                return snapshot_page
+
+        stmt = self.build_listing_query(limit, cursor, sort, filters)
+        result = await session.scalars(stmt)
+        return _page_with_cursor(list(result.all()), limit, sort)
+
+    async def get_product_rows_page(
+        self,
+        session: AsyncSession,
+        limit: int,
+        cursor: str | None = None,
+        sort: ProductSort = ProductSort.ID,
+        filters: ProductFilter | None = None,
+    ) -> tuple[list[Row], str | None]:
+        """
+        Same as `get_products_page`, but returns plain column rows instead of
+        ORM entities, skipping identity map and instance construction.
+
+        Returns:
+            Tuple of rows with the `PRODUCT_ROW_COLUMNS` columns and the cursor
+            for the next page (None when this is the last page)
+
+        Raises:
+            InvalidProductDataError: If the cursor is invalid
         """
-        result = await session.scalars(select(Product))
-        return list(result.all())
+        if not reads_own_writes(session):
+            snapshot_page = self._snapshot_page(limit, cursor, sort, filters)
+            if snapshot_page is not None:
+                return snapshot_page
+
+        stmt = self.build_listing_query(limit, cursor, sort, filters)
+        result = await session.execute(stmt.with_only_columns(*PRODUCT_ROW_COLUMNS))
+        return _page_with_cursor(list(result.all()), limit, sort)
+
+    def _snapshot_page(
+        self,
+        limit: int,
+        cursor: str | None,
+        sort: ProductSort,
+        filters: ProductFilter | None,
+    ) -> tuple[list[CatalogRecord], str | None] | None:
+        """
+        Serve a listing page from the catalog snapshot while it is fresh.
+
+        Pending changes could move products anywhere in a listing, so pages
+        come from the database until the snapshot has applied them.
+        """
+        if not self._catalog_usable() or self.catalog.has_pending_changes():
+            return None
+
+        columns = SORT_COLUMNS[sort]
+        after = None if cursor is None else decode_cursor(cursor, sort, columns)
+        records = self.catalog.page(
+            limit + 1,
+            tuple(column.key for column in columns),
+            sort in DESCENDING_SORTS,
+            filters,
+            after,
+        )
+        return _page_with_cursor(records, limit, sort)
+
+    async def search_products(
+        self,
+        session: AsyncSession,
+        query: str,
+        limit: int,
+        cursor: str | None = None,
+    ) -> tuple[list[Product], str | None]:
+        """
+        Search products by name and description, most relevant first.
+
+        Args:
+            session: Database session
+            query: Free-text search query
+            limit: Maximum number of products to return
+            cursor: Cursor returned with the previous page, if any
+
+        Returns:
+            Tuple of the products on the page and the cursor for the next
+            page (None when this is the last page)
+
+        Raises:
+            InvalidProductDataError: If the cursor is invalid
+        """
+        terms = search_terms(query)
+        if not terms:
+            return [], None
+
+        if session.get_bind().dialect.name == "postgresql":
+            match, rank = postgres_search(query, terms)
+        else:
+            match, rank = fallback_search(query, terms)
+
+        rank = rank.label("rank")
+        columns = (rank, Product.id)
+        descending = (True, False)
+
+        stmt = (
+            select(Product, rank)
+            .where(match)
+            .order_by(rank.desc(), Product.id)
+            .limit(limit + 1)
+        )
+        if cursor is not None:
+            values = decode_cursor(cursor, "relevance", columns)
+            stmt = stmt.where(keyset_predicate(columns, values, descending))
+
+        rows = (await session.execute(stmt)).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last_product, last_rank = rows[-1]
+            next_cursor = encode_cursor("relevance", [last_rank, last_product.id])
+
+        return [product for product, _ in rows], next_cursor
+
+    async def stream_products(
+        self,
+        session: AsyncSession,
+        batch_size: int,
+    ) -> AsyncIterator[Sequence[Product]]:
+        """
+        Stream all products in id order using a server-side cursor.
+
+        Args:
+            session: Database session
+            batch_size: Number of rows fetched from the cursor at a time
+
+        Yields:
+            Batches of at most `batch_size` products
+        """
+        query = select(Product).order_by(Product.id)
+        result = await session.stream_scalars(
+            query.execution_options(yield_per=batch_size)
+        )
+        async for batch in result.partitions():
+            yield batch
 
     async def create_product(
         self,
@@ -64,6 +548,10 @@ class ProductService:
         """
         Create a new product.
 
+        The row is written with `INSERT ... RETURNING`, so the event and the
+        result carry the values as stored, such as the price rounded to the
+        column's scale.
+
         Args:
             session: Database session
             product_data: Product creation data
@@ -72,25 +560,20 @@ class ProductService:
         Returns:
             Created product object
         """
-        new_product = Product(**product_data.model_dump(), user_id=user_id)
+        new_product = await session.scalar(
+            insert(Product)
+            .values(**product_data.model_dump(), user_id=user_id)
+            .returning(Product)
+        )
 
-        session.add(new_product)
+        enqueue_event(session, "product.created", _created_event(new_product))
         await session.commit()
-        await session.refresh(new_product)
-
-        logger.info(f"Created new product: {new_product.name} (ID: {new_product.id})")
 
-        await rabbit_client.publish_product_created(
-            {
-                "id": new_product.id,
-                "name": new_product.name,
-                "description": new_product.description,
-                "price": str(new_product.price),
-                "user_id": new_product.user_id,
-            }
+        logger.info(
+            "Created new product: %s (ID: %s)", new_product.name, new_product.id
         )
 
-        logger.info(f"Published product.created event for product ID: {new_product.id}")
+        await self._after_write([new_product.id])
 
         return new_product
 
@@ -100,10 +583,16 @@ class ProductService:
         product_id: int,
         product_data: ProductUpdate,
         user_id: int,
-    ) -> Product:
+    ) -> ProductRead:
         """
         Update an existing product.
 
+        Ownership is enforced in the `WHERE` clause. On PostgreSQL the
+        previous price is read by a locking CTE, so the change is a single
+        `UPDATE ... RETURNING` statement. Other dialects may evaluate the CTE
+        after the update, so there the row is first read by its own
+        `SELECT ... FOR UPDATE` in the same transaction.
+
         Args:
             session: Database session
             product_id: Product ID
@@ -111,42 +600,534 @@ class ProductService:
             user_id: int: ID of the user attempting to update the product
 
         Returns:
-            Updated product object
+            Updated product data
 
         Raises:
             ProductNotFoundError: If product is not found
         """
-        product = await self.get_product_by_id(session, product_id)
-        previous_price = product.price
+        update_data = product_data.model_dump(exclude_unset=True)
+
+        if not update_data:
+            row = (
+                await session.execute(
+                    select(*PRODUCT_ROW_COLUMNS).where(
+                        Product.id == product_id,
+                        Product.user_id == user_id,
+                    )
+                )
+            ).first()
+            if row is None:
+                logger.debug(
+                    "Product %s not found or not owned by user %s",
+                    product_id,
+                    user_id,
+                )
+                raise ProductNotFoundError(f"Product with id {product_id} not found")
+            return ProductRead.model_validate(row._asdict())
 
-        if product.user_id != user_id:
+        owned = (Product.id == product_id, Product.user_id == user_id)
+        statement = (
+            update(Product)
+            .values(**update_data)
+            .execution_options(synchronize_session=False)
+        )
+        if session.get_bind().dialect.name == "postgresql":
+            previous = (
+                select(Product.id, Product.price)
+                .where(*owned)
+                .with_for_update()
+                .cte("previous")
+            )
+            row = (
+                await session.execute(
+                    statement.where(Product.id == previous.c.id).returning(
+                        *PRODUCT_ROW_COLUMNS,
+                        previous.c.price.label("previous_price"),
+                    )
+                )
+            ).first()
+            previous_price = row.previous_price if row is not None else None
+        else:
+            row = None
+            previous_price = await session.scalar(
+                select(Product.price).where(*owned).with_for_update()
+            )
+            if previous_price is not None:
+                row = (
+                    await session.execute(
+                        statement.where(*owned).returning(*PRODUCT_ROW_COLUMNS)
+                    )
+                ).first()
+
+        if row is None:
+            await session.rollback()
             logger.debug(
-                f"User {user_id} is not authorized to update product {product_id}"
+                "Product %s not found or not owned by user %s", product_id, user_id
             )
             raise ProductNotFoundError(f"Product with id {product_id} not found")
-        
-        update_data = product_data.model_dump(exclude_unset=True)
 
-        for key, value in update_data.items():
-            setattr(product, key, value)
+        enqueue_event(session, "product.updated", _updated_event(row))
+        if row.price != previous_price:
+            enqueue_event(
+                session,
+                "product.price_changed",
+                _price_changed_event(row, previous_price),
+            )
+        await session.commit()
+
+        logger.info("Updated product: %s (ID: %s)", row.name, row.id)
+
+        await self._after_write([row.id])
+
+        return ProductRead.model_validate(row._asdict())
+
+    async def bulk_create_products(
+        self,
+        session: AsyncSession,
+        products_data: Sequence[ProductCreate],
+        user_id: int,
+    ) -> list[ProductRead]:
+        """
+        Create many products in a single transaction.
+
+        Rows are written in chunks, each with one multi-row
+        `INSERT ... RETURNING` statement.
+
+        Args:
+            session: Database session
+            products_data: Product creation data
+            user_id: int: ID of the user creating the products
+
+        Returns:
+            Created products in input order
+        """
+        created: list[ProductRead] = []
+        events: list[dict] = []
+
+        for chunk in batched(products_data, settings.products_bulk_chunk_size):
+            result = await session.scalars(
+                insert(Product).returning(Product, sort_by_parameter_order=True),
+                [{**item.model_dump(), "user_id": user_id} for item in chunk],
+            )
+            for product in result.all():
+                created.append(ProductRead.model_validate(product))
+                events.append(_created_event(product))
+
+        enqueue_events(session, "product.created", events)
+        await session.commit()
+
+        logger.info("Bulk created %d products for user %s", len(created), user_id)
+
+        await self._after_write([product.id for product in created])
+
+        return created
 
-        session.add(product)
+    async def bulk_update_products(
+        self,
+        session: AsyncSession,
+        products_data: Sequence[ProductBulkUpdateItem],
+        user_id: int,
+    ) -> list[ProductRead]:
+        """
+        Update many products owned by the user in a single transaction.
+
+        The products are locked while their previous prices are read, so
+        the `price_changed` events cannot miss a concurrent change.
+
+        Args:
+            session: Database session
+            products_data: Product update data, each entry carrying a
+                distinct ID
+            user_id: int: ID of the user attempting to update the products
+
+        Returns:
+            Updated products in input order
+
+        Raises:
+            ProductNotFoundError: If any product is not found or is not
+                owned by the user; nothing is updated in that case
+        """
+        updates = {
+            item.id: item.model_dump(exclude_unset=True, exclude={"id"})
+            for item in products_data
+        }
+        product_ids = list(updates)
+
+        previous_prices: dict[int, Decimal] = {}
+        for chunk in batched(product_ids, settings.products_bulk_chunk_size):
+            result = await session.execute(
+                select(Product.id, Product.price)
+                .where(Product.id.in_(chunk), Product.user_id == user_id)
+                .with_for_update()
+            )
+            previous_prices.update(result.tuples().all())
+
+        missing_ids = [pid for pid in product_ids if pid not in previous_prices]
+        if missing_ids:
+            logger.debug(
+                "User %s cannot bulk update missing or foreign products %s",
+                user_id,
+                missing_ids,
+            )
+            raise ProductNotFoundError(f"Products with ids {missing_ids} not found")
+
+        rows = [{**fields, "id": pid} for pid, fields in updates.items() if fields]
+        try:
+            for chunk in batched(rows, settings.products_bulk_chunk_size):
+                await session.execute(update(Product), list(chunk))
+        except StaleDataError as e:
+            # Rows deleted since they were read; only possible without row
+            # locks, as on SQLite
+            await session.rollback()
+            logger.debug("Products disappeared during bulk update: %s", e)
+            raise ProductNotFoundError(
+                "Products were deleted during the bulk update"
+            ) from e
+
+        products: dict[int, Product] = {}
+        for chunk in batched(product_ids, settings.products_bulk_chunk_size):
+            result = await session.scalars(
+                select(Product)
+                .where(Product.id.in_(chunk))
+                .execution_options(populate_existing=True)
+            )
+            products.update((product.id, product) for product in result.all())
+
+        missing_ids = [pid for pid in product_ids if pid not in products]
+        if missing_ids:
+            await session.rollback()
+            logger.debug("Products %s disappeared during bulk update", missing_ids)
+            raise ProductNotFoundError(f"Products with ids {missing_ids} not found")
+
+        ordered = [products[pid] for pid in product_ids]
+        updated = [ProductRead.model_validate(product) for product in ordered]
+        updated_events = [_updated_event(product) for product in ordered]
+        price_changed_events = [
+            _price_changed_event(product, previous_prices[product.id])
+            for product in ordered
+            if product.price != previous_prices[product.id]
+        ]
+
+        enqueue_events(session, "product.updated", updated_events)
+        enqueue_events(session, "product.price_changed", price_changed_events)
         await session.commit()
-        await session.refresh(product)
 
-        logger.info(f"Updated product: {product.name} (ID: {product.id})")
+        logger.info("Bulk updated %d products for user %s", len(updated), user_id)
 
-        if "price" in update_data and update_data["price"] != previous_price:
-            await rabbit_client.publish_product_price_changed(
-                {
-                    "id": product.id,
-                    "user_id": product.user_id,
-                    "previous_price": str(previous_price),
-                    "new_price": str(product.price),
-                }
+        await self._after_write(product_ids)
+
+        return updated
+
+    async def reserve_stock(
+        self,
+        session: AsyncSession,
+        reservation_key: str,
+        items: Sequence[StockItem],
+        user_id: int,
+    ) -> StockReservationRead:
+        """
+        Atomically reserve stock for one or more products.
+
+        Every product is decremented with a single conditional
+        `UPDATE ... WHERE quantity >= :n RETURNING` in one transaction, so
+        either all items are reserved or none are. Repeating a request with
+        the same reservation key returns the original reservation without
+        touching stock again. Reservation keys are scoped to the user.
+
+        Args:
+            session: Database session
+            reservation_key: Client-chosen idempotency key
+            items: Products and quantities to reserve
+            user_id: int: ID of the user making the reservation
+
+        Returns:
+            The reservation
+
+        Raises:
+            ProductNotFoundError: If a product does not exist
+            InsufficientStockError: If a product has too little stock
+            ReservationConflictError: If the key was used for other items
+        """
+        quantities: Counter[int] = Counter()
+        for item in items:
+            quantities[item.product_id] += item.quantity
+        # A fixed update order keeps concurrent multi-item reservations from
+        # deadlocking on each other's row locks.
+        stored_items = [
+            {"product_id": product_id, "quantity": quantity}
+            for product_id, quantity in sorted(quantities.items())
+        ]
+
+        claimed = await session.scalar(
+            _insert_ignoring_conflicts(session, StockReservation)
+            .values(
+                key=reservation_key,
+                user_id=user_id,
+                items=stored_items,
+                status=RESERVATION_RESERVED,
             )
+            .returning(StockReservation.key)
+        )
+        if claimed is None:
+            await session.rollback()
+            existing = await session.get(
+                StockReservation,
+                {"key": reservation_key, "user_id": user_id},
+            )
+            if existing is None or existing.items != stored_items:
+                raise ReservationConflictError(
+                    f"Reservation {reservation_key} already exists with other items"
+                )
+            return _reservation_read(existing.key, existing.status, existing.items)
 
-        return product
+        levels = []
+        for item in stored_items:
+            level = await self._change_stock(
+                session,
+                item["product_id"],
+                -item["quantity"],
+                Product.quantity >= item["quantity"],
+            )
+            if level is None:
+                await session.rollback()
+                raise await self._stock_error(session, item["product_id"])
+            levels.append(level)
+
+        self._enqueue_stock_changes(session, levels)
+        await session.commit()
+
+        logger.info("Reserved stock for %s: %s", reservation_key, stored_items)
+        await self._after_stock_change(levels)
+
+        return _reservation_read(reservation_key, RESERVATION_RESERVED, stored_items)
+
+    async def release_stock(
+        self,
+        session: AsyncSession,
+        reservation_key: str,
+        user_id: int,
+    ) -> StockReservationRead:
+        """
+        Return the stock held by a reservation of the user. Releasing an
+        already released reservation is a no-op.
+
+        Args:
+            session: Database session
+            reservation_key: Key of the reservation to release
+            user_id: int: ID of the user releasing the reservation
+
+        Returns:
+            The released reservation
+
+        Raises:
+            ReservationNotFoundError: If the reservation does not exist
+        """
+        released_items = await session.scalar(
+            update(StockReservation)
+            .where(
+                StockReservation.key == reservation_key,
+                StockReservation.user_id == user_id,
+                StockReservation.status == RESERVATION_RESERVED,
+            )
+            .values(status=RESERVATION_RELEASED)
+            .returning(StockReservation.items)
+            .execution_options(synchronize_session=False)
+        )
+        if released_items is None:
+            existing = await session.get(
+                StockReservation,
+                {"key": reservation_key, "user_id": user_id},
+            )
+            if existing is None:
+                raise ReservationNotFoundError(
+                    f"Reservation {reservation_key} not found"
+                )
+            return _reservation_read(existing.key, existing.status, existing.items)
+
+        levels = []
+        for item in released_items:
+            level = await self._change_stock(
+                session, item["product_id"], item["quantity"]
+            )
+            # Products deleted since the reservation have nothing to restock.
+            if level is not None:
+                levels.append(level)
+
+        self._enqueue_stock_changes(session, levels)
+        await session.commit()
+
+        logger.info("Released stock for %s: %s", reservation_key, released_items)
+        await self._after_stock_change(levels)
+
+        return _reservation_read(reservation_key, RESERVATION_RELEASED, released_items)
+
+    async def adjust_stock(
+        self,
+        session: AsyncSession,
+        product_id: int,
+        delta: int,
+        user_id: int,
+    ) -> StockLevel:
+        """
+        Change the stock of a product owned by the user by a relative amount
+        with a single conditional update.
+
+        Args:
+            session: Database session
+            product_id: Product ID
+            delta: Amount to add (positive) or remove (negative)
+            user_id: int: ID of the user attempting to adjust the stock
+
+        Returns:
+            The new stock level
+
+        Raises:
+            ProductNotFoundError: If product is not found
+            InsufficientStockError: If the stock would become negative
+        """
+        level = await self._change_stock(
+            session,
+            product_id,
+            delta,
+            Product.user_id == user_id,
+            Product.quantity + delta >= 0,
+        )
+        if level is None:
+            await session.rollback()
+            raise await self._stock_error(session, product_id, user_id)
+
+        self._enqueue_stock_changes(session, [level])
+        await session.commit()
+
+        logger.info("Adjusted stock of product %s by %s", product_id, delta)
+        await self._after_stock_change([level])
+
+        return level
+
+    async def apply_stock_deltas(
+        self,
+        session: AsyncSession,
+        changes: Mapping[str, Mapping[int, int]],
+    ) -> list[StockLevel]:
+        """
+        Apply stock changes announced by other services in one transaction.
+
+        Each change is keyed by the ID of the message that carried it. The IDs
+        are recorded in the same transaction, so changes from redelivered
+        messages are skipped. The remaining deltas are summed per product and
+        applied with one `UPDATE ... SET quantity = quantity + CASE id ... END`
+        per chunk of products. Stock never drops below zero and unknown
+        products are ignored.
+
+        Args:
+            session: Database session
+            changes: Quantity deltas per product ID, keyed by message ID
+
+        Returns:
+            New stock levels of the changed products
+        """
+        new_ids: set[str] = set()
+        for chunk in batched(changes, settings.products_bulk_chunk_size):
+            result = await session.scalars(
+                _insert_ignoring_conflicts(session, ProcessedMessage)
+                .values([{"message_id": message_id} for message_id in chunk])
+                .returning(ProcessedMessage.message_id)
+            )
+            new_ids.update(result.all())
+
+        deltas: Counter[int] = Counter()
+        for message_id in new_ids:
+            deltas.update(changes[message_id])
+
+        levels = []
+        # Sorted like reservations, so concurrent batches lock rows in order.
+        product_ids = sorted(pid for pid, delta in deltas.items() if delta)
+        for chunk in batched(product_ids, settings.products_bulk_chunk_size):
+            quantity = Product.quantity + case(
+                {pid: deltas[pid] for pid in chunk},
+                value=Product.id,
+            )
+            result = await session.execute(
+                update(Product)
+                .where(Product.id.in_(chunk))
+                .values(quantity=case((quantity < 0, 0), else_=quantity))
+                .returning(Product.id, Product.quantity)
+                .execution_options(synchronize_session=False)
+            )
+            levels.extend(
+                StockLevel(id=row.id, quantity=row.quantity) for row in result
+            )
+
+        self._enqueue_stock_changes(session, levels)
+        await session.commit()
+
+        logger.info(
+            "Applied stock changes from %d messages (%d duplicates) to %d products",
+            len(new_ids),
+            len(changes) - len(new_ids),
+            len(levels),
+        )
+        await self._after_stock_change(levels)
+
+        return levels
+
+    async def _change_stock(
+        self,
+        session: AsyncSession,
+        product_id: int,
+        delta: int,
+        *conditions,
+    ) -> StockLevel | None:
+        row = (
+            await session.execute(
+                update(Product)
+                .where(Product.id == product_id, *conditions)
+                .values(quantity=Product.quantity + delta)
+                .returning(Product.id, Product.quantity)
+                .execution_options(synchronize_session=False)
+            )
+        ).first()
+        return None if row is None else StockLevel(id=row.id, quantity=row.quantity)
+
+    async def _stock_error(
+        self,
+        session: AsyncSession,
+        product_id: int,
+        user_id: int | None = None,
+    ) -> Exception:
+        # Only reached after a conditional update matched nothing, to tell a
+        # missing product apart from one without enough stock.
+        owner_id = await session.scalar(
+            select(Product.user_id).where(Product.id == product_id)
+        )
+        if owner_id is None or (user_id is not None and owner_id != user_id):
+            return ProductNotFoundError(f"Product with id {product_id} not found")
+        return InsufficientStockError(
+            f"Insufficient stock for product with id {product_id}"
+        )
+
+    def _enqueue_stock_changes(
+        self,
+        session: AsyncSession,
+        levels: Sequence[StockLevel],
+    ) -> None:
+        enqueue_events(
+            session,
+            "product.stock_changed",
+            [level.model_dump() for level in levels],
+        )
+
+    async def _after_stock_change(self, levels: Sequence[StockLevel]) -> None:
+        await self._after_write([level.id for level in levels])
+
+    async def _after_write(self, product_ids: Iterable[int]) -> None:
+        """Drop local copies of changed products and wake the outbox relay."""
+        product_ids = list(product_ids)
+        for product_id in product_ids:
+            await self.cache.invalidate(product_id)
+        if self.catalog is not None:
+            self.catalog.mark_dirty(product_ids)
+        outbox_relay.notify()
 
     async def delete_product(
         self,
@@ -165,18 +1146,84 @@ class ProductService:
         Raises:
             ProductNotFoundError: If product is not found
         """
-        product = await self.get_product_by_id(session, product_id)
+        name = await session.scalar(
+            delete(Product)
+            .where(Product.id == product_id, Product.user_id == user_id)
+            .returning(Product.name)
+            .execution_options(synchronize_session=False)
+        )
 
-        if product.user_id != user_id:
+        if name is None:
+            await session.rollback()
             logger.debug(
-                f"User {user_id} is not authorized to delete product {product_id}"
+                "Product %s not found or not owned by user %s", product_id, user_id
             )
             raise ProductNotFoundError(f"Product with id {product_id} not found")
 
-        await session.delete(product)
+        enqueue_event(
+            session,
+            "product.deleted",
+            {
+                "id": product_id,
+                "user_id": user_id,
+            },
+        )
         await session.commit()
 
-        logger.info(f"Deleted product: {product.name} (ID: {product.id})")
+        logger.info("Deleted product: %s (ID: %s)", name, product_id)
+
+        await self._after_write([product_id])
+
+    async def set_events_active(self, active: bool) -> None:
+        """
+        Record whether product events from other replicas are being received.
+
+        While they are not, the process-local cache and the catalog snapshot
+        are bypassed. Invalidations may have been missed in the meantime, so
+        both are dropped when events resume.
+
+        Args:
+            active: Whether the event subscription is consuming
+        """
+        if active == self._events_active:
+            return
+        if active:
+            await self.cache.clear()
+            if self.catalog is not None:
+                self.catalog.request_reload()
+            logger.info("Receiving product events, using process-local copies")
+        else:
+            logger.warning("Product events interrupted, bypassing local copies")
+        self._events_active = active
+
+    def _cache_coherent(self) -> bool:
+        return self._events_active or not self.cache.process_local
+
+    def _catalog_usable(self) -> bool:
+        if self.catalog is None or not self._events_active:
+            return False
+        return self.catalog.is_fresh()
+
+    async def handle_product_event(self, routing_key: str, payload: dict) -> None:
+        """
+        Evict a product from the cache and refresh it in the catalog snapshot
+        after a change made by any replica.
+
+        Args:
+            routing_key: Routing key of the received event
+            payload: Event payload
+        """
+        product_id = payload.get("id")
+        if product_id is None:
+            return
+
+        await self.cache.invalidate(product_id)
+        if self.catalog is not None:
+            self.catalog.mark_dirty([product_id])
+        logger.debug("Evicted product %s from cache after %s", product_id, routing_key)
 
 
-product_service = ProductService()
+product_service = ProductService(
+    product_cache,
+    catalog_snapshot if settings.catalog_snapshot_enabled else None,
+)
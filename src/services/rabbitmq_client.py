@@ -1,48 +1,220 @@
+import asyncio
 import aio_pika
+import itertools
 import json
+import time
+from typing import Awaitable, Callable, Iterable
 
 from core.config import settings
+from core.metrics import metrics
+
+EventHandler = Callable[[str, dict], Awaitable[None]]
+SubscriptionListener = Callable[[bool], Awaitable[None]]
+
+PUBLISH_SECONDS = metrics.histogram(
+    "rabbitmq_publish_duration_seconds",
+    "Time to publish an event and receive the broker confirm",
+    ("routing_key", "outcome"),
+)
+UNCONFIRMED = metrics.gauge(
+    "rabbitmq_unconfirmed_messages",
+    "Published messages still waiting for a broker confirm",
+)
 
 
 class RabbitClient:
-    def __init__(self, url: str):
+    """
+    Publishes product events and consumes them for cross-replica work.
+
+    Publishes are spread round-robin over a pool of channels in publisher
+    confirm mode, and many can await their confirms at once. At most
+    `max_unconfirmed` messages are in flight; further publishers wait for
+    confirms before sending. With a non-zero `batch_window`, messages are
+    buffered and flushed together when the window elapses or
+    `batch_max_size` messages are waiting.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        publish_channels: int = 1,
+        max_unconfirmed: int = 1000,
+        batch_window: float = 0.0,
+        batch_max_size: int = 100,
+    ):
         self.url = url
+        self.publish_channels = publish_channels
+        self.batch_window = batch_window
+        self.batch_max_size = batch_max_size
         self.connection = None
         self.channel = None
+        self.exchange = None
+        self.exchanges: list = []
+        self.unconfirmed = 0
+        self._round_robin = itertools.count()
+        self._confirm_slots = asyncio.Semaphore(max_unconfirmed)
+        self._batch: list[tuple[str, aio_pika.Message, asyncio.Future]] = []
+        self._batch_timer: asyncio.TimerHandle | None = None
+        self._batch_tasks: set[asyncio.Task] = set()
+        metrics.add_collector(lambda: UNCONFIRMED.set(self.unconfirmed))
 
     async def connect(self):
         self.connection = await aio_pika.connect_robust(self.url)
-        self.channel = await self.connection.channel()
-        self.exchange = await self.channel.declare_exchange(
-            "product_events",
-            aio_pika.ExchangeType.TOPIC,
-            durable=True,
-        )
+        self.channel = await self.connection.channel(publisher_confirms=True)
+        self.exchange = await self._declare_exchange(self.channel)
+        self.exchanges = [self.exchange]
+        for _ in range(self.publish_channels - 1):
+            channel = await self.connection.channel(publisher_confirms=True)
+            self.exchanges.append(await self._declare_exchange(channel))
+
+    @property
+    def connected(self) -> bool:
+        return self.connection is not None and not self.connection.is_closed
 
     async def close(self):
+        self._flush_batch()
+        if self._batch_tasks:
+            await asyncio.gather(*self._batch_tasks, return_exceptions=True)
         if self.connection:
             await self.connection.close()
 
+    @staticmethod
+    async def _declare_exchange(channel):
+        return await channel.declare_exchange(
+            "product_events",
+            aio_pika.ExchangeType.TOPIC,
+            durable=True,
+        )
+
     async def _publish_event(
         self,
         routing_key: str,
         message: dict,
         delivery_mode: aio_pika.DeliveryMode = aio_pika.DeliveryMode.PERSISTENT,
+        message_id: str | None = None,
     ):
-        await self.exchange.publish(
-            aio_pika.Message(
-                body=json.dumps(message).encode(),
-                delivery_mode=delivery_mode,
-                content_type="application/json"
+        amqp_message = aio_pika.Message(
+            body=json.dumps(message, separators=(",", ":")).encode(),
+            delivery_mode=delivery_mode,
+            content_type="application/json",
+            message_id=message_id,
+        )
+        if self.batch_window > 0:
+            await self._enqueue(routing_key, amqp_message)
+        else:
+            await self._send(self._next_exchange(), routing_key, amqp_message)
+
+    def _next_exchange(self):
+        return self.exchanges[next(self._round_robin) % len(self.exchanges)]
+
+    async def _send(self, exchange, routing_key: str, message: aio_pika.Message):
+        async with self._confirm_slots:
+            self.unconfirmed += 1
+            start = time.perf_counter()
+            outcome = "error"
+            try:
+                await exchange.publish(message, routing_key=routing_key)
+                outcome = "ok"
+            finally:
+                self.unconfirmed -= 1
+                PUBLISH_SECONDS.observe(
+                    time.perf_counter() - start,
+                    routing_key,
+                    outcome,
+                )
+
+    def _enqueue(self, routing_key: str, message: aio_pika.Message) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._batch.append((routing_key, message, future))
+        if len(self._batch) >= self.batch_max_size:
+            self._flush_batch()
+        elif self._batch_timer is None:
+            self._batch_timer = loop.call_later(self.batch_window, self._flush_batch)
+        return future
+
+    def _flush_batch(self) -> None:
+        if self._batch_timer is not None:
+            self._batch_timer.cancel()
+            self._batch_timer = None
+        batch, self._batch = self._batch, []
+        if batch:
+            task = asyncio.create_task(self._send_batch(batch))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+
+    async def _send_batch(
+        self,
+        batch: list[tuple[str, aio_pika.Message, asyncio.Future]],
+    ) -> None:
+        # A batch goes out on one channel so its frames are written together
+        exchange = self._next_exchange()
+        results = await asyncio.gather(
+            *(
+                self._send(exchange, routing_key, message)
+                for routing_key, message, _ in batch
             ),
-            routing_key=routing_key,
+            return_exceptions=True,
         )
+        for (_, _, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(None)
+
+    async def publish_event(
+        self,
+        routing_key: str,
+        message: dict,
+        message_id: str | None = None,
+    ):
+        """Publish an event and wait for the broker to confirm it."""
+        await self._publish_event(routing_key, message, message_id=message_id)
+
+    async def consume_events(
+        self,
+        routing_keys: Iterable[str],
+        handler: EventHandler,
+        on_state: SubscriptionListener | None = None,
+    ):
+        """
+        Subscribe this process to events on the product exchange.
+
+        Each process gets its own exclusive, auto-deleted queue so that every
+        replica receives every matching event. Events published while the
+        connection is down are lost; `on_state` is called with False when it
+        drops and with True once consuming has started or been restored.
+        """
+        queue = await self.channel.declare_queue(exclusive=True, auto_delete=True)
+        for routing_key in routing_keys:
+            await queue.bind(self.exchange, routing_key=routing_key)
+
+        async def on_message(message: aio_pika.abc.AbstractIncomingMessage):
+            async with message.process(ignore_processed=True):
+                await handler(message.routing_key, json.loads(message.body))
+
+        await queue.consume(on_message)
+
+        if on_state is not None:
+
+            async def on_lost(*args) -> None:
+                await on_state(False)
 
-    async def publish_product_created(self, product: dict):
-        await self._publish_event("product.created", product)
+            async def on_restored(*args) -> None:
+                await on_state(True)
 
-    async def publish_product_price_changed(self, product: dict):
-        await self._publish_event("product.price_changed", product)
+            # Reconnect callbacks run after channels and consumers are restored.
+            self.connection.close_callbacks.add(on_lost)
+            self.connection.reconnect_callbacks.add(on_restored)
+            await on_state(True)
 
 
-rabbit_client = RabbitClient(settings.rabbitmq_url)
+rabbit_client = RabbitClient(
+    settings.rabbitmq_url,
+    publish_channels=settings.rabbitmq_publish_channels,
+    max_unconfirmed=settings.rabbitmq_max_unconfirmed,
+    batch_window=settings.rabbitmq_batch_window_seconds,
+    batch_max_size=settings.rabbitmq_batch_max_size,
+)
@@ -0,0 +1,95 @@
+import re
+
+from sqlalchemy import (
+    ColumnElement,
+    Float,
+    and_,
+    case,
+    func,
+    literal_column,
+    or_,
+    type_coerce,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
+
+from db.models import Product
+
+# Maintained by the database (see the search migration) and not mapped on the
+# model, because the generated tsvector column only exists on PostgreSQL.
+search_vector = literal_column("products.search_vector", type_=TSVECTOR)
+
+_TERM_PATTERN = re.compile(r"\w+")
+
+
+def search_terms(query: str) -> list[str]:
+    """Split a free-text query into lowercase word terms."""
+    return [term.lower() for term in _TERM_PATTERN.findall(query)]
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def postgres_search(
+    query: str,
+    terms: list[str],
+) -> tuple[ColumnElement[bool], ColumnElement[float]]:
+    """
+    Build the match clause and relevance score for PostgreSQL.
+
+    Full-text matching uses prefix terms against the GIN-indexed
+    `search_vector`; `pg_trgm` similarity and prefix `ILIKE` on `name`
+    (served by the trigram GIN index) add typo tolerance.
+    """
+    ts_query = func.to_tsquery("simple", " & ".join(f"{term}:*" for term in terms))
+    match = or_(
+        search_vector.op("@@")(ts_query),
+        Product.name.op("%")(query),
+        Product.name.ilike(f"{_escape_like(query)}%", escape="\\"),
+    )
+    rank = func.greatest(
+        func.ts_rank(search_vector, ts_query),
+        func.similarity(Product.name, query),
+        type_=Float,
+    )
+    return match, rank
+
+
+def fallback_search(
+    query: str,
+    terms: list[str],
+) -> tuple[ColumnElement[bool], ColumnElement[float]]:
+    """
+    Build a `LIKE`-based match clause and score for databases without
+    full-text search (SQLite in local development).
+
+    Like the PostgreSQL tsquery, every term must appear in the name or the
+    description; a name containing the whole query stands in for the
+    trigram and prefix name matches.
+    """
+    escaped = _escape_like(query.lower())
+    name = func.lower(Product.name)
+    description = func.lower(Product.description)
+
+    name_prefix = name.like(f"{escaped}%", escape="\\")
+    name_contains = name.like(f"%{escaped}%", escape="\\")
+    all_terms = and_(
+        *(
+            or_(
+                name.like(f"%{_escape_like(term)}%", escape="\\"),
+                description.like(f"%{_escape_like(term)}%", escape="\\"),
+            )
+            for term in terms
+        )
+    )
+
+    match = or_(name_contains, all_terms)
+    rank = type_coerce(
+        case(
+            (name_prefix, 1.0),
+            (name_contains, 0.75),
+            else_=0.5,
+        ),
+        Float,
+    )
+    return match, rank
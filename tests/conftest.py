@@ -0,0 +1,78 @@
+import os
+import tempfile
+
+# Settings are read at import time, so point them at a throwaway SQLite file
+# before any service module is imported.
+os.environ.setdefault(
+    "DATABASE_URL",
+    "sqlite+aiosqlite:///" + os.path.join(tempfile.mkdtemp(), "tests.db"),
+)
+
+import interfaces.api  # noqa: E402, F401  (imported first to settle import order)
+import pytest  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+from httpx import ASGITransport, AsyncClient  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+
+from core.dependencies import get_product_service  # noqa: E402
+from db import db_session_manager, session_scope  # noqa: E402
+from db.models import Base, Product  # noqa: E402
+from interfaces.api.routes import router  # noqa: E402
+from services.cache import InMemoryProductCache  # noqa: E402
+from services.product_service import ProductService  # noqa: E402
+
+
+@pytest.fixture
+async def database():
+    """Create an empty schema for the test and drop it afterwards."""
+    async with db_session_manager.engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    yield
+    async with db_session_manager.engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+
+
+@pytest.fixture
+async def session(database):
+    async with session_scope() as session:
+        yield session
+
+
+@pytest.fixture
+def service() -> ProductService:
+    return ProductService(InMemoryProductCache(max_size=100, ttl_seconds=60))
+
+
+@pytest.fixture
+async def client(service, database):
+    """HTTP client for the product routes, served by the `service` fixture."""
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_product_service] = lambda: service
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+@pytest.fixture
+def create_products(database):
+    """Insert products and return their IDs."""
+
+    async def create(*quantities: int, user_id: int = 1) -> list[int]:
+        async with db_session_manager.engine.begin() as connection:
+            result = await connection.execute(
+                insert(Product).returning(Product.id, sort_by_parameter_order=True),
+                [
+                    {
+                        "name": f"Product {i}",
+                        "description": "Test product",
+                        "price": 10,
+                        "quantity": quantity,
+                        "user_id": user_id,
+                    }
+                    for i, quantity in enumerate(quantities)
+                ],
+            )
+            return list(result.scalars())
+
+    return create
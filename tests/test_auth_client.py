@@ -0,0 +1,45 @@
+import pytest
+from shared.grpc.auth_client import AuthClient
+
+from core.exceptions import UnauthorizedError
+from interfaces.grpc.auth_client import CachingAuthClient
+
+
+@pytest.fixture
+def client(monkeypatch) -> CachingAuthClient:
+    calls = []
+
+    async def validate_token(self, token: str) -> dict:
+        calls.append(token)
+        if token == "bad":
+            raise UnauthorizedError("Invalid token")
+        return {"id": 1, "is_active": True}
+
+    monkeypatch.setattr(AuthClient, "validate_token", validate_token)
+    client = CachingAuthClient(
+        host="localhost",
+        port=0,
+        ttl_seconds=60,
+        negative_ttl_seconds=60,
+        max_size=10,
+    )
+    client.calls = calls
+    return client
+
+
+async def test_valid_tokens_are_cached(client):
+    assert await client.validate_token("good") == {"id": 1, "is_active": True}
+    assert await client.validate_token("good") == {"id": 1, "is_active": True}
+    assert client.calls == ["good"]
+
+
+async def test_rejections_are_cached_as_new_exceptions(client):
+    errors = []
+    for _ in range(3):
+        with pytest.raises(UnauthorizedError) as info:
+            await client.validate_token("bad")
+        errors.append(info.value)
+
+    assert client.calls == ["bad"]
+    assert errors[1] is not errors[2]
+    assert all(error.args == errors[0].args for error in errors)
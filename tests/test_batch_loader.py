@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+
+from core.batch_loader import BatchLoader
+
+
+def recording_loader(**kwargs):
+    batches: list[list[int]] = []
+
+    async def load_many(keys: list[int]) -> dict[int, str]:
+        batches.append(keys)
+        await asyncio.sleep(0)
+        return {key: f"value {key}" for key in keys if key != 0}
+
+    return BatchLoader(load_many, **kwargs), batches
+
+
+async def test_keys_requested_together_share_one_call():
+    loader, batches = recording_loader()
+
+    results = await asyncio.gather(*(loader.load(key) for key in (1, 2, 3, 2)))
+
+    assert results == ["value 1", "value 2", "value 3", "value 2"]
+    assert batches == [[1, 2, 3]]
+    assert (loader.batches, loader.keys) == (1, 3)
+
+
+async def test_missing_keys_resolve_to_none():
+    loader, _ = recording_loader()
+    assert await loader.load(0) is None
+
+
+async def test_full_batch_is_sent_early():
+    loader, batches = recording_loader(max_batch_size=2)
+
+    await asyncio.gather(*(loader.load(key) for key in range(1, 6)))
+
+    assert batches == [[1, 2], [3, 4], [5]]
+
+
+async def test_window_collects_keys_from_later_iterations():
+    loader, batches = recording_loader(window=0.05)
+
+    async def load_later(key: int) -> str | None:
+        await asyncio.sleep(0.01)
+        return await loader.load(key)
+
+    await asyncio.gather(loader.load(1), load_later(2))
+
+    assert batches == [[1, 2]]
+
+
+async def test_failure_reaches_every_caller():
+    async def load_many(keys):
+        raise RuntimeError("database unavailable")
+
+    loader = BatchLoader(load_many)
+    results = await asyncio.gather(
+        loader.load(1), loader.load(2), return_exceptions=True
+    )
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+async def test_cancelled_caller_does_not_affect_the_batch():
+    loader, _ = recording_loader()
+
+    first = asyncio.create_task(loader.load(1))
+    second = asyncio.create_task(loader.load(2))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert await second == "value 2"
+
+
+async def test_cancelled_batch_cancels_its_callers():
+    async def load_many(keys):
+        await asyncio.sleep(10)
+        return {}
+
+    loader = BatchLoader(load_many)
+    caller = asyncio.create_task(loader.load(1))
+    await asyncio.sleep(0.01)
+    for task in list(loader._tasks):
+        task.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await asyncio.wait_for(caller, timeout=1)
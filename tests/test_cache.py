@@ -0,0 +1,74 @@
+from datetime import datetime
+from decimal import Decimal
+
+from interfaces.api.schemas import ProductRead
+from services.cache import InMemoryProductCache, RedisProductCache
+
+
+def product(product_id: int) -> ProductRead:
+    now = datetime(2026, 1, 1)
+    return ProductRead(
+        id=product_id,
+        name=f"Product {product_id}",
+        description="Test product",
+        price=Decimal("9.99"),
+        quantity=1,
+        user_id=1,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def set(self, key, value, ex):
+        self.commands.append((key, value))
+
+    async def execute(self):
+        self.client.round_trips += 1
+        self.client.values.update(self.commands)
+
+
+class FakeRedis:
+    """Records round trips made by the Redis product cache."""
+
+    def __init__(self):
+        self.values = {}
+        self.round_trips = 0
+
+    async def mget(self, keys):
+        self.round_trips += 1
+        return [self.values.get(key) for key in keys]
+
+    def pipeline(self, transaction):
+        return FakePipeline(self)
+
+
+async def test_redis_batch_lookups_take_one_round_trip_each():
+    client = FakeRedis()
+    cache = RedisProductCache(client, ttl_seconds=60)
+
+    await cache.set_many([product(1), product(2)])
+    found = await cache.get_many([1, 2, 3])
+
+    assert client.round_trips == 2
+    assert sorted(found) == [1, 2]
+    assert found[2] == product(2)
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+async def test_in_memory_batch_lookups():
+    cache = InMemoryProductCache(max_size=10, ttl_seconds=60)
+    await cache.set_many([product(1)])
+
+    assert await cache.get_many([1, 2]) == {1: product(1)}
+    assert (cache.hits, cache.misses) == (1, 1)
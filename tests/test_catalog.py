@@ -0,0 +1,172 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event, insert, update
+
+from db import db_session_manager, session_scope
+from db.models import Product
+from interfaces.api.schemas import ProductFilter, ProductSort
+from services.cache import InMemoryProductCache
+from services.catalog import CatalogRecord, CatalogSnapshot
+from services.product_service import ProductService
+
+START = datetime(2026, 1, 1)
+
+FILTERS = [
+    None,
+    ProductFilter(min_price=10.5, max_price=30),
+    ProductFilter(in_stock=True),
+    ProductFilter(user_id=2),
+    ProductFilter(user_id=1, min_price=20),
+    ProductFilter(created_after=START + timedelta(days=2)),
+    ProductFilter(
+        created_after=START + timedelta(days=1),
+        created_before=START + timedelta(days=4),
+        in_stock=True,
+    ),
+]
+
+
+@pytest.fixture
+def snapshot() -> CatalogSnapshot:
+    return CatalogSnapshot(check_interval=60, max_staleness=60, resync_interval=3600)
+
+
+@pytest.fixture
+async def products(database) -> list[int]:
+    """Products with repeated prices and creation times, to exercise ties."""
+    async with db_session_manager.engine.begin() as connection:
+        result = await connection.execute(
+            insert(Product).returning(Product.id, sort_by_parameter_order=True),
+            [
+                {
+                    "name": f"Product {i}",
+                    "description": "Test product",
+                    "price": (10, 10.5, 20, 30, 45.25)[i % 5],
+                    "quantity": i % 3,
+                    "user_id": 1 + i % 2,
+                    "created_at": START + timedelta(days=i // 3),
+                    "updated_at": START,
+                }
+                for i in range(17)
+            ],
+        )
+        return list(result.scalars())
+
+
+async def listing(service: ProductService, sort, filters) -> list[tuple]:
+    """Walk every page of a listing and return (ids, cursor) per page."""
+    pages, cursor = [], None
+    async with session_scope() as session:
+        while True:
+            items, cursor = await service.get_products_page(
+                session, limit=4, cursor=cursor, sort=sort, filters=filters
+            )
+            pages.append(([item.id for item in items], cursor))
+            if cursor is None:
+                return pages
+
+
+@pytest.mark.parametrize("sort", list(ProductSort))
+async def test_pages_match_the_database_query(snapshot, products, sort):
+    await snapshot.reload()
+    from_database = ProductService(InMemoryProductCache(max_size=10, ttl_seconds=1))
+    from_snapshot = ProductService(
+        InMemoryProductCache(max_size=10, ttl_seconds=1), snapshot
+    )
+    await from_snapshot.set_events_active(True)
+    async with session_scope() as session:
+        items, _ = await from_snapshot.get_products_page(session, limit=1, sort=sort)
+    assert isinstance(items[0], CatalogRecord)
+
+    for filters in FILTERS:
+        expected = await listing(from_database, sort, filters)
+        assert await listing(from_snapshot, sort, filters) == expected, filters
+
+
+async def test_changed_products_stay_dirty_until_applied(snapshot, products):
+    changed, unchanged = products[:2]
+    await snapshot.reload()
+    async with session_scope() as session:
+        await session.execute(
+            update(Product).where(Product.id == changed).values(name="Renamed")
+        )
+        await session.commit()
+
+    snapshot.mark_dirty([changed])
+    seen_during_refresh = []
+
+    def observe(conn, cursor, statement, parameters, context, executemany):
+        seen_during_refresh.append(
+            (snapshot.get(changed), snapshot.has_pending_changes())
+        )
+
+    engine = db_session_manager.engine.sync_engine
+    event.listen(engine, "before_cursor_execute", observe)
+    try:
+        await snapshot.refresh()
+    finally:
+        event.remove(engine, "before_cursor_execute", observe)
+
+    assert seen_during_refresh == [(None, True)]
+    assert snapshot.get(changed).name == "Renamed"
+    assert snapshot.get(unchanged).name == "Product 1"
+    assert not snapshot.has_pending_changes()
+
+
+async def test_products_marked_during_a_refresh_stay_dirty(snapshot, products):
+    product_id = products[0]
+    await snapshot.reload()
+    snapshot.mark_dirty([product_id])
+
+    def mark_again(conn, cursor, statement, parameters, context, executemany):
+        snapshot.mark_dirty([product_id])
+
+    engine = db_session_manager.engine.sync_engine
+    event.listen(engine, "before_cursor_execute", mark_again)
+    try:
+        await snapshot.refresh()
+    finally:
+        event.remove(engine, "before_cursor_execute", mark_again)
+
+    assert snapshot.get(product_id) is None
+    await snapshot.refresh()
+    assert snapshot.get(product_id) is not None
+
+
+async def test_deleted_products_are_removed_on_refresh(snapshot, products):
+    product_id = products[0]
+    await snapshot.reload()
+    async with session_scope() as session:
+        await session.delete(await session.get(Product, product_id))
+        await session.commit()
+
+    snapshot.mark_dirty([product_id])
+    await snapshot.refresh()
+
+    assert snapshot.get(product_id) is None
+    assert len(snapshot) == len(products) - 1
+    assert product_id not in [
+        record.id for record in snapshot.page(100, ("id",), False)
+    ]
+
+
+async def test_check_reloads_after_repeated_drift(snapshot, products):
+    await snapshot.reload()
+    await snapshot.check()
+    assert snapshot.is_fresh()
+
+    # A change whose event was missed
+    async with session_scope() as session:
+        await session.execute(
+            insert(Product).values(
+                name="Unannounced", description="", price=1, quantity=1, user_id=1
+            )
+        )
+        await session.commit()
+
+    await snapshot.check()
+    assert (snapshot.reloads, len(snapshot)) == (1, len(products))
+
+    await snapshot.check()
+    assert (snapshot.reloads, len(snapshot)) == (2, len(products) + 1)
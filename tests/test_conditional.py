@@ -0,0 +1,63 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import update
+
+from core.config import settings
+from db import session_scope
+from db.models import Product
+
+
+@pytest.fixture(params=[True, False], ids=["fast", "models"])
+def serialization(request, monkeypatch):
+    monkeypatch.setattr(settings, "products_fast_serialization", request.param)
+
+
+async def touch(product_id: int) -> None:
+    async with session_scope() as session:
+        await session.execute(
+            update(Product)
+            .where(Product.id == product_id)
+            .values(quantity=1, updated_at=datetime(2030, 1, 1))
+        )
+        await session.commit()
+
+
+@pytest.mark.parametrize("path", ["/{id}", "/?limit=5"])
+async def test_unchanged_resources_are_not_sent_again(
+    client, create_products, serialization, path
+):
+    (product_id,) = await create_products(5)
+    url = path.format(id=product_id)
+
+    response = await client.get(url)
+    etag = response.headers["etag"]
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == settings.products_cache_control
+
+    for header in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+        cached = await client.get(url, headers={"If-None-Match": header})
+        assert cached.status_code == 304, header
+        assert cached.content == b""
+        assert cached.headers["etag"] == etag
+
+    await touch(product_id)
+    changed = await client.get(url, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+
+async def test_page_tag_changes_with_the_next_cursor(client, create_products):
+    first, second, third = await create_products(1, 2, 3)
+    before = await client.get("/?limit=2")
+
+    async with session_scope() as session:
+        await session.delete(await session.get(Product, third))
+        await session.commit()
+    after = await client.get("/?limit=2")
+
+    # Same items, but there is no next page any more
+    assert [item["id"] for item in after.json()["items"]] == [first, second]
+    assert before.json()["next_cursor"] is not None
+    assert after.json()["next_cursor"] is None
+    assert after.headers["etag"] != before.headers["etag"]
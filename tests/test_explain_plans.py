@@ -0,0 +1,105 @@
+"""
+Check that every supported listing filter/sort combination is served by an
+index instead of a sequential scan of the products table.
+
+The indexes exist for the PostgreSQL planner, so the test needs the URL of
+an empty scratch PostgreSQL database in EXPLAIN_DATABASE_URL and is skipped
+without one. Its tables are created and dropped by the test.
+"""
+
+import json
+import os
+import random
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from db.models import Base, Product
+from interfaces.api.schemas import ProductFilter, ProductSort
+from services.product_service import product_service
+
+DATABASE_URL = os.getenv("EXPLAIN_DATABASE_URL")
+ROWS = 20000
+NOW = datetime(2026, 1, 1)
+
+FILTERS = {
+    "none": ProductFilter(),
+    "price range": ProductFilter(min_price=10, max_price=20),
+    "in stock": ProductFilter(in_stock=True),
+    "owner": ProductFilter(user_id=7),
+    "owner in stock": ProductFilter(user_id=7, in_stock=True),
+    # Aware bounds, as clients send them
+    "created range": ProductFilter(
+        created_after=(NOW - timedelta(days=30)).replace(tzinfo=timezone.utc),
+        created_before=(NOW - timedelta(days=20)).replace(tzinfo=timezone.utc),
+    ),
+}
+
+pytestmark = pytest.mark.skipif(
+    DATABASE_URL is None,
+    reason="EXPLAIN_DATABASE_URL of a scratch PostgreSQL database is not set",
+)
+
+
+@pytest.fixture
+async def engine():
+    engine = create_async_engine(DATABASE_URL)
+    rng = random.Random(42)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(
+            insert(Product),
+            [
+                {
+                    "name": f"Product {i}",
+                    "description": f"Description of product {i}",
+                    "price": Decimal(rng.randint(100, 100000)) / 100,
+                    "quantity": 0 if rng.random() < 0.3 else rng.randint(1, 500),
+                    "user_id": rng.randint(1, 500),
+                    "created_at": NOW - timedelta(minutes=rng.randint(0, 525600)),
+                    "updated_at": NOW,
+                }
+                for i in range(ROWS)
+            ],
+        )
+        await conn.execute(text("ANALYZE"))
+    yield engine
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+
+def has_full_scan(node: dict) -> bool:
+    if node["Node Type"] == "Seq Scan" and node.get("Relation Name") == "products":
+        return True
+    return any(has_full_scan(child) for child in node.get("Plans", []))
+
+
+async def test_listings_do_not_scan_the_products_table(engine):
+    assert engine.dialect.name == "postgresql"
+
+    full_scans = []
+    async with AsyncSession(engine) as session:
+        for sort in ProductSort:
+            for name, filters in FILTERS.items():
+                _, cursor = await product_service.get_products_page(
+                    session, limit=5, sort=sort, filters=filters
+                )
+                for page, page_cursor in (("first", None), ("next", cursor)):
+                    stmt = product_service.build_listing_query(
+                        50, page_cursor, sort, filters
+                    )
+                    sql = stmt.compile(
+                        dialect=engine.dialect,
+                        compile_kwargs={"literal_binds": True},
+                    )
+                    plan = await session.scalar(text(f"EXPLAIN (FORMAT JSON) {sql}"))
+                    if isinstance(plan, str):
+                        plan = json.loads(plan)
+                    if has_full_scan(plan[0]["Plan"]):
+                        full_scans.append(f"sort={sort.value} filter={name} {page}")
+
+    assert full_scans == []
@@ -0,0 +1,41 @@
+import json
+
+import pytest
+
+from core.config import settings
+
+
+@pytest.mark.parametrize("batch_size", [1, 2, 1000])
+async def test_export_streams_every_product_as_a_line(
+    client, create_products, monkeypatch, batch_size
+):
+    monkeypatch.setattr(settings, "products_export_batch_size", batch_size)
+    ids = await create_products(5, 0, 3)
+
+    response = await client.get("/export")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = response.text.splitlines(keepends=True)
+    assert all(line.endswith("\n") for line in lines)
+    products = [json.loads(line) for line in lines]
+    assert [product["id"] for product in products] == ids
+    assert [product["quantity"] for product in products] == [5, 0, 3]
+
+
+async def test_export_of_an_empty_catalog_is_empty(client):
+    response = await client.get("/export")
+
+    assert response.status_code == 200
+    assert response.text == ""
+
+
+async def test_products_are_streamed_in_batches(service, session, create_products):
+    ids = await create_products(1, 2, 3)
+
+    batches = [
+        [product.id for product in batch]
+        async for batch in service.stream_products(session, batch_size=2)
+    ]
+
+    assert batches == [ids[:2], ids[2:]]
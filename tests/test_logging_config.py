@@ -0,0 +1,66 @@
+import logging
+import queue
+import sys
+
+from core.logging_config import (
+    DROPPED_RECORDS,
+    SAMPLED_OUT_RECORDS,
+    DroppingQueueHandler,
+    LogSampler,
+)
+
+
+def count(metric, *labels: str) -> float:
+    return dict((tuple(key), value) for key, value in metric.export()).get(labels, 0)
+
+
+def record(name: str, level: int, msg: str = "message", args=(), exc_info=None):
+    return logging.LogRecord(name, level, __file__, 1, msg, args, exc_info)
+
+
+def test_full_queue_drops_records_without_blocking():
+    log_queue = queue.Queue(maxsize=1)
+    handler = DroppingQueueHandler(log_queue)
+    dropped = count(DROPPED_RECORDS)
+
+    for i in range(3):
+        handler.handle(record("app", logging.INFO, "record %d", (i,)))
+
+    assert log_queue.get_nowait().msg == "record 0"
+    assert count(DROPPED_RECORDS) == dropped + 2
+
+
+def test_records_are_resolved_before_they_are_queued():
+    log_queue = queue.Queue()
+    handler = DroppingQueueHandler(log_queue)
+    items = ["first"]
+    try:
+        raise ValueError("broken")
+    except ValueError:
+        original = record("app", logging.ERROR, "items %s", (items,), sys.exc_info())
+
+    handler.handle(original)
+    items.append("second")
+
+    queued = log_queue.get_nowait()
+    assert (queued.msg, queued.args, queued.exc_info) == ("items ['first']", None, None)
+    assert "ValueError: broken" in queued.exc_text
+    assert original.args == (items,)
+
+
+def test_sampler_skips_debug_and_sql_records():
+    sampler = LogSampler(debug_rate=0, sql_rate=0)
+    sql, debug = count(SAMPLED_OUT_RECORDS, "sql"), count(SAMPLED_OUT_RECORDS, "debug")
+
+    assert not sampler.filter(record("sqlalchemy.engine.Engine", logging.INFO))
+    assert not sampler.filter(record("app", logging.DEBUG))
+    assert sampler.filter(record("app", logging.INFO))
+    assert count(SAMPLED_OUT_RECORDS, "sql") == sql + 1
+    assert count(SAMPLED_OUT_RECORDS, "debug") == debug + 1
+
+
+def test_sampler_keeps_everything_at_full_rate():
+    sampler = LogSampler(debug_rate=1, sql_rate=1)
+
+    assert sampler.filter(record("sqlalchemy.engine.Engine", logging.INFO))
+    assert sampler.filter(record("app", logging.DEBUG))
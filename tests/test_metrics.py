@@ -0,0 +1,90 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from core.metrics import MetricsRegistry
+
+
+class Worker:
+    """Registry with the same metrics as every other worker of an instance."""
+
+    def __init__(self, directory=None):
+        self.registry = MetricsRegistry(directory)
+        self.requests = self.registry.counter("requests_total", "Requests", ["route"])
+        self.in_use = self.registry.gauge("pool_in_use", "Connections in use")
+        self.latency = self.registry.histogram(
+            "latency_seconds", "Latency", buckets=(0.1, 1)
+        )
+
+    def record(self, requests: int, in_use: int, latency: float) -> None:
+        self.requests.inc("/", amount=requests)
+        self.in_use.set(in_use)
+        self.latency.observe(latency)
+
+
+@pytest.fixture
+def exited_pid() -> int:
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+def samples(text: str) -> list[str]:
+    return [line for line in text.splitlines() if not line.startswith("#")]
+
+
+def test_single_process_renders_its_own_values():
+    worker = Worker()
+    worker.record(requests=2, in_use=3, latency=0.5)
+
+    assert samples(worker.registry.render()) == [
+        'requests_total{route="/"} 2.0',
+        "pool_in_use 3.0",
+        'latency_seconds_bucket{le="0.1"} 0',
+        'latency_seconds_bucket{le="1.0"} 1',
+        'latency_seconds_bucket{le="+Inf"} 1',
+        "latency_seconds_sum 0.5",
+        "latency_seconds_count 1",
+    ]
+
+
+def test_shared_directory_combines_all_workers(tmp_path, monkeypatch, exited_pid):
+    for pid, requests, latency in ((os.getppid(), 3, 0.25), (exited_pid, 4, 2)):
+        with monkeypatch.context() as m:
+            m.setattr(os, "getpid", lambda: pid)
+            other = Worker(tmp_path)
+            other.record(requests=requests, in_use=requests, latency=latency)
+            other.registry.write()
+
+    worker = Worker(tmp_path)
+    worker.record(requests=1, in_use=1, latency=0.5)
+
+    # Workers are read in directory order
+    assert sorted(samples(worker.registry.render())) == sorted(
+        [
+            # Counters of the worker that exited are kept
+            'requests_total{route="/"} 8.0',
+            # Gauges are per live worker
+            f'pool_in_use{{pid="{os.getppid()}"}} 3.0',
+            f'pool_in_use{{pid="{os.getpid()}"}} 1.0',
+            'latency_seconds_bucket{le="0.1"} 0',
+            'latency_seconds_bucket{le="1.0"} 2',
+            'latency_seconds_bucket{le="+Inf"} 3',
+            "latency_seconds_sum 2.75",
+            "latency_seconds_count 3",
+        ]
+    )
+
+
+async def test_writer_shares_collected_values(tmp_path):
+    worker = Worker(tmp_path)
+    worker.registry.add_collector(lambda: worker.in_use.set(7))
+
+    worker.registry.start()
+    await worker.registry.stop()
+
+    stored = json.loads((tmp_path / f"{os.getpid()}.json").read_text())
+    assert stored["pool_in_use"] == [[[], 7]]
@@ -0,0 +1,78 @@
+import pytest
+from sqlalchemy import select
+
+from db import session_scope
+from db.models import OutboxEvent
+from services import outbox
+from services.outbox import OutboxRelay, enqueue_events
+
+
+class FakeBroker:
+    """Confirms every publish except those for rejected routing keys."""
+
+    def __init__(self, rejected: set[str]):
+        self.rejected = rejected
+        self.connected = True
+        self.published: list[str] = []
+
+    async def publish_event(self, routing_key, message, message_id=None):
+        if routing_key in self.rejected or not self.connected:
+            raise RuntimeError(f"{routing_key} was not confirmed")
+        self.published.append(routing_key)
+
+
+@pytest.fixture
+def broker(monkeypatch):
+    broker = FakeBroker({"product.poison"})
+    monkeypatch.setattr(outbox, "rabbit_client", broker)
+    return broker
+
+
+@pytest.fixture
+def relay() -> OutboxRelay:
+    return OutboxRelay(batch_size=10, poll_interval=1, max_backoff=1, max_attempts=3)
+
+
+async def stage(*routing_keys: str) -> None:
+    async with session_scope() as session:
+        for routing_key in routing_keys:
+            enqueue_events(session, routing_key, [{}])
+        await session.commit()
+
+
+async def outbox_rows() -> list[tuple[str, int, bool]]:
+    async with session_scope() as session:
+        events = await session.scalars(select(OutboxEvent).order_by(OutboxEvent.id))
+        return [
+            (event.routing_key, event.attempts, event.parked_at is not None)
+            for event in events
+        ]
+
+
+async def test_rejected_event_is_parked_after_max_attempts(database, broker, relay):
+    await stage("product.poison", "product.created")
+
+    for _ in range(3):
+        with pytest.raises(RuntimeError):
+            await relay.relay_batch()
+
+    assert broker.published == ["product.created"]
+    assert await outbox_rows() == [("product.poison", 3, True)]
+
+    await stage("product.updated")
+    assert await relay.relay_batch() == 1
+    assert broker.published == ["product.created", "product.updated"]
+
+
+async def test_failures_while_disconnected_are_not_counted(database, broker, relay):
+    await stage("product.created")
+    broker.connected = False
+
+    for _ in range(5):
+        with pytest.raises(RuntimeError):
+            await relay.relay_batch()
+
+    assert await outbox_rows() == [("product.created", 0, False)]
+    broker.connected = True
+    assert await relay.relay_batch() == 1
+    assert await outbox_rows() == []
@@ -0,0 +1,92 @@
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.dialects import postgresql
+
+from core.exceptions import InvalidProductDataError
+from db import session_scope
+from db.models import Product
+from interfaces.api.schemas import ProductSort
+from services.pagination import decode_cursor, encode_cursor, keyset_predicate
+
+KEY = (Product.created_at, Product.price, Product.id)
+
+
+def test_cursor_restores_the_sort_key_types():
+    values = [datetime(2026, 1, 2, 3, 4, 5), Decimal("10.50"), 7]
+
+    cursor = encode_cursor("created_at", values)
+
+    assert decode_cursor(cursor, "created_at", KEY) == values
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not a cursor",
+        encode_cursor("price", [datetime(2026, 1, 1), "10", 1]),
+        encode_cursor("created_at", [datetime(2026, 1, 1), "10"]),
+        encode_cursor("created_at", ["yesterday", "10", 1]),
+    ],
+)
+def test_invalid_cursors_are_rejected(cursor):
+    with pytest.raises(InvalidProductDataError):
+        decode_cursor(cursor, "created_at", KEY)
+
+
+def where(predicate) -> str:
+    return str(
+        predicate.compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+    )
+
+
+def test_single_direction_keys_use_a_row_comparison():
+    columns = (Product.price, Product.id)
+
+    assert where(keyset_predicate(columns, [10, 3])) == (
+        "(products.price, products.id) > (10, 3)"
+    )
+    assert where(keyset_predicate(columns, [10, 3], [True, True])) == (
+        "(products.price, products.id) < (10, 3)"
+    )
+
+
+def test_mixed_direction_keys_are_expanded():
+    predicate = keyset_predicate((Product.price, Product.id), [10, 3], [True, False])
+
+    assert where(predicate) == (
+        "products.price < 10 OR products.price = 10 AND products.id > 3"
+    )
+
+
+@pytest.mark.parametrize("sort", list(ProductSort))
+async def test_pages_cover_every_product_once(service, create_products, sort):
+    ids = await create_products(*range(7))
+    async with session_scope() as session:
+        # Repeated prices and creation times, so the id has to break ties
+        for i, product_id in enumerate(ids):
+            await session.execute(
+                update(Product)
+                .where(Product.id == product_id)
+                .values(price=10 + i % 3, created_at=datetime(2026, 1, 1 + i % 2))
+            )
+        await session.commit()
+
+    pages, cursor = [], None
+    async with session_scope() as session:
+        while True:
+            items, cursor = await service.get_products_page(
+                session, limit=3, cursor=cursor, sort=sort
+            )
+            pages.append([item.id for item in items])
+            if cursor is None:
+                break
+        everything, _ = await service.get_products_page(session, limit=100, sort=sort)
+
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert sum(pages, []) == [item.id for item in everything]
+    assert sorted(sum(pages, [])) == ids
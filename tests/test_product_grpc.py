@@ -0,0 +1,85 @@
+import grpc
+import pytest
+
+from core.config import settings
+from interfaces.grpc.product_server import ProductServicer
+from interfaces.grpc.protos import products_pb2, products_pb2_grpc
+
+
+@pytest.fixture
+async def stub(service, database):
+    server = grpc.aio.server()
+    products_pb2_grpc.add_ProductServiceServicer_to_server(
+        ProductServicer(service), server
+    )
+    port = server.add_insecure_port("127.0.0.1:0")
+    await server.start()
+    async with grpc.aio.insecure_channel(f"127.0.0.1:{port}") as channel:
+        yield products_pb2_grpc.ProductServiceStub(channel)
+    await server.stop(None)
+
+
+async def test_get_product(stub, create_products):
+    (product_id,) = await create_products(5)
+
+    product = await stub.GetProduct(products_pb2.GetProductRequest(id=product_id))
+
+    assert (product.id, product.price, product.quantity) == (product_id, "10.00", 5)
+    assert product.created_at.seconds > 0
+
+
+async def test_unknown_product_is_not_found(stub, database):
+    with pytest.raises(grpc.aio.AioRpcError) as error:
+        await stub.GetProduct(products_pb2.GetProductRequest(id=404))
+
+    assert error.value.code() == grpc.StatusCode.NOT_FOUND
+
+
+async def test_get_products_lists_missing_ids(stub, create_products):
+    first, second = await create_products(1, 2)
+
+    response = await stub.GetProducts(
+        products_pb2.GetProductsRequest(ids=[second, 404, first])
+    )
+
+    assert [product.id for product in response.products] == [second, first]
+    assert list(response.missing_ids) == [404]
+
+
+async def test_get_products_limits_the_ids(stub, database, monkeypatch):
+    monkeypatch.setattr(settings, "products_batch_max_ids", 2)
+
+    with pytest.raises(grpc.aio.AioRpcError) as error:
+        await stub.GetProducts(products_pb2.GetProductsRequest(ids=[1, 2, 3]))
+
+    assert error.value.code() == grpc.StatusCode.INVALID_ARGUMENT
+
+
+async def test_list_products_streams_every_page(stub, create_products):
+    ids = await create_products(0, 1, 2, 3, 4)
+
+    listed = [
+        product.id
+        async for product in stub.ListProducts(
+            products_pb2.ListProductsRequest(batch_size=2)
+        )
+    ]
+    in_stock = [
+        product.id
+        async for product in stub.ListProducts(
+            products_pb2.ListProductsRequest(sort="-created_at", in_stock=True)
+        )
+    ]
+
+    assert listed == ids
+    assert sorted(in_stock) == ids[1:]
+
+
+async def test_list_products_rejects_unknown_sorts(stub, database):
+    call = stub.ListProducts(products_pb2.ListProductsRequest(sort="name"))
+
+    with pytest.raises(grpc.aio.AioRpcError) as error:
+        async for _ in call:
+            pass
+
+    assert error.value.code() == grpc.StatusCode.INVALID_ARGUMENT
@@ -0,0 +1,67 @@
+from sqlalchemy import update
+
+from db import session_scope
+from db.models import Product
+from db.routing import READ_PRIMARY_INFO, REPLICA_INFO
+
+
+async def test_reads_fill_the_cache_only_while_events_arrive(service, create_products):
+    (product_id,) = await create_products(5)
+
+    async with session_scope() as session:
+        await service.get_product_by_id(session, product_id)
+    assert await service.cache.get(product_id) is None
+
+    await service.set_events_active(True)
+    async with session_scope() as session:
+        await service.get_product_by_id(session, product_id)
+    assert await service.cache.get(product_id) is not None
+
+    # Entries may have missed invalidations while events were interrupted
+    await service.set_events_active(False)
+    await service.set_events_active(True)
+    assert await service.cache.get(product_id) is None
+
+
+async def test_replica_reads_are_not_cached(service, create_products):
+    (product_id,) = await create_products(5)
+    await service.set_events_active(True)
+
+    async with session_scope() as session:
+        session.info[REPLICA_INFO] = True
+        await service.get_product_by_id(session, product_id)
+
+    assert await service.cache.get(product_id) is None
+
+
+async def test_clients_reading_their_writes_skip_the_cache(service, create_products):
+    (product_id,) = await create_products(5)
+    await service.set_events_active(True)
+    async with session_scope() as session:
+        stale = await service.get_product_by_id(session, product_id)
+    await service.cache.set(stale.model_copy(update={"quantity": 99}))
+
+    async with session_scope() as session:
+        session.info[READ_PRIMARY_INFO] = True
+        product = await service.get_product_by_id(session, product_id)
+
+    assert product.quantity == 5
+
+
+async def test_search_fallback_requires_every_term(service, session, create_products):
+    red, blue = await create_products(1, 1)
+    async with session_scope() as write:
+        for product_id, name, description in (
+            (red, "Red mug", "Ceramic cup"),
+            (blue, "Blue mug", "Steel cup"),
+        ):
+            await write.execute(
+                update(Product)
+                .where(Product.id == product_id)
+                .values(name=name, description=description)
+            )
+        await write.commit()
+
+    products, _ = await service.search_products(session, "ceramic mug", limit=10)
+
+    assert [product.name for product in products] == ["Red mug"]
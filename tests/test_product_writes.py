@@ -0,0 +1,183 @@
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event, select
+
+from core.exceptions import ProductNotFoundError
+from db import db_session_manager, session_scope
+from db.models import OutboxEvent, Product
+from interfaces.api.schemas import ProductBulkUpdateItem, ProductCreate, ProductUpdate
+
+
+async def staged_events() -> list[tuple[str, dict]]:
+    async with session_scope() as session:
+        events = await session.scalars(select(OutboxEvent).order_by(OutboxEvent.id))
+        return [(event.routing_key, event.payload) for event in events]
+
+
+@contextmanager
+def product_statements():
+    """Collect the SQL statements that touch the products table."""
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if "products" in statement:
+            statements.append(statement)
+
+    engine = db_session_manager.engine.sync_engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+class TestCreateProduct:
+    async def test_events_carry_the_stored_price(self, service, database):
+        data = ProductCreate(name="Mug", description="Cup", price=10.5, quantity=1)
+
+        async with session_scope() as session:
+            product = await service.create_product(session, data, user_id=1)
+        async with session_scope() as session:
+            await service.bulk_create_products(session, [data], user_id=1)
+
+        assert product.created_at is not None
+        (_, created), (_, bulk_created) = await staged_events()
+        assert created["id"] == product.id
+        assert created["price"] == bulk_created["price"] == "10.50"
+
+
+class TestUpdateProduct:
+    async def test_price_change_stages_price_changed(self, service, create_products):
+        (product_id,) = await create_products(5)
+
+        async with session_scope() as session:
+            product = await service.update_product(
+                session, product_id, ProductUpdate(price=12.5), user_id=1
+            )
+
+        assert product.price == 12.5
+        (_, updated), (routing_key, price_changed) = await staged_events()
+        assert updated["price"] == "12.50"
+        assert routing_key == "product.price_changed"
+        assert price_changed["previous_price"] == "10.00"
+        assert price_changed["new_price"] == "12.50"
+
+    async def test_other_changes_stage_only_updated(self, service, create_products):
+        (product_id,) = await create_products(5)
+
+        async with session_scope() as session:
+            await service.update_product(
+                session, product_id, ProductUpdate(name="Renamed", price=10), user_id=1
+            )
+
+        assert [key for key, _ in await staged_events()] == ["product.updated"]
+
+    async def test_foreign_product_is_not_found(self, service, create_products):
+        (product_id,) = await create_products(5)
+
+        async with session_scope() as session:
+            with pytest.raises(ProductNotFoundError):
+                await service.update_product(
+                    session, product_id, ProductUpdate(price=1), user_id=2
+                )
+
+        async with session_scope() as session:
+            assert (await session.get(Product, product_id)).price == 10
+        assert await staged_events() == []
+
+
+class TestBulkUpdateProducts:
+    async def test_price_changed_only_for_changed_prices(
+        self, service, create_products
+    ):
+        first, second = await create_products(5, 5)
+        items = [
+            ProductBulkUpdateItem(id=first, price=12),
+            ProductBulkUpdateItem(id=second, quantity=1),
+        ]
+
+        async with session_scope() as session:
+            await service.bulk_update_products(session, items, user_id=1)
+
+        events = await staged_events()
+        assert [key for key, _ in events] == [
+            "product.updated",
+            "product.updated",
+            "product.price_changed",
+        ]
+        assert events[2][1]["id"] == first
+        assert events[2][1]["previous_price"] == "10.00"
+
+    async def test_foreign_products_update_nothing(self, service, create_products):
+        (own,) = await create_products(5)
+        (foreign,) = await create_products(5, user_id=2)
+        items = [
+            ProductBulkUpdateItem(id=own, price=1),
+            ProductBulkUpdateItem(id=foreign, price=1),
+        ]
+
+        async with session_scope() as session:
+            with pytest.raises(ProductNotFoundError, match=str([foreign])):
+                await service.bulk_update_products(session, items, user_id=1)
+
+        async with session_scope() as session:
+            assert (await session.get(Product, own)).price == 10
+
+    @pytest.mark.parametrize(
+        "moment", ["before_cursor_execute", "after_cursor_execute"]
+    )
+    async def test_rows_deleted_during_the_update_are_not_found(
+        self, service, create_products, moment
+    ):
+        first, second = await create_products(5, 5)
+        items = [
+            ProductBulkUpdateItem(id=first, price=1),
+            ProductBulkUpdateItem(id=second, price=1),
+        ]
+
+        # Delete a row around the bulk UPDATE, as a concurrent writer could
+        # where rows are not locked.
+        def delete_second(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith("UPDATE products"):
+                conn.exec_driver_sql("DELETE FROM products WHERE id = ?", (second,))
+
+        engine = db_session_manager.engine.sync_engine
+        event.listen(engine, moment, delete_second)
+        try:
+            async with session_scope() as session:
+                with pytest.raises(ProductNotFoundError):
+                    await service.bulk_update_products(session, items, user_id=1)
+        finally:
+            event.remove(engine, moment, delete_second)
+
+        async with session_scope() as session:
+            assert (await session.get(Product, first)).price == 10
+        assert await staged_events() == []
+
+
+class TestDeleteProduct:
+    async def test_delete_is_one_statement(self, service, create_products):
+        (product_id,) = await create_products(5)
+
+        with product_statements() as statements:
+            async with session_scope() as session:
+                await service.delete_product(session, product_id, user_id=1)
+
+        assert len(statements) == 1
+        assert statements[0].startswith("DELETE FROM products")
+        async with session_scope() as session:
+            assert await session.get(Product, product_id) is None
+        assert await staged_events() == [
+            ("product.deleted", {"id": product_id, "user_id": 1})
+        ]
+
+    async def test_foreign_product_is_kept(self, service, create_products):
+        (product_id,) = await create_products(5)
+
+        async with session_scope() as session:
+            with pytest.raises(ProductNotFoundError):
+                await service.delete_product(session, product_id, user_id=2)
+
+        async with session_scope() as session:
+            assert await session.get(Product, product_id) is not None
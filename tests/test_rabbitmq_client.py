@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+
+from services.rabbitmq_client import RabbitClient
+
+
+class FakeExchange:
+    """Confirms publishes once `confirm` is set; rejects the "bad" key."""
+
+    def __init__(self, confirm: asyncio.Event):
+        self.confirm = confirm
+        self.published: list[str] = []
+
+    async def publish(self, message, routing_key):
+        self.published.append(routing_key)
+        await self.confirm.wait()
+        if routing_key == "bad":
+            raise RuntimeError("nacked")
+
+
+@pytest.fixture
+def confirm() -> asyncio.Event:
+    event = asyncio.Event()
+    event.set()
+    return event
+
+
+def client_with(confirm, channels: int = 1, **options) -> RabbitClient:
+    client = RabbitClient("amqp://test", publish_channels=channels, **options)
+    client.exchanges = [FakeExchange(confirm) for _ in range(channels)]
+    return client
+
+
+async def publish_all(client: RabbitClient, *routing_keys: str) -> list:
+    return await asyncio.gather(
+        *(client.publish_event(key, {}) for key in routing_keys),
+        return_exceptions=True,
+    )
+
+
+async def test_publishes_are_spread_over_the_channels(confirm):
+    client = client_with(confirm, channels=3)
+
+    await publish_all(client, *["product.created"] * 6)
+
+    assert [len(exchange.published) for exchange in client.exchanges] == [2, 2, 2]
+
+
+async def test_unconfirmed_messages_are_bounded(confirm):
+    confirm.clear()
+    client = client_with(confirm, channels=2, max_unconfirmed=3)
+
+    publishing = asyncio.create_task(publish_all(client, *["product.created"] * 5))
+    await asyncio.sleep(0.01)
+    assert client.unconfirmed == 3
+
+    confirm.set()
+    assert await publishing == [None] * 5
+    assert client.unconfirmed == 0
+
+
+async def test_full_batches_go_out_together_on_one_channel(confirm):
+    client = client_with(confirm, channels=2, batch_window=60, batch_max_size=3)
+
+    results = await publish_all(client, "product.created", "bad", "product.updated")
+
+    assert results[0] is None and results[2] is None
+    assert isinstance(results[1], RuntimeError)
+    assert [exchange.published for exchange in client.exchanges] == [
+        ["product.created", "bad", "product.updated"],
+        [],
+    ]
+
+
+async def test_partial_batches_are_sent_when_the_window_elapses(confirm):
+    client = client_with(confirm, batch_window=0.01, batch_max_size=100)
+
+    await asyncio.wait_for(publish_all(client, "product.created"), timeout=1)
+
+    assert client.exchanges[0].published == ["product.created"]
+
+
+async def test_close_flushes_the_pending_batch(confirm):
+    client = client_with(confirm, batch_window=60, batch_max_size=100)
+    publishing = asyncio.create_task(publish_all(client, "product.created"))
+    await asyncio.sleep(0.01)
+
+    await client.close()
+
+    assert await asyncio.wait_for(publishing, timeout=1) == [None]
+    assert client.exchanges[0].published == ["product.created"]
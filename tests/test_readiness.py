@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+
+from core.readiness import DependencyState, Readiness
+
+
+def make_readiness(**kwargs) -> Readiness:
+    return Readiness(**{"cache_ttl": 60, "check_timeout": 1, **kwargs})
+
+
+async def test_ready_once_every_critical_dependency_started():
+    readiness = make_readiness()
+    readiness.register("database")
+    readiness.register("cache", critical=False)
+
+    ready, dependencies = await readiness.report()
+    assert not ready
+    assert dependencies["database"]["status"] == DependencyState.STARTING
+
+    async def connect() -> None:
+        pass
+
+    await readiness.start("database", connect)
+    ready, _ = await readiness.report()
+    assert ready
+
+
+async def test_failed_start_is_recorded_and_raised():
+    readiness = make_readiness()
+    readiness.register("database")
+
+    async def connect() -> None:
+        raise ConnectionError("refused")
+
+    with pytest.raises(ConnectionError):
+        await readiness.start("database", connect)
+
+    ready, dependencies = await readiness.report()
+    assert not ready
+    assert dependencies["database"]["error"] == "refused"
+
+
+async def test_background_start_retries_until_it_succeeds():
+    readiness = make_readiness()
+    readiness.register("rabbitmq", critical=False)
+    attempts = 0
+
+    async def connect() -> None:
+        nonlocal attempts
+        attempts += 1
+        if attempts < 3:
+            raise ConnectionError("refused")
+
+    await readiness.start_in_background("rabbitmq", connect, retry_interval=0)
+
+    _, dependencies = await readiness.report()
+    assert attempts == 3
+    assert dependencies["rabbitmq"]["status"] == DependencyState.READY
+
+
+async def test_stale_checks_are_rerun_once_for_concurrent_probes():
+    readiness = make_readiness(cache_ttl=0)
+    calls = 0
+    healthy = True
+
+    async def check() -> None:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0)
+        if not healthy:
+            raise ConnectionError("gone")
+
+    readiness.register("database", check)
+    readiness.mark_ready("database")
+
+    results = await asyncio.gather(*(readiness.report() for _ in range(5)))
+    assert all(ready for ready, _ in results)
+    assert calls == 1
+
+    healthy = False
+    ready, dependencies = await readiness.report()
+    assert not ready
+    assert dependencies["database"]["status"] == DependencyState.FAILED
+
+
+async def test_check_exceeding_the_timeout_fails():
+    readiness = make_readiness(cache_ttl=0, check_timeout=0.01)
+
+    async def check() -> None:
+        await asyncio.sleep(1)
+
+    readiness.register("database", check)
+    readiness.mark_ready("database")
+
+    ready, _ = await readiness.report()
+    assert not ready
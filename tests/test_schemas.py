@@ -0,0 +1,21 @@
+from datetime import datetime
+
+import pytest
+from pydantic import ValidationError
+
+from interfaces.api.schemas import ProductBulkUpdate, ProductFilter
+
+
+def test_bulk_update_rejects_duplicate_ids():
+    with pytest.raises(ValidationError, match=r"duplicate product ids \[1\]"):
+        ProductBulkUpdate(items=[{"id": 1, "price": 1}, {"id": 2}, {"id": 1}])
+
+
+def test_filter_dates_are_normalized_to_naive_utc():
+    filters = ProductFilter(
+        created_after="2026-01-01T05:00:00+05:00",
+        created_before="2026-01-02T00:00:00Z",
+    )
+
+    assert filters.created_after == datetime(2026, 1, 1)
+    assert filters.created_before == datetime(2026, 1, 2)
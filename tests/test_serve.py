@@ -0,0 +1,76 @@
+import logging
+import os
+
+import pytest
+
+import serve
+from core.config import settings
+from serve import overcommitted_pools, shared_metrics_dir, worker_settings
+
+
+@pytest.fixture
+def budgets(monkeypatch):
+    for name, value in {
+        "database_pool_size": 8,
+        "database_max_overflow": 4,
+        "database_replica_pool_size": 2,
+        "database_replica_max_overflow": 1,
+        "database_replica_urls": ["postgresql+asyncpg://replica/db"],
+    }.items():
+        monkeypatch.setattr(settings, name, value)
+
+
+def test_budgets_are_split_between_workers(budgets):
+    shares = worker_settings(4)
+
+    assert shares["database_pool_size"] == 2
+    assert shares["database_max_overflow"] == 1
+    # Rounded up to one connection, overflow may drop to zero
+    assert shares["database_replica_pool_size"] == 1
+    assert shares["database_replica_max_overflow"] == 0
+
+
+def test_pools_within_budget_are_not_reported(budgets):
+    assert overcommitted_pools(worker_settings(2), 2) == []
+
+
+def test_replica_pools_over_budget_are_reported(budgets):
+    assert overcommitted_pools(worker_settings(4), 4) == [("replica", 4, 3)]
+
+
+def test_replica_pools_count_only_with_replicas(budgets, monkeypatch):
+    monkeypatch.setattr(settings, "database_replica_urls", [])
+
+    assert overcommitted_pools(worker_settings(4), 4) == []
+
+
+def test_workers_get_their_share_from_the_environment(budgets, monkeypatch, caplog):
+    started = {}
+    monkeypatch.setattr(settings, "web_concurrency", 4)
+    monkeypatch.setattr(os, "environ", dict(os.environ))
+    monkeypatch.setattr(serve, "setup_logging", lambda: None)
+    monkeypatch.setattr(serve.uvicorn, "run", lambda app, **kw: started.update(kw))
+
+    with caplog.at_level(logging.WARNING, logger="serve"):
+        serve.main()
+
+    assert started["workers"] == 4
+    assert os.environ["DATABASE_POOL_SIZE"] == "2"
+    assert os.environ["DATABASE_REPLICA_POOL_SIZE"] == "1"
+    assert "per replica database" in caplog.text
+
+
+def test_only_several_workers_get_a_temporary_metrics_dir(monkeypatch):
+    monkeypatch.setattr(settings, "metrics_dir", None)
+
+    assert shared_metrics_dir(1) is None
+    assert os.path.isdir(shared_metrics_dir(2))
+
+
+def test_metrics_of_an_earlier_run_are_removed(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "metrics_dir", str(tmp_path / "metrics"))
+    (tmp_path / "metrics").mkdir()
+    (tmp_path / "metrics" / "123.json").write_text("{}")
+
+    assert shared_metrics_dir(1) == str(tmp_path / "metrics")
+    assert list((tmp_path / "metrics").iterdir()) == []
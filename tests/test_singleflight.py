@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+
+from core.singleflight import SingleFlight
+
+
+async def test_concurrent_calls_share_one_execution():
+    flights: SingleFlight[str, int] = SingleFlight()
+    started = 0
+    release = asyncio.Event()
+
+    async def fetch() -> int:
+        nonlocal started
+        started += 1
+        await release.wait()
+        return 42
+
+    callers = [asyncio.create_task(flights.do("key", fetch)) for _ in range(10)]
+    await asyncio.sleep(0)
+    assert "key" in flights
+    release.set()
+
+    assert await asyncio.gather(*callers) == [42] * 10
+    assert started == 1
+    assert (flights.calls, flights.shared) == (1, 9)
+    assert flights.in_flight == 0
+
+
+async def test_different_keys_run_separately():
+    flights: SingleFlight[str, str] = SingleFlight()
+
+    async def echo(value: str) -> str:
+        await asyncio.sleep(0)
+        return value
+
+    results = await asyncio.gather(
+        flights.do("a", lambda: echo("a")),
+        flights.do("b", lambda: echo("b")),
+    )
+    assert results == ["a", "b"]
+    assert flights.calls == 2
+
+
+async def test_exception_reaches_every_caller_and_is_not_kept():
+    flights: SingleFlight[str, int] = SingleFlight()
+
+    async def fail() -> int:
+        await asyncio.sleep(0)
+        raise ValueError("boom")
+
+    results = await asyncio.gather(
+        flights.do("key", fail),
+        flights.do("key", fail),
+        return_exceptions=True,
+    )
+    assert all(isinstance(result, ValueError) for result in results)
+
+    async def succeed() -> int:
+        return 1
+
+    assert await flights.do("key", succeed) == 1
+
+
+async def test_cancelled_caller_does_not_cancel_the_others():
+    flights: SingleFlight[str, int] = SingleFlight()
+    release = asyncio.Event()
+
+    async def fetch() -> int:
+        await release.wait()
+        return 7
+
+    first = asyncio.create_task(flights.do("key", fetch))
+    second = asyncio.create_task(flights.do("key", fetch))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+
+    assert await second == 7
+    with pytest.raises(asyncio.CancelledError):
+        await first
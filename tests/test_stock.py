@@ -0,0 +1,155 @@
+import pytest
+
+from core.exceptions import (
+    InsufficientStockError,
+    ReservationConflictError,
+    ReservationNotFoundError,
+)
+from db import session_scope
+from db.models import Product
+from interfaces.api.schemas import StockItem
+
+
+async def quantities(*product_ids: int) -> list[int]:
+    async with session_scope() as session:
+        return [(await session.get(Product, pid)).quantity for pid in product_ids]
+
+
+class TestApplyStockDeltas:
+    async def test_sums_deltas_per_product(self, service, session, create_products):
+        first, second = await create_products(10, 10)
+
+        levels = await service.apply_stock_deltas(
+            session,
+            {
+                "m1": {first: -3, second: 5},
+                "m2": {first: -2},
+            },
+        )
+
+        assert {level.id: level.quantity for level in levels} == {
+            first: 5,
+            second: 15,
+        }
+        assert await quantities(first, second) == [5, 15]
+
+    async def test_redelivered_messages_are_skipped(
+        self, service, session, create_products
+    ):
+        (product_id,) = await create_products(10)
+
+        await service.apply_stock_deltas(session, {"m1": {product_id: -4}})
+        levels = await service.apply_stock_deltas(
+            session,
+            {"m1": {product_id: -4}, "m2": {product_id: -1}},
+        )
+
+        assert [level.quantity for level in levels] == [5]
+        assert await quantities(product_id) == [5]
+
+    async def test_stock_is_floored_at_zero(self, service, session, create_products):
+        (product_id,) = await create_products(2)
+
+        await service.apply_stock_deltas(session, {"m1": {product_id: -5}})
+
+        assert await quantities(product_id) == [0]
+
+    async def test_unknown_products_are_ignored(
+        self, service, session, create_products
+    ):
+        (product_id,) = await create_products(1)
+
+        levels = await service.apply_stock_deltas(
+            session, {"m1": {product_id: 1, product_id + 100: 1}}
+        )
+
+        assert [level.id for level in levels] == [product_id]
+
+
+class TestReservations:
+    async def test_reserve_and_release(self, service, create_products):
+        first, second = await create_products(5, 5)
+        items = [
+            StockItem(product_id=first, quantity=2),
+            StockItem(product_id=second, quantity=1),
+        ]
+
+        async with session_scope() as session:
+            reservation = await service.reserve_stock(session, "order-1", items, 1)
+        assert reservation.status == "reserved"
+        assert await quantities(first, second) == [3, 4]
+
+        async with session_scope() as session:
+            released = await service.release_stock(session, "order-1", 1)
+        assert released.status == "released"
+        assert await quantities(first, second) == [5, 5]
+
+        # Releasing again is a no-op
+        async with session_scope() as session:
+            again = await service.release_stock(session, "order-1", 1)
+        assert again.status == "released"
+        assert await quantities(first, second) == [5, 5]
+
+    async def test_replay_returns_the_reservation_without_reserving_again(
+        self, service, create_products
+    ):
+        (product_id,) = await create_products(5)
+        items = [StockItem(product_id=product_id, quantity=2)]
+
+        for _ in range(2):
+            async with session_scope() as session:
+                reservation = await service.reserve_stock(session, "order-1", items, 1)
+            assert reservation.status == "reserved"
+
+        assert await quantities(product_id) == [3]
+
+    async def test_reusing_a_key_for_other_items_conflicts(
+        self, service, create_products
+    ):
+        (product_id,) = await create_products(5)
+
+        async with session_scope() as session:
+            await service.reserve_stock(
+                session, "order-1", [StockItem(product_id=product_id, quantity=1)], 1
+            )
+        with pytest.raises(ReservationConflictError):
+            async with session_scope() as session:
+                await service.reserve_stock(
+                    session,
+                    "order-1",
+                    [StockItem(product_id=product_id, quantity=2)],
+                    1,
+                )
+
+    async def test_insufficient_stock_reserves_nothing(self, service, create_products):
+        first, second = await create_products(5, 1)
+        items = [
+            StockItem(product_id=first, quantity=2),
+            StockItem(product_id=second, quantity=2),
+        ]
+
+        with pytest.raises(InsufficientStockError):
+            async with session_scope() as session:
+                await service.reserve_stock(session, "order-1", items, 1)
+
+        assert await quantities(first, second) == [5, 1]
+        with pytest.raises(ReservationNotFoundError):
+            async with session_scope() as session:
+                await service.release_stock(session, "order-1", 1)
+
+    async def test_reservations_belong_to_their_user(self, service, create_products):
+        (product_id,) = await create_products(5)
+        items = [StockItem(product_id=product_id, quantity=2)]
+
+        async with session_scope() as session:
+            await service.reserve_stock(session, "order-1", items, 1)
+
+        with pytest.raises(ReservationNotFoundError):
+            async with session_scope() as session:
+                await service.release_stock(session, "order-1", 2)
+        assert await quantities(product_id) == [3]
+
+        # Another user's key is a separate reservation
+        async with session_scope() as session:
+            await service.reserve_stock(session, "order-1", items, 2)
+        assert await quantities(product_id) == [1]
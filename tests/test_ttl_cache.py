@@ -0,0 +1,42 @@
+import time
+
+from core.ttl_cache import TTLCache
+
+
+def test_entries_expire_after_their_ttl(monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+    cache: TTLCache[str, int] = TTLCache(max_size=10)
+
+    cache.set("short", 1, ttl=5)
+    cache.set("long", 2, ttl=60)
+    now += 10
+
+    assert cache.get("short") is None
+    assert cache.get("long") == 2
+    assert len(cache) == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache: TTLCache[str, int] = TTLCache(max_size=2)
+    cache.set("a", 1, ttl=60)
+    cache.set("b", 2, ttl=60)
+    cache.get("a")
+    cache.set("c", 3, ttl=60)
+
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.evictions == 1
+
+
+def test_pop_and_clear():
+    cache: TTLCache[str, int] = TTLCache(max_size=10)
+    cache.set("a", 1, ttl=60)
+    cache.set("b", 2, ttl=60)
+
+    cache.pop("a")
+    cache.pop("missing")
+    assert cache.get("a") is None
+
+    cache.clear()
+    assert len(cache) == 0